@@ -1,825 +1,1343 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
+import argparse
+import contextlib
+import cProfile
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+import shutil
+import time
+import tracemalloc
 import warnings
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import parse_qs, urlsplit
 warnings.filterwarnings('ignore')
 
+# Version du générateur: toute modification des résultats invalide le cache
+__version__ = '1.3'
+
+# Liste des DROM-COM
+TERRITOIRES = [
+    "Guadeloupe", "Martinique", "Guyane", "La Réunion", "Mayotte",
+    "Saint-Martin", "Saint-Barthélemy", "Saint-Pierre-et-Miquelon",
+    "Wallis-et-Futuna", "Polynésie française", "Nouvelle-Calédonie"
+]
+
+# Indicateurs produits par generate_real_estate_data (dans l'ordre des colonnes)
+INDICATEURS = [
+    'Prix_m2_Maison', 'Prix_m2_Appartement', 'Loyer_m2_Maison', 'Loyer_m2_Appartement',
+    'Transactions_Total', 'Duree_Vente_Moyenne', 'Taux_Vacance_Locatif',
+    'Revenu_Median', 'Taux_Interet_Hypothecaire', 'Chomage',
+    'Annee_Salaire_Maison', 'Annee_Salaire_Appartement', 'Ratio_Loyer_Revenu',
+    'Permis_Construire', 'Investissement_Etranger', 'Investissement_Locatif'
+]
+
+# Années de crise et années fastes communes à tous les indicateurs
+CRISIS_YEARS = [2008, 2009, 2020, 2021]
+BOOM_YEARS = [2006, 2012, 2017, 2023]
+
+# Résolutions temporelles: fréquence -> nombre de périodes par an
+FREQUENCES = {'Y': 1, 'Q': 4, 'M': 12, 'W': 52}
+
+# Alias pandas acceptés pour les fréquences ('A' avant pandas 2.2, 'YE'/'ME'/'QE' depuis)
+FREQ_ALIASES = {'A': 'Y', 'YE': 'Y', 'A-DEC': 'Y', 'Y-DEC': 'Y', 'QE': 'Q', 'Q-DEC': 'Q',
+                'ME': 'M', 'W-SUN': 'W'}
+
+# Amplitude saisonnière relative des indicateurs sensibles au tourisme (résolution infra-annuelle),
+# modulée par l'intensité touristique du territoire
+SAISONNALITE = {
+    'Loyer_m2_Maison': 0.03,
+    'Loyer_m2_Appartement': 0.05,  # Locations saisonnières
+    'Transactions_Total': 0.12,
+    'Duree_Vente_Moyenne': -0.08,
+    'Taux_Vacance_Locatif': -0.15,  # Vacance plus faible en haute saison
+}
+
+# Paramètres cycliques des indicateurs de base:
+# (multiplicateur en crise, multiplicateur en période faste, écart-type du bruit)
+CYCLES = {
+    'Prix_m2_Maison': (0.92, 1.08, 0.06),
+    'Prix_m2_Appartement': (0.90, 1.10, 0.07),
+    'Loyer_m2_Maison': (0.96, 1.04, 0.04),  # Les loyers sont moins volatils que les prix
+    'Loyer_m2_Appartement': (0.95, 1.05, 0.05),
+    'Transactions_Total': (0.65, 1.25, 0.12),  # Forte sensibilité aux conditions économiques
+    'Duree_Vente_Moyenne': (1.35, 0.80, 0.08),  # Plus long en période de crise
+    'Taux_Vacance_Locatif': (1.25, 0.85, 0.06),  # Plus élevé en période de crise
+    'Revenu_Median': (0.97, 1.04, 0.03),
+    'Taux_Interet_Hypothecaire': (1.0, 1.0, 0.05),  # Taux de base fixé par période
+    'Chomage': (1.15, 0.92, 0.05),
+    'Permis_Construire': (0.60, 1.30, 0.10),  # Forte sensibilité aux conditions économiques
+    'Investissement_Etranger': (0.70, 1.40, 0.15),
+    'Investissement_Locatif': (0.75, 1.25, 0.12),
+}
+
+# Indicateurs dérivés des colonnes déjà générées: colonne -> (dépendances, formule)
+DERIVED_INDICATORS = {
+    # Prix d'une maison (100m²) rapporté au revenu médian annuel
+    'Annee_Salaire_Maison': (('Prix_m2_Maison', 'Revenu_Median'),
+                             lambda prix, revenu: prix * 100 / revenu),
+    # Prix d'un appartement (70m²) rapporté au revenu médian annuel
+    'Annee_Salaire_Appartement': (('Prix_m2_Appartement', 'Revenu_Median'),
+                                  lambda prix, revenu: prix * 70 / revenu),
+    # Loyer mensuel d'un appartement (70m²) rapporté au revenu mensuel (en %)
+    'Ratio_Loyer_Revenu': (('Loyer_m2_Appartement', 'Revenu_Median'),
+                           lambda loyer, revenu: loyer * 70 / (revenu / 12) * 100),
+}
+
+def _derived_order():
+    """Ordre d'évaluation des indicateurs dérivés (tri topologique des dépendances)"""
+    order, visiting = [], set()
+    
+    def visit(column):
+        if column in order or column not in DERIVED_INDICATORS:
+            return
+        if column in visiting:
+            raise ValueError(f"Dépendance circulaire entre indicateurs dérivés: {column}")
+        visiting.add(column)
+        for dependency in DERIVED_INDICATORS[column][0]:
+            visit(dependency)
+        visiting.discard(column)
+        order.append(column)
+    
+    for column in DERIVED_INDICATORS:
+        visit(column)
+    return order
+
+class _IndicatorView:
+    """Accès par nom de colonne au dernier axe d'un tableau (... × indicateurs)"""
+    
+    def __init__(self, values):
+        self.values = values
+    
+    def __getitem__(self, column):
+        return self.values[..., INDICATEURS.index(column)]
+    
+    def __setitem__(self, column, value):
+        self.values[..., INDICATEURS.index(column)] = value
+
+def compute_derived_indicators(table):
+    """Calcule les indicateurs dérivés sur un DataFrame ou un tableau indexé par colonne"""
+    for column in _derived_order():
+        dependencies, formula = DERIVED_INDICATORS[column]
+        table[column] = formula(*(table[d] for d in dependencies))
+    return table
+
+# Événements et tendances appliqués après la simulation. Chaque règle multiplie une
+# colonne sur une plage d'années (bornes incluses, None = ouverte) pour les
+# territoires listés (None = tous les territoires).
+EVENEMENTS = [
+    # Événements communs à tous les territoires
+    {"evenement": "Crise financière mondiale", "territoires": None, "debut": 2008, "fin": 2009,
+     "colonne": "Prix_m2_Maison", "multiplicateur": 0.88},
+    {"evenement": "Crise financière mondiale", "territoires": None, "debut": 2008, "fin": 2009,
+     "colonne": "Prix_m2_Appartement", "multiplicateur": 0.85},
+    {"evenement": "Crise financière mondiale", "territoires": None, "debut": 2008, "fin": 2009,
+     "colonne": "Transactions_Total", "multiplicateur": 0.65},
+    {"evenement": "Pandémie COVID-19", "territoires": None, "debut": 2020, "fin": 2021,
+     "colonne": "Loyer_m2_Maison", "multiplicateur": 0.95},
+    {"evenement": "Pandémie COVID-19", "territoires": None, "debut": 2020, "fin": 2021,
+     "colonne": "Loyer_m2_Appartement", "multiplicateur": 0.93},
+    {"evenement": "Pandémie COVID-19", "territoires": None, "debut": 2020, "fin": 2021,
+     "colonne": "Transactions_Total", "multiplicateur": 0.70},
+    {"evenement": "Pandémie COVID-19", "territoires": None, "debut": 2020, "fin": 2021,
+     "colonne": "Taux_Vacance_Locatif", "multiplicateur": 1.20},
+    
+    # Événements spécifiques à certains territoires
+    {"evenement": "Départementalisation de Mayotte", "territoires": ["Mayotte"], "debut": 2011, "fin": None,
+     "colonne": "Investissement_Etranger", "multiplicateur": 1.15},
+    {"evenement": "Départementalisation de Mayotte", "territoires": ["Mayotte"], "debut": 2011, "fin": None,
+     "colonne": "Permis_Construire", "multiplicateur": 1.20},
+    {"evenement": "Mouvements sociaux en Guyane", "territoires": ["Guyane"], "debut": 2017, "fin": 2018,
+     "colonne": "Transactions_Total", "multiplicateur": 0.80},
+    {"evenement": "Mouvements sociaux en Guyane", "territoires": ["Guyane"], "debut": 2017, "fin": 2018,
+     "colonne": "Permis_Construire", "multiplicateur": 0.85},
+    {"evenement": "Référendum en Nouvelle-Calédonie", "territoires": ["Nouvelle-Calédonie"], "debut": 2018, "fin": 2018,
+     "colonne": "Investissement_Etranger", "multiplicateur": 0.75},
+    {"evenement": "Référendum en Nouvelle-Calédonie", "territoires": ["Nouvelle-Calédonie"], "debut": 2018, "fin": 2018,
+     "colonne": "Transactions_Total", "multiplicateur": 0.85},
+    {"evenement": "Référendums en Nouvelle-Calédonie", "territoires": ["Nouvelle-Calédonie"], "debut": 2020, "fin": 2021,
+     "colonne": "Investissement_Etranger", "multiplicateur": 0.75},
+    {"evenement": "Référendums en Nouvelle-Calédonie", "territoires": ["Nouvelle-Calédonie"], "debut": 2020, "fin": 2021,
+     "colonne": "Transactions_Total", "multiplicateur": 0.85},
+    {"evenement": "Numérique et télétravail à La Réunion", "territoires": ["La Réunion"], "debut": 2010, "fin": None,
+     "colonne": "Loyer_m2_Appartement", "multiplicateur": 1.03},
+    {"evenement": "Numérique et télétravail à La Réunion", "territoires": ["La Réunion"], "debut": 2010, "fin": None,
+     "colonne": "Prix_m2_Appartement", "multiplicateur": 1.04},
+    
+    # Tendances à long terme
+    {"evenement": "Hausse générale des prix", "territoires": None, "debut": 2015, "fin": None,
+     "colonne": "Prix_m2_Maison", "multiplicateur": 1.02},
+    {"evenement": "Hausse générale des prix", "territoires": None, "debut": 2015, "fin": None,
+     "colonne": "Prix_m2_Appartement", "multiplicateur": 1.03},
+    {"evenement": "Reprise post-COVID", "territoires": None, "debut": 2022, "fin": None,
+     "colonne": "Transactions_Total", "multiplicateur": 1.15},
+    {"evenement": "Reprise post-COVID", "territoires": None, "debut": 2022, "fin": None,
+     "colonne": "Investissement_Locatif", "multiplicateur": 1.10},
+]
+
+def _validate_events(events):
+    """Normalise et valide une liste de règles d'événements"""
+    normalized = []
+    for event in events:
+        event = dict(event)
+        missing = [key for key in ("colonne", "multiplicateur") if key not in event]
+        if missing:
+            raise ValueError(f"Champ manquant dans l'événement {event.get('evenement', '')!r}: {', '.join(missing)}")
+        # Les indicateurs dérivés sont recalculés après les événements: seules les colonnes de base sont ciblables
+        if event["colonne"] not in CYCLES:
+            raise ValueError(f"Colonne non modifiable par un événement {event.get('evenement', '')!r}: {event['colonne']} "
+                             f"(colonnes de base: {', '.join(CYCLES)})")
+        territoires = event.get("territoires")
+        if isinstance(territoires, str):
+            territoires = [t.strip() for t in territoires.split(";") if t.strip()]
+        event["territoires"] = territoires or None
+        for key in ("debut", "fin"):
+            value = event.get(key)
+            event[key] = None if value is None or pd.isna(value) or value == "" else int(value)
+        event["multiplicateur"] = float(event["multiplicateur"])
+        normalized.append(event)
+    return normalized
+
+def load_event_table(path):
+    """Charge une table d'événements depuis un fichier CSV ou JSON
+    
+    Colonnes attendues: evenement, territoires (séparés par « ; », vide = tous),
+    debut, fin (vide = ouverte), colonne (indicateur de base de CYCLES), multiplicateur.
+    """
+    if str(path).lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            events = json.load(f)
+    else:
+        events = pd.read_csv(path, dtype={"territoires": str}, keep_default_na=False).to_dict("records")
+    return _validate_events(events)
+
+def event_multipliers(territoires, years, events=None):
+    """Matrice (territoires × années × indicateurs) des multiplicateurs d'événements en une passe"""
+    events = EVENEMENTS if events is None else events
+    years = np.asarray(years)
+    multipliers = np.ones((len(territoires), len(years), len(INDICATEURS)))
+    if not events:
+        return multipliers
+    
+    debut = np.array([-np.inf if e["debut"] is None else e["debut"] for e in events])
+    fin = np.array([np.inf if e["fin"] is None else e["fin"] for e in events])
+    columns = np.array([INDICATEURS.index(e["colonne"]) for e in events])
+    factors = np.array([e["multiplicateur"] for e in events])
+    
+    # Masques (règles × années) et (règles × territoires)
+    active = (years >= debut[:, None]) & (years <= fin[:, None])
+    applies = np.array([[e["territoires"] is None or t in e["territoires"] for t in territoires]
+                        for e in events])
+    
+    rule, territory, year = np.nonzero(applies[:, :, None] & active[:, None, :])
+    np.multiply.at(multipliers, (territory, year, columns[rule]), factors[rule])
+    return multipliers
+
+class StageProfiler:
+    """Trace par étape d'une exécution: durée murale, temps CPU et pic de mémoire tracée
+    
+    Utilisé comme contexte (``with StageProfiler() as profiler``), il devient le profileur
+    actif des étapes ``profile_stage``; les étapes imbriquées sont enregistrées avec leur
+    profondeur. ``memory`` active tracemalloc et ``cprofile`` un profil cProfile complet.
+    """
+    
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.profile = cProfile.Profile() if cprofile else None
+        self.stages = []
+        self._depth = 0
+        self._peaks = []
+        self._origin = None
+        self._previous = None
+        self._started_tracemalloc = False
+    
+    def __enter__(self):
+        global _active_profiler
+        self._previous, _active_profiler = _active_profiler, self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._origin = time.perf_counter()
+        if self.profile is not None:
+            self.profile.enable()
+        return self
+    
+    def __exit__(self, *exc):
+        global _active_profiler
+        if self.profile is not None:
+            self.profile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        _active_profiler = self._previous
+        return False
+    
+    @contextlib.contextmanager
+    def stage(self, name, **args):
+        """Mesure une étape (les arguments sont conservés dans la trace)"""
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Le pic atteint jusqu'ici revient à l'étape parente avant sa remise à zéro
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(current)
+        depth = self._depth
+        self._depth += 1
+        start, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                'name': name,
+                'start': start - self._origin,
+                'wall': time.perf_counter() - start,
+                'cpu': time.process_time() - start_cpu,
+                'depth': depth,
+            }
+            self._depth = depth
+            if self.memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                record['peak_bytes'] = peak
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+            if args:
+                record['args'] = args
+            self.stages.append(record)
+    
+    def summary(self):
+        """Totaux par nom d'étape: nombre d'appels, durée murale, temps CPU et pic de mémoire"""
+        totals = {}
+        for record in self.stages:
+            total = totals.setdefault(record['name'], {'count': 0, 'wall': 0.0, 'cpu': 0.0})
+            total['count'] += 1
+            total['wall'] += record['wall']
+            total['cpu'] += record['cpu']
+            if 'peak_bytes' in record:
+                total['peak_bytes'] = max(total.get('peak_bytes', 0), record['peak_bytes'])
+        return totals
+    
+    def to_json(self, path):
+        """Écrit la trace (étapes et totaux) en JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'stages': sorted(self.stages, key=lambda r: r['start']), 'summary': self.summary()},
+                      f, indent=2, ensure_ascii=False)
+        return path
+    
+    def to_chrome_trace(self, path):
+        """Écrit la trace au format Chrome (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        events = []
+        for record in sorted(self.stages, key=lambda r: r['start']):
+            args = dict(record.get('args', {}), cpu_ms=record['cpu'] * 1000)
+            if 'peak_bytes' in record:
+                args['peak_kb'] = record['peak_bytes'] / 1024
+            events.append({'name': record['name'], 'ph': 'X', 'pid': pid, 'tid': 0,
+                           'ts': record['start'] * 1e6, 'dur': record['wall'] * 1e6, 'args': args})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        return path
+    
+    def dump_cprofile(self, path):
+        """Écrit le profil cProfile (lisible avec pstats ou snakeviz)"""
+        if self.profile is None:
+            raise ValueError("Profil cProfile non activé (StageProfiler(cprofile=True))")
+        self.profile.dump_stats(path)
+        return path
+
+# Profileur actif; sans profileur, profile_stage retourne un contexte vide réutilisé
+_active_profiler = None
+_NO_STAGE = contextlib.nullcontext()
+
+def profile_stage(name, **args):
+    """Étape instrumentée du profileur actif (sans effet si aucun profileur n'est actif)"""
+    if _active_profiler is None:
+        return _NO_STAGE
+    return _active_profiler.stage(name, **args)
+
+def _pyplot():
+    """Importe matplotlib.pyplot à la demande: les exécutions sans graphiques ne le chargent jamais"""
+    import matplotlib.pyplot as plt
+    return plt
+
+def _cycle_multiplier(years, crisis, boom):
+    """Multiplicateurs cycliques (crises / périodes fastes) pour un vecteur d'années"""
+    return np.where(np.isin(years, CRISIS_YEARS), crisis,
+                    np.where(np.isin(years, BOOM_YEARS), boom, 1.0))
+
+def _normalize_freq(freq):
+    """Normalise une fréquence ('Y', 'Q', 'M', 'W' ou alias pandas équivalent)"""
+    freq = str(freq).upper()
+    freq = FREQ_ALIASES.get(freq, freq)
+    if freq not in FREQUENCES:
+        raise ValueError(f"Fréquence inconnue: {freq} (attendu: {', '.join(FREQUENCES)})")
+    return freq
+
+def period_dates(start_year, end_year, freq='Y'):
+    """Dates de fin de période d'une grille régulière de FREQUENCES[freq] périodes par an
+    
+    La grille est construite sans alias pandas ('Y' / 'YE' selon les versions). En
+    hebdomadaire, chaque année compte exactement 52 semaines commençant le 1er janvier.
+    """
+    freq = _normalize_freq(freq)
+    k = FREQUENCES[freq]
+    p = np.arange(k * (end_year - start_year + 1))
+    years, j = start_year + p // k, p % k
+    if freq == 'W':
+        first_days = pd.to_datetime(years.astype(str), format='%Y')
+        return pd.DatetimeIndex(first_days + pd.to_timedelta(7 * j + 6, unit='D'))
+    first_days = pd.to_datetime(pd.DataFrame({'year': years, 'month': (j + 1) * (12 // k), 'day': 1}))
+    return pd.DatetimeIndex(first_days + pd.offsets.MonthEnd(0))
+
+def _period_starts(dates, freq):
+    """Premier jour de chaque période d'une grille period_dates"""
+    if freq == 'W':
+        return dates - pd.Timedelta(days=6)
+    return dates.to_period('M').to_timestamp() - pd.offsets.MonthBegin(12 // FREQUENCES[freq] - 1)
+
+def _until_end(until):
+    """Fin de la période désignée par ``until`` ('2026': fin d'année, '2026-03': fin de mois, date: fin du jour)"""
+    if isinstance(until, (str, int)):
+        return pd.Period(str(until)).end_time
+    return pd.Period(pd.Timestamp(until), 'D').end_time
+
+def _period_grid(n_periods, freq, first_period=0):
+    """Temps écoulé (en années) et mois central de chaque période d'une grille period_dates
+    
+    ``first_period`` est le rang de la première période depuis le début de la grille.
+    """
+    k = FREQUENCES[freq]
+    p = np.arange(first_period, first_period + n_periods)
+    return p / k, (p % k + 0.5) * 12 / k + 0.5
+
+def _seasonal_multiplier(column, months, intensity, peak, freq):
+    """Multiplicateur saisonnier (cosinus centré sur le mois de pointe, 1 en annuel)"""
+    amplitude = SAISONNALITE.get(column, 0.0)
+    if freq == 'Y' or amplitude == 0:
+        return 1.0
+    return 1 + amplitude * intensity * np.cos(2 * np.pi * (months - peak) / 12)
+
+def _root_seed_sequence(seed=None):
+    """SeedSequence racine: entier, SeedSequence, Generator (tiré une seule fois) ou None (entropie du système)"""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return np.random.SeedSequence(seed.integers(0, 2**63, size=4))
+    return np.random.SeedSequence(seed)
+
+def _seed_fingerprint(seed_sequence):
+    """Identité sérialisable d'une SeedSequence (entropie et spawn_key)"""
+    return [np.asarray(seed_sequence.entropy, dtype=object).tolist(), list(seed_sequence.spawn_key)]
+
+def territory_key(territoire):
+    """Clé stable d'un territoire (CRC32 du nom), indépendante de sa position dans TERRITOIRES"""
+    return zlib.crc32(territoire.encode('utf-8'))
+
+def member_rng(seed_sequence, territoire, member, stream=None):
+    """Générateur indépendant d'un couple (territoire, membre de l'ensemble)
+    
+    C'est l'enfant de ``seed_sequence`` de spawn_key (territoire, membre), adressé
+    directement plutôt qu'obtenu par des appels successifs à ``spawn``: le flux ne dépend
+    ni du nombre de workers, ni de l'ordre d'exécution, ni des autres membres simulés.
+    ``stream`` ajoute un flux annexe (ex. ZONE_STREAM, ou ENSEMBLE_STREAM avec un numéro de
+    bloc à la place du membre) qui ne modifie pas le flux principal.
+    """
+    spawn_key = tuple(seed_sequence.spawn_key) + (territory_key(territoire), member)
+    if stream is not None:
+        spawn_key += (stream,)
+    child = np.random.SeedSequence(seed_sequence.entropy, spawn_key=spawn_key, pool_size=seed_sequence.pool_size)
+    return np.random.Generator(np.random.PCG64(child))
+
+# Écarts-types du bruit des indicateurs de base, dans l'ordre de CYCLES (colonne × 1)
+NOISE_STDS = np.array([[std] for _, _, std in CYCLES.values()])
+
+def standard_noise(seed_sequence, territoire, member, n_periods, rng=None):
+    """Tirages normaux centrés réduits d'un (territoire, membre): une ligne par indicateur de base
+    
+    Les tirages sont faits période par période: un horizon prolongé commence par les mêmes
+    valeurs, et ``rng`` (générateur repris d'un état sauvegardé) poursuit le flux.
+    """
+    rng = member_rng(seed_sequence, territoire, member) if rng is None else rng
+    return rng.standard_normal((n_periods, len(CYCLES))).T
+
+# Membres d'ensemble (au-delà du membre 0) tirés par blocs d'un flux annexe du territoire
+ENSEMBLE_BLOCK = 256
+ENSEMBLE_STREAM = 2
+
+# Dernier bloc entamé par ensemble_noise (clé, tirages): les lots suivants du même bloc le
+# reprennent au lieu de le retirer. Un bloc consommé en entier n'est pas gardé.
+_ENSEMBLE_LAST_BLOCK = None
+
+def ensemble_noise(seed_sequence, territoire, first_member, n_members, n_periods):
+    """Tirages normaux centrés réduits des membres ``first_member`` à ``first_member + n_members - 1``
+    d'un territoire (membres × indicateurs de base × périodes)
+    
+    Le membre 0 garde son flux (standard_noise): les données d'un territoire et le mode
+    incrémental n'en dépendent pas. Les suivants sont tirés par blocs de ENSEMBLE_BLOCK
+    membres, un générateur par bloc (flux annexe ENSEMBLE_STREAM), en un seul appel
+    vectorisé: un membre ne dépend que de son numéro, pas du découpage en lots. Les
+    tirages sont faits période par période, comme pour le membre 0. Un bloc dont l'appel
+    n'utilise que le début est gardé pour l'appel suivant: des lots consécutifs de moins
+    de ENSEMBLE_BLOCK membres ne tirent chaque bloc qu'une fois.
+    """
+    global _ENSEMBLE_LAST_BLOCK
+    noise = np.empty((n_members, len(CYCLES), n_periods))
+    stop = first_member + n_members
+    if first_member == 0 and n_members:
+        noise[0] = standard_noise(seed_sequence, territoire, 0, n_periods)
+    start = max(first_member, 1)
+    for block in range((start - 1) // ENSEMBLE_BLOCK, (stop - 2) // ENSEMBLE_BLOCK + 1 if stop > start else 0):
+        key = (repr(seed_sequence.entropy), tuple(seed_sequence.spawn_key), seed_sequence.pool_size,
+               territoire, block, n_periods)
+        if _ENSEMBLE_LAST_BLOCK is not None and _ENSEMBLE_LAST_BLOCK[0] == key:
+            draws = _ENSEMBLE_LAST_BLOCK[1]
+        else:
+            rng = member_rng(seed_sequence, territoire, block, ENSEMBLE_STREAM)
+            draws = rng.standard_normal((n_periods, ENSEMBLE_BLOCK, len(CYCLES))).transpose(1, 2, 0)
+        # Membres du bloc: 1 + block * ENSEMBLE_BLOCK + k
+        low = 1 + block * ENSEMBLE_BLOCK
+        lo, hi = max(start, low), min(stop, low + ENSEMBLE_BLOCK)
+        noise[lo - first_member:hi - first_member] = draws[lo - low:hi - low]
+        _ENSEMBLE_LAST_BLOCK = (key, draws) if hi < low + ENSEMBLE_BLOCK else None
+    return noise
+
+def noise_block(seed_sequence, territoire, member, n_periods):
+    """Bruit multiplicatif d'un (territoire, membre), centré sur 1: une ligne par indicateur de base"""
+    return 1 + NOISE_STDS * standard_noise(seed_sequence, territoire, member, n_periods)
+
+def _mortgage_base_rate(years):
+    """Tendances historiques et prospectives des taux hypothécaires (en %)"""
+    return np.select(
+        [years <= 2005, years <= 2008, years <= 2012, years <= 2016,
+         years <= 2020, years <= 2023],
+        [4.2, 4.5, 3.8, 2.9, 1.8, 2.2],
+        default=2.8
+    )
+
+def _simulate_series(column, t, years, base, rate, noise, season=1.0, cycles=None):
+    """Moteur vectorisé: base * (1 + rate * t) * multiplicateur cyclique * saisonnalité * bruit
+    
+    ``t`` est le temps écoulé en années (fractionnaire en infra-annuel) et ``years``
+    l'année de chaque période, qui porte les crises et périodes fastes. ``base``,
+    ``rate`` et ``season`` peuvent être des scalaires ou des colonnes (territoires × 1),
+    ``noise`` porte la forme finale du résultat. ``cycles`` remplace les multiplicateurs
+    (crise, période faste) de CYCLES; scalaires ou tableaux diffusés comme ``rate``.
+    """
+    if column == 'Taux_Interet_Hypothecaire':
+        # La prime du territoire s'ajoute au taux de base de la période
+        return (_mortgage_base_rate(years) + base) * noise
+    
+    crisis, boom = CYCLES[column][:2] if cycles is None else cycles
+    growth = 1 + rate * t
+    return base * growth * _cycle_multiplier(years, crisis, boom) * season * noise
+
+# Configuration spécifique à chaque DROM-COM ("default" pour un territoire sans configuration)
+TERRITORY_CONFIGS = {
+    "Guadeloupe": {
+        "prix_m2_base": 1800,
+        "loyer_m2_base": 10.5,
+        "revenu_median": 18000,
+        "specialites": ["tourisme", "résidentiel", "luxe"],
+        "zones_cles": ["Pointe-à-Pitre", "Gosier", "Sainte-Anne", "Basse-Terre"],
+        "saisonnalite": 0.8,
+        "pic_saison": 2
+    },
+    "Martinique": {
+        "prix_m2_base": 2200,
+        "loyer_m2_base": 12.0,
+        "revenu_median": 19500,
+        "specialites": ["tourisme", "résidentiel", "vue mer"],
+        "zones_cles": ["Fort-de-France", "Ducos", "Schoelcher", "Trois-Îlets"],
+        "saisonnalite": 0.8,
+        "pic_saison": 2
+    },
+    "Guyane": {
+        "prix_m2_base": 1500,
+        "loyer_m2_base": 9.0,
+        "revenu_median": 16500,
+        "specialites": ["spatial", "croissance", "défiscalisation"],
+        "zones_cles": ["Cayenne", "Kourou", "Remire-Montjoly", "Matoury"],
+        "saisonnalite": 0.2,
+        "pic_saison": 9
+    },
+    "La Réunion": {
+        "prix_m2_base": 2100,
+        "loyer_m2_base": 11.5,
+        "revenu_median": 19000,
+        "specialites": ["tourisme", "résidentiel", "haute altitude"],
+        "zones_cles": ["Saint-Denis", "Saint-Paul", "Saint-Pierre", "Le Tampon"],
+        "saisonnalite": 0.6,
+        "pic_saison": 8
+    },
+    "Mayotte": {
+        "prix_m2_base": 1200,
+        "loyer_m2_base": 7.5,
+        "revenu_median": 9500,
+        "specialites": ["croissance", "accession", "défavorisé"],
+        "zones_cles": ["Mamoudzou", "Dzaoudzi", "Koungou", "Tsingoni"],
+        "saisonnalite": 0.2,
+        "pic_saison": 8
+    },
+    "Saint-Martin": {
+        "prix_m2_base": 3500,
+        "loyer_m2_base": 20.0,
+        "revenu_median": 22000,
+        "specialites": ["luxe", "tourisme", "international"],
+        "zones_cles": ["Marigot", "Grand-Case", "Baie Orientale", "Terres Basses"],
+        "saisonnalite": 1.0,
+        "pic_saison": 2
+    },
+    "Saint-Barthélemy": {
+        "prix_m2_base": 8500,
+        "loyer_m2_base": 45.0,
+        "revenu_median": 35000,
+        "specialites": ["ultra-luxe", "jet-set", "international"],
+        "zones_cles": ["Gustavia", "Saint-Jean", "Lorient", "Flamands"],
+        "saisonnalite": 1.2,
+        "pic_saison": 2
+    },
+    "Saint-Pierre-et-Miquelon": {
+        "prix_m2_base": 1800,
+        "loyer_m2_base": 9.5,
+        "revenu_median": 21000,
+        "specialites": ["pêche", "isolé", "climat froid"],
+        "zones_cles": ["Saint-Pierre", "Miquelon", "Langlade"],
+        "saisonnalite": 0.7,
+        "pic_saison": 7
+    },
+    "Wallis-et-Futuna": {
+        "prix_m2_base": 1300,
+        "loyer_m2_base": 8.0,
+        "revenu_median": 12000,
+        "specialites": ["traditionnel", "communautaire", "isolé"],
+        "zones_cles": ["Mata-Utu", "Leava", "Alo", "Sigave"],
+        "saisonnalite": 0.1,
+        "pic_saison": 7
+    },
+    "Polynésie française": {
+        "prix_m2_base": 2800,
+        "loyer_m2_base": 15.0,
+        "revenu_median": 18500,
+        "specialites": ["tourisme", "insulaire", "vue lagons"],
+        "zones_cles": ["Papeete", "Punaauia", "Moorea", "Bora-Bora"],
+        "saisonnalite": 0.9,
+        "pic_saison": 7
+    },
+    "Nouvelle-Calédonie": {
+        "prix_m2_base": 2500,
+        "loyer_m2_base": 14.0,
+        "revenu_median": 23000,
+        "specialites": ["nickel", "austral", "vue mer"],
+        "zones_cles": ["Nouméa", "Dumbéa", "Mont-Dore", "Païta"],
+        "saisonnalite": 0.4,
+        "pic_saison": 12
+    },
+    # Configuration par défaut
+    "default": {
+        "prix_m2_base": 2000,
+        "loyer_m2_base": 11.0,
+        "revenu_median": 18000,
+        "specialites": ["résidentiel", "tourisme"],
+        "zones_cles": ["Capitale", "Zone touristique", "Périurbain"],
+        "saisonnalite": 0.5,
+        "pic_saison": 7
+    }
+}
+
+# Champs de configuration des territoires (colonnes de la table des paramètres); les listes
+# s'écrivent séparées par « ; » dans un fichier CSV
+CONFIG_FIELDS = ('prix_m2_base', 'loyer_m2_base', 'revenu_median', 'specialites', 'zones_cles',
+                 'saisonnalite', 'pic_saison')
+CONFIG_LISTS = ('specialites', 'zones_cles')
+
+# Paramètres des indicateurs de base: colonne -> (règle de la valeur de base, règle du taux de
+# croissance par an). Une règle est une valeur commune, un champ de configuration (nom, ou
+# (nom, facteur)), ou une suite de (territoires, valeur) dont la première contenant le
+# territoire s'applique, None valant pour tous les autres
+INDICATOR_RULES = {
+    # Croissance forte dans les îles luxueuses et les territoires en développement
+    'Prix_m2_Maison': ('prix_m2_base', [
+        (["Saint-Barthélemy", "Saint-Martin"], 0.045),
+        (["Guyane", "Mayotte"], 0.038),
+        (["Nouvelle-Calédonie", "Polynésie française"], 0.032),
+        (None, 0.028)]),
+    # Appartements généralement plus chers que les maisons
+    'Prix_m2_Appartement': (('prix_m2_base', 1.15), [
+        (["Saint-Barthélemy", "Saint-Martin"], 0.048),
+        (["Guyane", "Mayotte"], 0.042),
+        (["La Réunion", "Martinique"], 0.035),
+        (None, 0.030)]),
+    'Loyer_m2_Maison': ('loyer_m2_base', [
+        (["Saint-Barthélemy", "Saint-Martin"], 0.032),
+        (["Guyane", "Mayotte"], 0.028),
+        (None, 0.022)]),
+    'Loyer_m2_Appartement': (('loyer_m2_base', 1.10), [
+        (["Saint-Barthélemy", "Saint-Martin"], 0.035),
+        (["Guyane", "Mayotte"], 0.030),
+        (None, 0.025)]),
+    'Transactions_Total': ([
+        (["La Réunion", "Martinique", "Guadeloupe"], 5000),
+        (["Guyane", "Nouvelle-Calédonie", "Polynésie française"], 2500),
+        (["Mayotte"], 1500),
+        (["Saint-Barthélemy", "Saint-Martin"], 500),
+        (None, 1000),
+    ], [
+        (["Guyane", "Mayotte"], 0.035),
+        (["Saint-Barthélemy", "Saint-Martin"], 0.025),
+        (None, 0.015)]),
+    # Durée moyenne de vente (en jours): marchés dynamiques plus rapides, amélioration progressive
+    'Duree_Vente_Moyenne': ([
+        (["Saint-Barthélemy", "Saint-Martin"], 60),
+        (["Guyane", "Mayotte"], 90),
+        (["La Réunion", "Martinique"], 75),
+        (None, 85),
+    ], [
+        (["Guyane", "Mayotte"], -0.01),
+        (None, -0.005)]),
+    # Taux de vacance locative (en %): faible là où la demande est forte, modéré avec la saisonnalité
+    'Taux_Vacance_Locatif': ([
+        (["Mayotte", "Guyane"], 4.5),
+        (["Saint-Barthélemy", "Saint-Martin"], 8.0),
+        (["La Réunion", "Martinique"], 6.0),
+        (None, 5.5),
+    ], [
+        (["Saint-Barthélemy", "Saint-Martin"], 0.01),
+        (None, -0.005)]),
+    'Revenu_Median': ('revenu_median', [
+        (["Guyane", "Mayotte"], 0.022),
+        (["Saint-Barthélemy", "Saint-Martin"], 0.018),
+        (None, 0.015)]),
+    # Prime hypothécaire spécifique aux DROM-COM (le taux de base dépend de la période)
+    'Taux_Interet_Hypothecaire': ([
+        (["Mayotte", "Guyane", "Wallis-et-Futuna"], 0.4),
+        (["Saint-Pierre-et-Miquelon", "Polynésie française"], 0.3),
+        (None, 0.2),
+    ], 0.0),
+    # Taux de chômage (en %), en légère amélioration
+    'Chomage': ([
+        (["Mayotte", "Guyane"], 22.0),
+        (["Martinique", "Guadeloupe"], 18.0),
+        (["La Réunion"], 16.0),
+        (["Saint-Barthélemy", "Saint-Martin"], 12.0),
+        (None, 14.0),
+    ], [
+        (["Mayotte", "Guyane"], -0.005),
+        (["Martinique", "Guadeloupe"], -0.004),
+        (None, -0.003)]),
+    'Permis_Construire': ([
+        (["La Réunion", "Martinique", "Guadeloupe"], 2000),
+        (["Guyane", "Nouvelle-Calédonie"], 1200),
+        (["Mayotte"], 800),
+        (["Saint-Barthélemy", "Saint-Martin"], 200),
+        (None, 600),
+    ], [
+        (["Guyane", "Mayotte"], 0.040),
+        (["Saint-Barthélemy", "Saint-Martin"], 0.025),
+        (None, 0.015)]),
+    # Investissement étranger (en millions d'euros)
+    'Investissement_Etranger': ([
+        (["Saint-Barthélemy", "Saint-Martin"], 120),
+        (["Polynésie française", "Nouvelle-Calédonie"], 80),
+        (["Martinique", "Guadeloupe"], 50),
+        (["La Réunion"], 40),
+        (None, 20),
+    ], [
+        (["Saint-Barthélemy", "Saint-Martin"], 0.050),
+        (["Polynésie française", "Nouvelle-Calédonie"], 0.035),
+        (None, 0.020)]),
+    # Investissement locatif (en millions d'euros)
+    'Investissement_Locatif': ([
+        (["La Réunion", "Martinique", "Guadeloupe"], 150),
+        (["Guyane", "Nouvelle-Calédonie"], 80),
+        (["Mayotte"], 50),
+        (["Saint-Barthélemy", "Saint-Martin"], 100),
+        (None, 60),
+    ], [
+        (["Guyane", "Mayotte"], 0.045),
+        (["Saint-Barthélemy", "Saint-Martin"], 0.030),
+        (None, 0.020)]),
+}
+
+# Colonnes des paramètres des indicateurs dans la table (base et taux de chaque indicateur de base)
+PARAMETER_COLUMNS = [f'{column}_{kind}' for column in CYCLES for kind in ('base', 'taux')]
+# Colonnes numériques lues par la simulation (paramètres des indicateurs puis saisonnalité)
+SIMULATION_COLUMNS = PARAMETER_COLUMNS + ['saisonnalite', 'pic_saison']
+
+def _rule_value(rule, territoire, config):
+    """Évalue une règle de INDICATOR_RULES pour un territoire"""
+    if isinstance(rule, str):
+        return config[rule]
+    if isinstance(rule, tuple):
+        field, factor = rule
+        return config[field] * factor
+    if isinstance(rule, list):
+        return next(value for territoires, value in rule if territoires is None or territoire in territoires)
+    return rule
+
+def compile_territory_table(overrides=None):
+    """Compile la table des paramètres: une ligne par territoire (et "default"), indexée par Territoire
+    
+    Colonnes: champs de CONFIG_FIELDS puis <indicateur>_base et <indicateur>_taux de chaque
+    indicateur de base (PARAMETER_COLUMNS). ``overrides`` (DataFrame indexé par territoire,
+    valeurs manquantes ignorées) remplace d'abord des champs de configuration, avant
+    l'évaluation des règles, puis des paramètres d'indicateurs; un territoire absent de
+    TERRITORY_CONFIGS part de la configuration "default".
+    """
+    overrides = pd.DataFrame() if overrides is None else overrides
+    unknown = [c for c in overrides.columns if c not in CONFIG_FIELDS and c not in PARAMETER_COLUMNS]
+    if unknown:
+        raise ValueError(f"Paramètres de territoire inconnus: {', '.join(map(str, unknown))}")
+    
+    rows = {}
+    for territoire in list(TERRITORY_CONFIGS) + [t for t in overrides.index if t not in TERRITORY_CONFIGS]:
+        config = dict(TERRITORY_CONFIGS.get(territoire, TERRITORY_CONFIGS["default"]))
+        given = overrides.loc[territoire].dropna() if territoire in overrides.index else pd.Series(dtype=object)
+        config.update({k: v for k, v in given.items() if k in CONFIG_FIELDS})
+        row = {field: config[field] for field in CONFIG_FIELDS}
+        for column, (base, rate) in INDICATOR_RULES.items():
+            row[f'{column}_base'] = _rule_value(base, territoire, config)
+            row[f'{column}_taux'] = _rule_value(rate, territoire, config)
+        row.update({k: v for k, v in given.items() if k in PARAMETER_COLUMNS})
+        rows[territoire] = row
+    
+    table = pd.DataFrame.from_dict(rows, orient='index')
+    table.index.name = 'Territoire'
+    table[PARAMETER_COLUMNS] = table[PARAMETER_COLUMNS].astype(float)
+    return table
+
+def load_territory_table(path):
+    """Charge des paramètres de territoires depuis un fichier CSV, JSON ou YAML et compile la table
+    
+    Une ligne (CSV) ou une entrée par territoire: colonne Territoire (ou clé d'un objet
+    JSON/YAML) et tout sous-ensemble des colonnes de compile_territory_table. Les valeurs
+    omises reprennent celles du territoire (ou de "default" pour un nouveau territoire).
+    """
+    lower = str(path).lower()
+    if lower.endswith(('.yaml', '.yml')):
+        if importlib.util.find_spec('yaml') is None:
+            raise ImportError("La lecture d'une table YAML nécessite PyYAML (pip install pyyaml)")
+        import yaml
+        with open(path, encoding='utf-8') as f:
+            entries = yaml.safe_load(f)
+    elif lower.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+    else:
+        entries = pd.read_csv(path, dtype={field: str for field in CONFIG_LISTS}).to_dict('records')
+    
+    # Objet {territoire: {paramètre: valeur}} ou liste d'enregistrements avec une clé Territoire
+    if isinstance(entries, dict):
+        entries = [{'Territoire': territoire, **values} for territoire, values in entries.items()]
+    overrides = pd.DataFrame(entries)
+    if 'Territoire' not in overrides:
+        raise ValueError(f"Colonne Territoire manquante dans la table des territoires: {path}")
+    for field in CONFIG_LISTS:
+        if field in overrides:
+            overrides[field] = [[v.strip() for v in value.split(';') if v.strip()] if isinstance(value, str)
+                                else value for value in overrides[field]]
+    return compile_territory_table(overrides.set_index('Territoire'))
+
+# Table des paramètres en vigueur, compilée à la première utilisation (voir use_territory_table),
+# ses lignes en dictionnaires pour les lectures d'un seul territoire et ses SIMULATION_COLUMNS
+# en matrice pour les simulations vectorisées
+_TERRITORY_TABLE = None
+_TERRITORY_RECORDS = None
+_TERRITORY_MATRIX = None
+
+def territory_table():
+    """Table des paramètres des territoires en vigueur"""
+    global _TERRITORY_TABLE
+    if _TERRITORY_TABLE is None:
+        _TERRITORY_TABLE = compile_territory_table()
+    return _TERRITORY_TABLE
+
+def use_territory_table(table=None):
+    """Remplace la table en vigueur: table compilée, chemin d'un fichier CSV/JSON/YAML ou None (défaut)
+    
+    Sert aussi d'initialiseur des pools de processus, qui reçoivent la table du parent.
+    """
+    global _TERRITORY_TABLE, _TERRITORY_RECORDS, _TERRITORY_MATRIX
+    if isinstance(table, (str, os.PathLike)):
+        table = load_territory_table(table)
+    _TERRITORY_TABLE, _TERRITORY_RECORDS, _TERRITORY_MATRIX = table, None, None
+    return territory_table()
+
+def territory_names():
+    """Territoires de la table en vigueur (TERRITOIRES et territoires ajoutés par fichier)"""
+    return [t for t in territory_table().index if t != "default"]
+
+def territory_record(territoire):
+    """Paramètres d'un territoire (dictionnaire partagé, ligne "default" pour un territoire inconnu)"""
+    global _TERRITORY_RECORDS
+    if _TERRITORY_RECORDS is None:
+        _TERRITORY_RECORDS = territory_table().to_dict('index')
+    return _TERRITORY_RECORDS.get(territoire, _TERRITORY_RECORDS["default"])
+
+def _territory_positions(territoires):
+    """Rangs des territoires dans la table en vigueur (rang de "default" pour un territoire inconnu)"""
+    index = territory_table().index
+    positions = index.get_indexer(territoires)
+    positions[positions < 0] = index.get_loc("default")
+    return positions
+
+def territory_parameters(territoires, columns=None):
+    """Lignes de la table pour un vecteur de territoires (ligne "default" pour un territoire inconnu)"""
+    table = territory_table() if columns is None else territory_table()[columns]
+    return table.iloc[_territory_positions(territoires)]
+
+def _territory_matrix(territoires):
+    """SIMULATION_COLUMNS des territoires (territoires × colonnes), lues dans la matrice de la table"""
+    global _TERRITORY_MATRIX
+    if _TERRITORY_MATRIX is None:
+        _TERRITORY_MATRIX = territory_table()[SIMULATION_COLUMNS].to_numpy(dtype=float)
+    return _TERRITORY_MATRIX[_territory_positions(territoires)]
+
 class DromcomImmobilierAnalyzer:
-    def __init__(self, territoire_name):
+    # Panneaux de l'analyse, dans l'ordre des sous-graphiques: (nom, méthode de tracé, colonnes tracées)
+    PANELS = [
+        # 1. Évolution des prix au m²
+        ('prix', '_plot_price_evolution', ('Prix_m2_Maison', 'Prix_m2_Appartement')),
+        # 2. Évolution des loyers au m²
+        ('loyers', '_plot_rent_evolution', ('Loyer_m2_Maison', 'Loyer_m2_Appartement')),
+        # 3. Accessibilité (années de salaire)
+        ('accessibilite', '_plot_affordability', ('Annee_Salaire_Maison', 'Annee_Salaire_Appartement')),
+        # 4. Transactions et durée de vente
+        ('transactions', '_plot_transactions', ('Transactions_Total', 'Duree_Vente_Moyenne')),
+        # 5. Investissements
+        ('investissements', '_plot_investments', ('Investissement_Etranger', 'Investissement_Locatif')),
+        # 6. Indicateurs économiques
+        ('economie', '_plot_economic_indicators', ('Chomage', 'Revenu_Median')),
+        # 7. Ratios et indicateurs de marché
+        ('marche', '_plot_market_indicators', ('Taux_Vacance_Locatif', 'Ratio_Loyer_Revenu')),
+        # 8. Comparaison prix/loyers
+        ('rendements', '_plot_price_rent_comparison',
+         ('Loyer_m2_Maison', 'Prix_m2_Maison', 'Loyer_m2_Appartement', 'Prix_m2_Appartement')),
+    ]
+    
+    def __init__(self, territoire_name, events=None, freq='Y', start_year=2002, end_year=2025, seed=None):
         self.territoire = territoire_name
         self.colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#F9A602', '#6A0572', 
                       '#AB83A1', '#5CAB7D', '#2A9D8F', '#E76F51', '#264653']
         
-        self.start_year = 2002
-        self.end_year = 2025
+        self.start_year = start_year
+        self.end_year = end_year
+        self.freq = _normalize_freq(freq)
+        
+        # Graine racine des flux aléatoires (entier, SeedSequence ou Generator, voir member_rng)
+        self.seed = seed
+        self.seed_sequence = _root_seed_sequence(seed)
         
-        # Configuration spécifique à chaque territoire
+        # Configuration spécifique à chaque territoire (ligne de la table des paramètres en vigueur)
+        self.parameters = territory_record(territoire_name)
         self.config = self._get_territoire_config()
+        self.indicator_params = self._get_indicator_params()
         
-    def _get_territoire_config(self):
-        """Retourne la configuration spécifique pour chaque DROM-COM"""
-        configs = {
-            "Guadeloupe": {
-                "prix_m2_base": 1800,
-                "loyer_m2_base": 10.5,
-                "revenu_median": 18000,
-                "specialites": ["tourisme", "résidentiel", "luxe"],
-                "zones_cles": ["Pointe-à-Pitre", "Gosier", "Sainte-Anne", "Basse-Terre"]
-            },
-            "Martinique": {
-                "prix_m2_base": 2200,
-                "loyer_m2_base": 12.0,
-                "revenu_median": 19500,
-                "specialites": ["tourisme", "résidentiel", "vue mer"],
-                "zones_cles": ["Fort-de-France", "Ducos", "Schoelcher", "Trois-Îlets"]
-            },
-            "Guyane": {
-                "prix_m2_base": 1500,
-                "loyer_m2_base": 9.0,
-                "revenu_median": 16500,
-                "specialites": ["spatial", "croissance", "défiscalisation"],
-                "zones_cles": ["Cayenne", "Kourou", "Remire-Montjoly", "Matoury"]
-            },
-            "La Réunion": {
-                "prix_m2_base": 2100,
-                "loyer_m2_base": 11.5,
-                "revenu_median": 19000,
-                "specialites": ["tourisme", "résidentiel", "haute altitude"],
-                "zones_cles": ["Saint-Denis", "Saint-Paul", "Saint-Pierre", "Le Tampon"]
-            },
-            "Mayotte": {
-                "prix_m2_base": 1200,
-                "loyer_m2_base": 7.5,
-                "revenu_median": 9500,
-                "specialites": ["croissance", "accession", "défavorisé"],
-                "zones_cles": ["Mamoudzou", "Dzaoudzi", "Koungou", "Tsingoni"]
-            },
-            "Saint-Martin": {
-                "prix_m2_base": 3500,
-                "loyer_m2_base": 20.0,
-                "revenu_median": 22000,
-                "specialites": ["luxe", "tourisme", "international"],
-                "zones_cles": ["Marigot", "Grand-Case", "Baie Orientale", "Terres Basses"]
-            },
-            "Saint-Barthélemy": {
-                "prix_m2_base": 8500,
-                "loyer_m2_base": 45.0,
-                "revenu_median": 35000,
-                "specialites": ["ultra-luxe", "jet-set", "international"],
-                "zones_cles": ["Gustavia", "Saint-Jean", "Lorient", "Flamands"]
-            },
-            "Saint-Pierre-et-Miquelon": {
-                "prix_m2_base": 1800,
-                "loyer_m2_base": 9.5,
-                "revenu_median": 21000,
-                "specialites": ["pêche", "isolé", "climat froid"],
-                "zones_cles": ["Saint-Pierre", "Miquelon", "Langlade"]
-            },
-            "Wallis-et-Futuna": {
-                "prix_m2_base": 1300,
-                "loyer_m2_base": 8.0,
-                "revenu_median": 12000,
-                "specialites": ["traditionnel", "communautaire", "isolé"],
-                "zones_cles": ["Mata-Utu", "Leava", "Alo", "Sigave"]
-            },
-            "Polynésie française": {
-                "prix_m2_base": 2800,
-                "loyer_m2_base": 15.0,
-                "revenu_median": 18500,
-                "specialites": ["tourisme", "insulaire", "vue lagons"],
-                "zones_cles": ["Papeete", "Punaauia", "Moorea", "Bora-Bora"]
-            },
-            "Nouvelle-Calédonie": {
-                "prix_m2_base": 2500,
-                "loyer_m2_base": 14.0,
-                "revenu_median": 23000,
-                "specialites": ["nickel", "austral", "vue mer"],
-                "zones_cles": ["Nouméa", "Dumbéa", "Mont-Dore", "Païta"]
-            },
-            # Configuration par défaut
-            "default": {
-                "prix_m2_base": 2000,
-                "loyer_m2_base": 11.0,
-                "revenu_median": 18000,
-                "specialites": ["résidentiel", "tourisme"],
-                "zones_cles": ["Capitale", "Zone touristique", "Périurbain"]
-            }
-        }
+        # Événements et tendances appliqués après la simulation
+        self.events = list(EVENEMENTS) if events is None else _validate_events(events)
         
-        return configs.get(self.territoire, configs["default"])
+    def _get_territoire_config(self):
+        """Retourne la configuration spécifique du territoire (ligne de la table des paramètres)"""
+        return {field: self.parameters[field] for field in CONFIG_FIELDS}
     
-    def generate_real_estate_data(self):
-        """Génère des données immobilières pour le territoire"""
-        print(f"🏠 Génération des données immobilières pour {self.territoire}...")
-        
-        # Créer une base de données annuelle
-        dates = pd.date_range(start=f'{self.start_year}-01-01', 
-                             end=f'{self.end_year}-12-31', freq='Y')
-        
-        data = {'Annee': [date.year for date in dates]}
-        
-        # Données immobilières de base
-        data['Prix_m2_Maison'] = self._simulate_house_prices(dates)
-        data['Prix_m2_Appartement'] = self._simulate_apartment_prices(dates)
-        data['Loyer_m2_Maison'] = self._simulate_house_rents(dates)
-        data['Loyer_m2_Appartement'] = self._simulate_apartment_rents(dates)
-        
-        # Indicateurs de marché
-        data['Transactions_Total'] = self._simulate_transactions(dates)
-        data['Duree_Vente_Moyenne'] = self._simulate_selling_time(dates)
-        data['Taux_Vacance_Locatif'] = self._simulate_vacancy_rate(dates)
-        
-        # Indicateurs économiques liés
-        data['Revenu_Median'] = self._simulate_median_income(dates)
-        data['Taux_Interet_Hypothecaire'] = self._simulate_mortgage_rates(dates)
-        data['Chomage'] = self._simulate_unemployment(dates)
-        
-        # Indicateurs d'accessibilité
-        data['Annee_Salaire_Maison'] = self._simulate_years_of_income_house(dates)
-        data['Annee_Salaire_Appartement'] = self._simulate_years_of_income_apartment(dates)
-        data['Ratio_Loyer_Revenu'] = self._simulate_rent_income_ratio(dates)
-        
-        # Investissements et constructions
-        data['Permis_Construire'] = self._simulate_building_permits(dates)
-        data['Investissement_Etranger'] = self._simulate_foreign_investment(dates)
-        data['Investissement_Locatif'] = self._simulate_rental_investment(dates)
-        
-        df = pd.DataFrame(data)
-        
-        # Ajouter des tendances spécifiques au territoire
-        self._add_territory_trends(df)
-        
+    def generate_real_estate_data(self, freq=None, cache=None, seed=None, verbose=True):
+        """Génère des données immobilières pour le territoire
+        
+        ``freq`` ('Y', 'Q', 'M' ou 'W', défaut: celle de l'analyseur) fixe la résolution;
+        en infra-annuel une colonne Date précède Annee et les flux (transactions, permis,
+        investissements) restent exprimés en rythme annuel. ``seed`` remplace la graine
+        de l'analyseur pour cet appel seulement; les données sont celles du membre 0 d'un
+        ensemble de même graine.
+        Avec une graine, ``cache`` (ResultCache) réutilise les données déjà générées pour
+        la même configuration. ``verbose=False`` n'affiche pas la progression.
+        """
+        freq = self.freq if freq is None else _normalize_freq(freq)
+        seed_sequence = self.seed_sequence if seed is None else _root_seed_sequence(seed)
+        key = None
+        if cache is not None and (seed is not None or self.seed is not None):
+            key = self.cache_key(freq, seed_sequence)
+            df = cache.get_frame(key)
+            if df is not None:
+                if verbose:
+                    print(f"♻️  Données immobilières de {self.territoire} lues dans le cache")
+                return df
+        
+        if verbose:
+            print(f"🏠 Génération des données immobilières pour {self.territoire}...")
+        
+        # Créer une grille de périodes (annuelle par défaut)
+        dates = period_dates(self.start_year, self.end_year, freq)
+        
+        # Moteur des ensembles et des cubes, avec un seul territoire (membre 0 de la graine de l'appel)
+        noise = standard_noise(seed_sequence, self.territoire, 0, len(dates))
+        values = _simulate_territories([self], dates, events=self.events, freq=freq, noise=noise[None])[0]
+        df = self._real_estate_frame(values, dates, freq)
+        if key is not None:
+            cache.put_frame(key, df)
+        return df
+    
+    def _real_estate_frame(self, values, dates, freq):
+        """DataFrame des indicateurs simulés (périodes × indicateurs), précédés de Annee et, en infra-annuel, de Date"""
+        df = pd.DataFrame(values, columns=INDICATEURS)
+        df.insert(0, 'Annee', dates.year.to_numpy())
+        if freq != 'Y':
+            df.insert(0, 'Date', dates)
         return df
     
-    def _simulate_house_prices(self, dates):
+    def extend_real_estate_data(self, n_periods, until, rng):
+        """Simule uniquement les périodes qui suivent les ``n_periods`` premières, jusqu'à ``until``
+        
+        La période qui contient ``until`` est incluse (voir _until_end). ``rng`` est le générateur du membre 0 repris après les périodes existantes (voir
+        noise_generator): les lignes sont celles d'une génération complète de même graine
+        sur l'horizon prolongé, pour un coût proportionnel aux seules nouvelles périodes.
+        """
+        until = _until_end(until)
+        dates = period_dates(self.start_year, until.year, self.freq)[n_periods:]
+        dates = dates[_period_starts(dates, self.freq) <= until]
+        noise = standard_noise(self.seed_sequence, self.territoire, 0, len(dates), rng)
+        values = _simulate_territories([self], dates, events=self.events, freq=self.freq,
+                                       first_period=n_periods, noise=noise[None])[0]
+        return self._real_estate_frame(values, dates, self.freq)
+    
+    def cache_key(self, freq=None, seed_sequence=None):
+        """Clé de cache des données: configuration, années, événements, graine et version du code"""
+        freq = self.freq if freq is None else _normalize_freq(freq)
+        seed_sequence = self.seed_sequence if seed_sequence is None else seed_sequence
+        # Seuls les événements qui touchent le territoire changent ses données
+        events = [e for e in self.events if e["territoires"] is None or self.territoire in e["territoires"]]
+        return ResultCache.key('donnees', __version__, self.territoire, self.config, self.indicator_params,
+                               self.start_year, self.end_year, freq, events,
+                               _seed_fingerprint(seed_sequence))
+    
+    def observed_real_estate_data(self, transactions, fill=True, verbose=True):
+        """Données du territoire au format de generate_real_estate_data, tirées de transactions réelles
+        
+        ``transactions`` (TransactionAggregator) fournit les prix moyens au m² et le nombre de
+        transactions de chaque période, à la résolution de l'agrégation. Les autres indicateurs
+        de base sont simulés (``fill=True``) ou laissés vides, puis les indicateurs dérivés
+        sont recalculés. Les périodes sans vente ont des prix vides et zéro transaction.
+        """
+        freq = transactions.freq
+        if fill:
+            df = self.generate_real_estate_data(freq=freq, verbose=verbose)
+        else:
+            dates = period_dates(self.start_year, self.end_year, freq)
+            df = pd.DataFrame(np.nan, index=range(len(dates)), columns=INDICATEURS)
+            df.insert(0, 'Annee', dates.year.to_numpy())
+            if freq != 'Y':
+                df.insert(0, 'Date', dates)
+        
+        key = 'Annee' if freq == 'Y' else 'Date'
+        observed = transactions.indicators()
+        observed = observed[observed['Territoire'] == self.territoire].set_index(key)
+        for column in TRANSACTION_INDICATORS:
+            df[column] = observed[column].reindex(df[key]).to_numpy()
+        df['Transactions_Total'] = df['Transactions_Total'].fillna(0)
+        return compute_derived_indicators(df)
+    
+    def _get_indicator_params(self):
+        """Retourne (valeur de base, taux de croissance par période) de chaque indicateur simulé"""
+        return {column: (self.parameters[f'{column}_base'], self.parameters[f'{column}_taux'])
+                for column in CYCLES}
+    
+    def noise_generator(self, n_periods):
+        """Générateur du membre 0 positionné après les ``n_periods`` premières périodes"""
+        rng = member_rng(self.seed_sequence, self.territoire, 0)
+        rng.standard_normal((n_periods, len(CYCLES)))
+        return rng
+    
+    def _simulate_indicator(self, column, dates, freq=None):
+        """Simule un indicateur de base (avant tendances) sur des dates de la grille du membre 0"""
+        freq = self.freq if freq is None else _normalize_freq(freq)
+        dates = pd.DatetimeIndex(dates)
+        first = (dates.year[0] - self.start_year) * FREQUENCES[freq] + _period_index(dates[:1], freq)[0]
+        noise = noise_block(self.seed_sequence, self.territoire, 0, first + len(dates))[:, first:]
+        return _simulate_base([self], dates, noise[None], freq, first, columns=(column,))[column][0]
+    
+    def _simulate_house_prices(self, dates, freq=None):
         """Simule les prix au m² des maisons"""
-        base_price = self.config["prix_m2_base"]
-        
-        prices = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.045  # Croissance forte dans les îles luxueuses
-            elif self.territoire in ["Guyane", "Mayotte"]:
-                growth_rate = 0.038  # Croissance forte dans les territoires en développement
-            elif self.territoire in ["Nouvelle-Calédonie", "Polynésie française"]:
-                growth_rate = 0.032  # Croissance modérée
-            else:
-                growth_rate = 0.028  # Croissance standard
-            
-            # Appliquer la croissance
-            growth = 1 + growth_rate * i
-            
-            # Variations cycliques
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.92
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.08
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.06)
-            prices.append(base_price * growth * multiplier * noise)
-        
-        return prices
+        return self._simulate_indicator('Prix_m2_Maison', dates, freq)
     
-    def _simulate_apartment_prices(self, dates):
+    def _simulate_apartment_prices(self, dates, freq=None):
         """Simule les prix au m² des appartements"""
-        base_price = self.config["prix_m2_base"] * 1.15  # Généralement plus chers que les maisons
-        
-        prices = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.048  # Croissance très forte
-            elif self.territoire in ["Guyane", "Mayotte"]:
-                growth_rate = 0.042  # Croissance forte
-            elif self.territoire in ["La Réunion", "Martinique"]:
-                growth_rate = 0.035  # Croissance modérée
-            else:
-                growth_rate = 0.030  # Croissance standard
-            
-            # Appliquer la croissance
-            growth = 1 + growth_rate * i
-            
-            # Variations cycliques
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.90
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.10
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.07)
-            prices.append(base_price * growth * multiplier * noise)
-        
-        return prices
+        return self._simulate_indicator('Prix_m2_Appartement', dates, freq)
     
-    def _simulate_house_rents(self, dates):
+    def _simulate_house_rents(self, dates, freq=None):
         """Simule les loyers au m² des maisons"""
-        base_rent = self.config["loyer_m2_base"]
-        
-        rents = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.032  # Croissance forte
-            elif self.territoire in ["Guyane", "Mayotte"]:
-                growth_rate = 0.028  # Croissance modérée
-            else:
-                growth_rate = 0.022  # Croissance standard
-            
-            # Appliquer la croissance
-            growth = 1 + growth_rate * i
-            
-            # Variations cycliques (les loyers sont moins volatils que les prix)
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.96
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.04
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.04)
-            rents.append(base_rent * growth * multiplier * noise)
-        
-        return rents
+        return self._simulate_indicator('Loyer_m2_Maison', dates, freq)
     
-    def _simulate_apartment_rents(self, dates):
+    def _simulate_apartment_rents(self, dates, freq=None):
         """Simule les loyers au m² des appartements"""
-        base_rent = self.config["loyer_m2_base"] * 1.10  # Généralement plus chers que les maisons
-        
-        rents = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.035  # Croissance forte
-            elif self.territoire in ["Guyane", "Mayotte"]:
-                growth_rate = 0.030  # Croissance modérée
-            else:
-                growth_rate = 0.025  # Croissance standard
-            
-            # Appliquer la croissance
-            growth = 1 + growth_rate * i
-            
-            # Variations cycliques
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.95
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.05
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.05)
-            rents.append(base_rent * growth * multiplier * noise)
-        
-        return rents
+        return self._simulate_indicator('Loyer_m2_Appartement', dates, freq)
     
-    def _simulate_transactions(self, dates):
+    def _simulate_transactions(self, dates, freq=None):
         """Simule le volume de transactions"""
-        # Volume de base selon le territoire (en nombre de transactions)
-        if self.territoire in ["La Réunion", "Martinique", "Guadeloupe"]:
-            base_volume = 5000
-        elif self.territoire in ["Guyane", "Nouvelle-Calédonie", "Polynésie française"]:
-            base_volume = 2500
-        elif self.territoire == "Mayotte":
-            base_volume = 1500
-        elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-            base_volume = 500
-        else:
-            base_volume = 1000
-        
-        transactions = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire in ["Guyane", "Mayotte"]:
-                growth_rate = 0.035  # Croissance forte
-            elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.025  # Croissance modérée
-            else:
-                growth_rate = 0.015  # Croissance standard
-            
-            # Appliquer la croissance
-            growth = 1 + growth_rate * i
-            
-            # Variations cycliques (forte sensibilité aux conditions économiques)
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.65
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.25
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.12)
-            transactions.append(base_volume * growth * multiplier * noise)
-        
-        return transactions
+        return self._simulate_indicator('Transactions_Total', dates, freq)
     
-    def _simulate_selling_time(self, dates):
+    def _simulate_selling_time(self, dates, freq=None):
         """Simule la durée moyenne de vente (en jours)"""
-        # Durée de base selon le territoire
-        if self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-            base_duration = 60  # Marché dynamique
-        elif self.territoire in ["Guyane", "Mayotte"]:
-            base_duration = 90  # Marché en développement
-        elif self.territoire in ["La Réunion", "Martinique"]:
-            base_duration = 75  # Marché standard
-        else:
-            base_duration = 85  # Marché standard
-        
-        durations = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution différente selon les territoires
-            if self.territoire in ["Guyane", "Mayotte"]:
-                trend = 1 - 0.01 * i  # Amélioration progressive
-            else:
-                trend = 1 - 0.005 * i  # Amélioration lente
-            
-            # Variations cycliques (plus long en période de crise)
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 1.35
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 0.80
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.08)
-            durations.append(base_duration * trend * multiplier * noise)
-        
-        return durations
+        return self._simulate_indicator('Duree_Vente_Moyenne', dates, freq)
     
-    def _simulate_vacancy_rate(self, dates):
+    def _simulate_vacancy_rate(self, dates, freq=None):
         """Simule le taux de vacance locative (en %)"""
-        # Taux de base selon le territoire
-        if self.territoire in ["Mayotte", "Guyane"]:
-            base_rate = 4.5  # Faible vacance (demande forte)
-        elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-            base_rate = 8.0  # Vacance modérée (saisonnalité)
-        elif self.territoire in ["La Réunion", "Martinique"]:
-            base_rate = 6.0  # Vacance standard
-        else:
-            base_rate = 5.5  # Vacance standard
-        
-        rates = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution différente selon les territoires
-            if self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                trend = 1 + 0.01 * i  # Légère augmentation
-            else:
-                trend = 1 - 0.005 * i  # Légère diminution
-            
-            # Variations cycliques (plus élevé en période de crise)
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 1.25
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 0.85
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.06)
-            rates.append(base_rate * trend * multiplier * noise)
-        
-        return rates
+        return self._simulate_indicator('Taux_Vacance_Locatif', dates, freq)
     
-    def _simulate_median_income(self, dates):
+    def _simulate_median_income(self, dates, freq=None):
         """Simule le revenu médian (en euros)"""
-        base_income = self.config["revenu_median"]
-        
-        incomes = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire in ["Guyane", "Mayotte"]:
-                growth_rate = 0.022  # Croissance forte
-            elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.018  # Croissance modérée
-            else:
-                growth_rate = 0.015  # Croissance standard
-            
-            # Appliquer la croissance
-            growth = 1 + growth_rate * i
-            
-            # Variations cycliques
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.97
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.04
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.03)
-            incomes.append(base_income * growth * multiplier * noise)
-        
-        return incomes
+        return self._simulate_indicator('Revenu_Median', dates, freq)
     
-    def _simulate_mortgage_rates(self, dates):
+    def _simulate_mortgage_rates(self, dates, freq=None):
         """Simule les taux d'intérêt hypothécaires (en %)"""
-        # Taux de base selon la période
-        rates = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Tendances historiques et prospectives des taux
-            if year <= 2005:
-                base_rate = 4.2
-            elif year <= 2008:
-                base_rate = 4.5
-            elif year <= 2012:
-                base_rate = 3.8
-            elif year <= 2016:
-                base_rate = 2.9
-            elif year <= 2020:
-                base_rate = 1.8
-            elif year <= 2023:
-                base_rate = 2.2
-            else:
-                base_rate = 2.8
-            
-            # Ajouter une prime spécifique aux DROM-COM
-            if self.territoire in ["Mayotte", "Guyane", "Wallis-et-Futuna"]:
-                territory_premium = 0.4
-            elif self.territoire in ["Saint-Pierre-et-Miquelon", "Polynésie française"]:
-                territory_premium = 0.3
-            else:
-                territory_premium = 0.2
-            
-            noise = np.random.normal(1, 0.05)
-            rates.append((base_rate + territory_premium) * noise)
-        
-        return rates
+        return self._simulate_indicator('Taux_Interet_Hypothecaire', dates, freq)
     
-    def _simulate_unemployment(self, dates):
+    def _simulate_unemployment(self, dates, freq=None):
         """Simule le taux de chômage (en %)"""
-        # Taux de base selon le territoire
-        if self.territoire in ["Mayotte", "Guyane"]:
-            base_rate = 22.0
-        elif self.territoire in ["Martinique", "Guadeloupe"]:
-            base_rate = 18.0
-        elif self.territoire == "La Réunion":
-            base_rate = 16.0
-        elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-            base_rate = 12.0
-        else:
-            base_rate = 14.0
-        
-        rates = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Évolution avec des variations cycliques
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 1.15
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes plus favorables
-                multiplier = 0.92
-            else:
-                multiplier = 1.0
-            
-            # Tendances à long terme
-            if self.territoire in ["Mayotte", "Guyane"]:
-                trend = 1 - 0.005 * i  # Légère amélioration
-            elif self.territoire in ["Martinique", "Guadeloupe"]:
-                trend = 1 - 0.004 * i  # Légère amélioration
-            else:
-                trend = 1 - 0.003 * i  # Très légère amélioration
-            
-            noise = np.random.normal(1, 0.05)
-            rates.append(base_rate * trend * multiplier * noise)
-        
-        return rates
-    
-    def _simulate_years_of_income_house(self, dates):
-        """Simule le nombre d'années de salaire nécessaire pour une maison"""
-        years = []
-        for i, date in enumerate(dates):
-            # Prix moyen d'une maison (100m²)
-            house_price = self._simulate_house_prices([date])[0] * 100
-            
-            # Revenu médian annuel
-            median_income = self._simulate_median_income([date])[0]
-            
-            # Calcul du nombre d'années de salaire
-            years_of_income = house_price / median_income
-            
-            years.append(years_of_income)
-        
-        return years
+        return self._simulate_indicator('Chomage', dates, freq)
     
-    def _simulate_years_of_income_apartment(self, dates):
-        """Simule le nombre d'années de salaire nécessaire pour un appartement"""
-        years = []
-        for i, date in enumerate(dates):
-            # Prix moyen d'un appartement (70m²)
-            apartment_price = self._simulate_apartment_prices([date])[0] * 70
-            
-            # Revenu médian annuel
-            median_income = self._simulate_median_income([date])[0]
-            
-            # Calcul du nombre d'années de salaire
-            years_of_income = apartment_price / median_income
-            
-            years.append(years_of_income)
-        
-        return years
-    
-    def _simulate_rent_income_ratio(self, dates):
-        """Simule le ratio loyer/revenu (en %)"""
-        ratios = []
-        for i, date in enumerate(dates):
-            # Loyer mensuel moyen pour un appartement (70m²)
-            monthly_rent = self._simulate_apartment_rents([date])[0] * 70
-            
-            # Revenu médian annuel
-            median_income = self._simulate_median_income([date])[0]
-            
-            # Revenu médian mensuel
-            monthly_income = median_income / 12
-            
-            # Calcul du ratio
-            ratio = (monthly_rent / monthly_income) * 100
-            
-            ratios.append(ratio)
-        
-        return ratios
-    
-    def _simulate_building_permits(self, dates):
+    def _simulate_building_permits(self, dates, freq=None):
         """Simule le nombre de permis de construire"""
-        # Volume de base selon le territoire
-        if self.territoire in ["La Réunion", "Martinique", "Guadeloupe"]:
-            base_volume = 2000
-        elif self.territoire in ["Guyane", "Nouvelle-Calédonie"]:
-            base_volume = 1200
-        elif self.territoire == "Mayotte":
-            base_volume = 800
-        elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-            base_volume = 200
-        else:
-            base_volume = 600
-        
-        permits = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire in ["Guyane", "Mayotte"]:
-                growth_rate = 0.040  # Croissance forte
-            elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.025  # Croissance modérée
-            else:
-                growth_rate = 0.015  # Croissance standard
-            
-            # Appliquer la croissance
-            growth = 1 + growth_rate * i
-            
-            # Variations cycliques (forte sensibilité aux conditions économiques)
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.60
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.30
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.10)
-            permits.append(base_volume * growth * multiplier * noise)
-        
-        return permits
+        return self._simulate_indicator('Permis_Construire', dates, freq)
     
-    def _simulate_foreign_investment(self, dates):
+    def _simulate_foreign_investment(self, dates, freq=None):
         """Simule l'investissement étranger (en millions d'euros)"""
-        # Volume de base selon le territoire
-        if self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-            base_volume = 120
-        elif self.territoire in ["Polynésie française", "Nouvelle-Calédonie"]:
-            base_volume = 80
-        elif self.territoire in ["Martinique", "Guadeloupe"]:
-            base_volume = 50
-        elif self.territoire == "La Réunion":
-            base_volume = 40
-        else:
-            base_volume = 20
-        
-        investments = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.050  # Croissance forte
-            elif self.territoire in ["Polynésie française", "Nouvelle-Calédonie"]:
-                growth_rate = 0.035  # Croissance modérée
-            else:
-                growth_rate = 0.020  # Croissance standard
-            
-            # Appliquer la croissance
-            growth = 1 + growth_rate * i
-            
-            # Variations cycliques
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.70
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.40
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.15)
-            investments.append(base_volume * growth * multiplier * noise)
-        
-        return investments
+        return self._simulate_indicator('Investissement_Etranger', dates, freq)
     
-    def _simulate_rental_investment(self, dates):
+    def _simulate_rental_investment(self, dates, freq=None):
         """Simule l'investissement locatif (en millions d'euros)"""
-        # Volume de base selon le territoire
-        if self.territoire in ["La Réunion", "Martinique", "Guadeloupe"]:
-            base_volume = 150
-        elif self.territoire in ["Guyane", "Nouvelle-Calédonie"]:
-            base_volume = 80
-        elif self.territoire == "Mayotte":
-            base_volume = 50
-        elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-            base_volume = 100
-        else:
-            base_volume = 60
-        
-        investments = []
-        for i, date in enumerate(dates):
-            year = date.year
-            
-            # Croissance différente selon les territoires
-            if self.territoire in ["Guyane", "Mayotte"]:
-                growth_rate = 0.045  # Croissance forte
-            elif self.territoire in ["Saint-Barthélemy", "Saint-Martin"]:
-                growth_rate = 0.030  # Croissance modérée
-            else:
-                growth_rate = 0.020  # Croissance standard
-            
-            # Appliquer la croissance
-            growth = 1 + growth_rate * i
-            
-            # Variations cycliques
-            if year in [2008, 2009, 2020, 2021]:  # Crises économiques
-                multiplier = 0.75
-            elif year in [2006, 2012, 2017, 2023]:  # Périodes fastes
-                multiplier = 1.25
-            else:
-                multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.12)
-            investments.append(base_volume * growth * multiplier * noise)
-        
-        return investments
+        return self._simulate_indicator('Investissement_Locatif', dates, freq)
+    
+    def _trend_multipliers(self, years):
+        """Matrice (années × indicateurs) des tendances spécifiques au territoire"""
+        return event_multipliers([self.territoire], years, self.events)[0]
+    
+    def add_events(self, events):
+        """Ajoute des événements (liste de règles ou chemin d'un fichier CSV/JSON)"""
+        if isinstance(events, (str, os.PathLike)):
+            events = load_event_table(events)
+        self.events = self.events + _validate_events(events)
     
     def _add_territory_trends(self, df):
-        """Ajoute des tendances réalistes adaptées à chaque territoire"""
-        for i, row in df.iterrows():
-            year = row['Annee']
-            
-            # Événements communs à tous les territoires
-            if 2008 <= year <= 2009:  # Crise financière mondiale
-                df.loc[i, 'Prix_m2_Maison'] *= 0.88
-                df.loc[i, 'Prix_m2_Appartement'] *= 0.85
-                df.loc[i, 'Transactions_Total'] *= 0.65
-            
-            if 2020 <= year <= 2021:  # Pandémie COVID-19
-                df.loc[i, 'Loyer_m2_Maison'] *= 0.95
-                df.loc[i, 'Loyer_m2_Appartement'] *= 0.93
-                df.loc[i, 'Transactions_Total'] *= 0.70
-                df.loc[i, 'Taux_Vacance_Locatif'] *= 1.20
-            
-            # Événements spécifiques à certains territoires
-            if self.territoire == "Mayotte":
-                if year >= 2011:  # Départementalisation
-                    df.loc[i, 'Investissement_Etranger'] *= 1.15
-                    df.loc[i, 'Permis_Construire'] *= 1.20
-            
-            if self.territoire == "Guyane":
-                if year in [2017, 2018]:  # Mouvements sociaux
-                    df.loc[i, 'Transactions_Total'] *= 0.80
-                    df.loc[i, 'Permis_Construire'] *= 0.85
-            
-            if self.territoire == "Nouvelle-Calédonie":
-                if year in [2018, 2020, 2021]:  # Référendums et incertitudes politiques
-                    df.loc[i, 'Investissement_Etranger'] *= 0.75
-                    df.loc[i, 'Transactions_Total'] *= 0.85
-            
-            if self.territoire == "La Réunion":
-                if year >= 2010:  # Développement du numérique et télétravail
-                    df.loc[i, 'Loyer_m2_Appartement'] *= 1.03
-                    df.loc[i, 'Prix_m2_Appartement'] *= 1.04
-            
-            # Tendances à long terme
-            if year >= 2015:
-                # Hausse générale des prix immobiliers
-                df.loc[i, 'Prix_m2_Maison'] *= 1.02
-                df.loc[i, 'Prix_m2_Appartement'] *= 1.03
-            
-            if year >= 2022:
-                # Reprise post-COVID
-                df.loc[i, 'Transactions_Total'] *= 1.15
-                df.loc[i, 'Investissement_Locatif'] *= 1.10
+        """Ajoute des tendances réalistes adaptées à chaque territoire (indexées par Annee, quelle que soit la fréquence)"""
+        columns = [c for c in INDICATEURS if c in df]
+        multipliers = self._trend_multipliers(df['Annee'])[:, [INDICATEURS.index(c) for c in columns]]
+        df[columns] = df[columns].to_numpy() * multipliers
     
-    def create_real_estate_analysis(self, df):
-        """Crée une analyse complète du marché immobilier"""
-        plt.style.use('seaborn-v0_8')
-        fig = plt.figure(figsize=(20, 24))
-        
-        # 1. Évolution des prix au m²
-        ax1 = plt.subplot(4, 2, 1)
-        self._plot_price_evolution(df, ax1)
-        
-        # 2. Évolution des loyers au m²
-        ax2 = plt.subplot(4, 2, 2)
-        self._plot_rent_evolution(df, ax2)
-        
-        # 3. Accessibilité (années de salaire)
-        ax3 = plt.subplot(4, 2, 3)
-        self._plot_affordability(df, ax3)
-        
-        # 4. Transactions et durée de vente
-        ax4 = plt.subplot(4, 2, 4)
-        self._plot_transactions(df, ax4)
+    def generate_ensemble(self, n_members, batch_size=10000, dtype=np.float32, out=None, first_member=0,
+                          verbose=True):
+        """Génère un ensemble Monte Carlo de trajectoires (membres × périodes × indicateurs)
+        
+        ``out`` permet d'écrire directement dans un tableau existant, par exemple une
+        tranche np.memmap d'un SimulationStore. Les tirages d'un membre ne dépendent que de
+        son numéro (voir ensemble_noise): ``first_member`` permet de répartir un ensemble
+        entre processus. ``verbose=False`` n'affiche pas la progression.
+        """
+        if verbose:
+            print(f"🎲 Génération de {n_members} trajectoires pour {self.territoire}...")
+        
+        dates = period_dates(self.start_year, self.end_year, self.freq)
+        if out is None:
+            ensemble = np.empty((n_members, len(dates), len(INDICATEURS)), dtype=dtype)
+        else:
+            ensemble = out
         
-        # 5. Investissements
-        ax5 = plt.subplot(4, 2, 5)
-        self._plot_investments(df, ax5)
+        # Simulation par lots pour borner la mémoire intermédiaire (float64)
+        for start in range(0, n_members, batch_size):
+            stop = min(start + batch_size, n_members)
+            ensemble[start:stop] = _simulate_territories([self], dates, stop - start, self.events, self.freq,
+                                                         first_member + start)[:, 0]
         
-        # 6. Indicateurs économiques
-        ax6 = plt.subplot(4, 2, 6)
-        self._plot_economic_indicators(df, ax6)
+        return ensemble
+    
+    def generate_to_store(self, store, batch_size=10000):
+        """Simule tous les membres du territoire directement dans un SimulationStore"""
+        if self.territoire not in store.territoires:
+            raise ValueError(f"{self.territoire} n'est pas dans le stockage {store.path}")
+        years = period_dates(self.start_year, self.end_year, self.freq).year
+        if store.freq != self.freq or list(store.annees) != list(years):
+            raise ValueError(f"Les périodes du stockage {store.path} ne correspondent pas à l'analyseur")
+        
+        out = store.sel(self.territoire)
+        self.generate_ensemble(out.shape[0], batch_size=batch_size, out=out)
+        store.flush()
+        return store
+    
+    def ensemble_bands(self, ensemble, percentiles=(5, 50, 95)):
+        """Calcule les bandes de percentiles d'un ensemble (un DataFrame par percentile)"""
+        values = np.empty((len(percentiles), ensemble.shape[1], ensemble.shape[2]))
         
-        # 7. Ratios et indicateurs de marché
-        ax7 = plt.subplot(4, 2, 7)
-        self._plot_market_indicators(df, ax7)
+        # Un indicateur à la fois pour limiter la copie faite par np.percentile
+        for k in range(ensemble.shape[2]):
+            values[:, :, k] = np.percentile(ensemble[:, :, k], percentiles, axis=0)
         
-        # 8. Comparaison prix/loyers
-        ax8 = plt.subplot(4, 2, 8)
-        self._plot_price_rent_comparison(df, ax8)
+        bands = {}
+        for p, band in zip(percentiles, values):
+            bands[p] = self._insert_period_columns(pd.DataFrame(band, columns=INDICATEURS))
         
-        plt.suptitle(f'Analyse du Marché Immobilier de {self.territoire} - DROM-COM ({self.start_year}-{self.end_year})', 
-                    fontsize=16, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig(f'{self.territoire}_real_estate_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        return bands
+    
+    def ensemble_to_frame(self, ensemble, first_member=0):
+        """Retourne un ensemble au format long (une ligne par membre et par période)
+        
+        ``first_member`` numérote les membres d'un lot qui ne commence pas au premier.
+        """
+        n_members, n_periods, _ = ensemble.shape
+        df = pd.DataFrame(ensemble.reshape(n_members * n_periods, -1), columns=INDICATEURS)
+        self._insert_period_columns(df, n_members)
+        df.insert(0, 'Membre', np.repeat(np.arange(first_member, first_member + n_members), n_periods))
+        df.insert(0, 'Territoire', self.territoire)
+        return df
+    
+    def _insert_period_columns(self, df, repeat=1):
+        """Ajoute en tête les colonnes de période: Annee et, en infra-annuel, Date"""
+        dates = period_dates(self.start_year, self.end_year, self.freq)
+        df.insert(0, 'Annee', np.tile(dates.year.to_numpy(dtype=np.int64), repeat))
+        if self.freq != 'Y':
+            df.insert(0, 'Date', np.tile(dates.to_numpy(), repeat))
+        return df
+    
+    def create_real_estate_analysis(self, df, bands=None, output_dir='.', show=True, insights=True,
+                                    dpi=300, formats=('png',), template=None, cache=None):
+        """Crée une analyse complète du marché immobilier
+        
+        ``bands`` (résultat de ensemble_bands) superpose les bandes de percentiles
+        de l'ensemble Monte Carlo sur les panneaux. ``template`` (RealEstateFigureTemplate)
+        réutilise une figure déjà construite: le rendu est alors headless, sans ``show()``,
+        et incrémental: seuls les panneaux dont les colonnes tracées ont changé depuis le
+        rendu précédent du gabarit sont retracés et redessinés dans l'image (voir
+        RealEstateFigureTemplate.save).
+        Sans ``show``, le rendu est headless (backend Agg, même si un backend interactif
+        est actif), et ``cache`` (ResultCache) recopie les images déjà rendues pour les
+        mêmes données sans charger matplotlib.
+        """
+        outputs = {fmt: os.path.join(output_dir, f'{self.territoire}_real_estate_analysis.{fmt}')
+                   for fmt in formats}
+        key = None
+        if cache is not None and (template is not None or not show):
+            key = ResultCache.key('graphiques', __version__, self.territoire, self.start_year, self.end_year,
+                                  dpi, ResultCache.frame_digest(df),
+                                  None if bands is None else {p: ResultCache.frame_digest(b) for p, b in bands.items()})
+            if cache.get_files(key, outputs):
+                if insights:
+                    self._generate_real_estate_insights(df)
+                return
+        
+        plt = _pyplot()
+        if template is None:
+            if not show:
+                use_headless_backend()
+            plt.style.use('seaborn-v0_8')
+            fig = plt.figure(figsize=(20, 24))
+            axes = [fig.add_subplot(4, 2, k) for k in range(1, 9)]
+            changed = range(len(self.PANELS))
+        else:
+            # Empreinte des données de chaque panneau: seuls les panneaux modifiés sont vidés et retracés
+            digests = [self._panel_digest(df, bands, columns) for _, _, columns in self.PANELS]
+            changed = [k for k, digest in enumerate(digests) if template.digests[k] != digest]
+            fig, axes = template.reset(changed)
+            template.digests = digests
+        
+        for k in changed:
+            name, method, _ = self.PANELS[k]
+            with profile_stage(f'graphiques/{name}'):
+                getattr(self, method)(df, axes[k], bands)
+        
+        title = f'Analyse du Marché Immobilier de {self.territoire} - DROM-COM ({self.start_year}-{self.end_year})'
+        fig.suptitle(title, fontsize=16, fontweight='bold')
+        
+        if template is not None:
+            template.title = title
+            template.save(outputs, dpi)
+        else:
+            # Mise en page recalculée à chaque rendu: graduations et étendues changent d'un territoire à l'autre
+            with profile_stage('graphiques/mise_en_page'):
+                fig.tight_layout()
+            for fmt, path in outputs.items():
+                with profile_stage('savefig', format=fmt, dpi=dpi):
+                    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+        if key is not None:
+            cache.put_files(key, outputs)
+        if template is None:
+            if show:
+                plt.show()
+            else:
+                plt.close(fig)
         
         # Générer les insights
-        self._generate_real_estate_insights(df)
+        if insights:
+            with profile_stage('insights'):
+                self._generate_real_estate_insights(df)
     
-    def _plot_price_evolution(self, df, ax):
+    def _panel_digest(self, df, bands, columns):
+        """Empreinte des données tracées par un panneau: abscisse et colonnes, y compris des bandes"""
+        frames = [df] + [bands[p] for p in sorted(bands or {})]
+        return ResultCache.key(*(ResultCache.frame_digest(frame[['Date' if 'Date' in frame else 'Annee', *columns]])
+                                 for frame in frames))
+    
+    def _period_axis(self, df):
+        """Abscisse des graphiques: Date en infra-annuel, Annee sinon"""
+        return df['Date'] if 'Date' in df else df['Annee']
+    
+    def _plot_band(self, ax, df, bands, column, color):
+        """Superpose la bande entre le plus petit et le plus grand percentile"""
+        if not bands:
+            return
+        low, high = bands[min(bands)], bands[max(bands)]
+        ax.fill_between(self._period_axis(low), low[column], high[column], color=color, alpha=0.15)
+    
+    def _plot_price_evolution(self, df, ax, bands=None):
         """Plot de l'évolution des prix au m²"""
-        ax.plot(df['Annee'], df['Prix_m2_Maison'], label='Maison (€/m²)', 
+        ax.plot(self._period_axis(df), df['Prix_m2_Maison'], label='Maison (€/m²)', 
                linewidth=2, color='#2A9D8F', alpha=0.8)
-        ax.plot(df['Annee'], df['Prix_m2_Appartement'], label='Appartement (€/m²)', 
+        self._plot_band(ax, df, bands, 'Prix_m2_Maison', '#2A9D8F')
+        ax.plot(self._period_axis(df), df['Prix_m2_Appartement'], label='Appartement (€/m²)', 
                linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax, df, bands, 'Prix_m2_Appartement', '#E76F51')
         
         ax.set_title('Évolution des Prix Immobiliers (€/m²)', fontsize=12, fontweight='bold')
         ax.set_ylabel('Prix (€/m²)')
         ax.legend()
         ax.grid(True, alpha=0.3)
     
-    def _plot_rent_evolution(self, df, ax):
+    def _plot_rent_evolution(self, df, ax, bands=None):
         """Plot de l'évolution des loyers au m²"""
-        ax.plot(df['Annee'], df['Loyer_m2_Maison'], label='Maison (€/m²/mois)', 
+        ax.plot(self._period_axis(df), df['Loyer_m2_Maison'], label='Maison (€/m²/mois)', 
                linewidth=2, color='#2A9D8F', alpha=0.8)
-        ax.plot(df['Annee'], df['Loyer_m2_Appartement'], label='Appartement (€/m²/mois)', 
+        self._plot_band(ax, df, bands, 'Loyer_m2_Maison', '#2A9D8F')
+        ax.plot(self._period_axis(df), df['Loyer_m2_Appartement'], label='Appartement (€/m²/mois)', 
                linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax, df, bands, 'Loyer_m2_Appartement', '#E76F51')
         
         ax.set_title('Évolution des Loyers (€/m²/mois)', fontsize=12, fontweight='bold')
         ax.set_ylabel('Loyer (€/m²/mois)')
         ax.legend()
         ax.grid(True, alpha=0.3)
     
-    def _plot_affordability(self, df, ax):
+    def _plot_affordability(self, df, ax, bands=None):
         """Plot de l'accessibilité (années de salaire)"""
-        ax.plot(df['Annee'], df['Annee_Salaire_Maison'], label='Maison (années de salaire)', 
+        ax.plot(self._period_axis(df), df['Annee_Salaire_Maison'], label='Maison (années de salaire)', 
                linewidth=2, color='#2A9D8F', alpha=0.8)
-        ax.plot(df['Annee'], df['Annee_Salaire_Appartement'], label='Appartement (années de salaire)', 
+        self._plot_band(ax, df, bands, 'Annee_Salaire_Maison', '#2A9D8F')
+        ax.plot(self._period_axis(df), df['Annee_Salaire_Appartement'], label='Appartement (années de salaire)', 
                linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax, df, bands, 'Annee_Salaire_Appartement', '#E76F51')
         
         ax.set_title('Accessibilité: Années de Salaire Nécessaires', fontsize=12, fontweight='bold')
         ax.set_ylabel('Années de salaire')
         ax.legend()
         ax.grid(True, alpha=0.3)
     
-    def _plot_transactions(self, df, ax):
+    def _plot_transactions(self, df, ax, bands=None):
         """Plot des transactions et durée de vente"""
-        # Transactions
-        ax.bar(df['Annee'], df['Transactions_Total'], label='Transactions', 
+        # Transactions (barres de 80% de la période, en jours sur un axe de dates)
+        x = self._period_axis(df)
+        width = 0.8 if 'Date' not in df else 0.8 * x.diff().dt.days.median()
+        ax.bar(x, df['Transactions_Total'], width=width, label='Transactions', 
               color='#2A9D8F', alpha=0.7)
+        self._plot_band(ax, df, bands, 'Transactions_Total', '#2A9D8F')
         
         ax.set_title('Volume de Transactions et Durée de Vente', fontsize=12, fontweight='bold')
         ax.set_ylabel('Nombre de transactions', color='#2A9D8F')
@@ -828,8 +1346,9 @@ class DromcomImmobilierAnalyzer:
         
         # Durée de vente en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Duree_Vente_Moyenne'], label='Durée de vente (jours)', 
+        ax2.plot(self._period_axis(df), df['Duree_Vente_Moyenne'], label='Durée de vente (jours)', 
                 linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax2, df, bands, 'Duree_Vente_Moyenne', '#E76F51')
         ax2.set_ylabel('Durée de vente (jours)', color='#E76F51')
         ax2.tick_params(axis='y', labelcolor='#E76F51')
         
@@ -838,23 +1357,26 @@ class DromcomImmobilierAnalyzer:
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
     
-    def _plot_investments(self, df, ax):
+    def _plot_investments(self, df, ax, bands=None):
         """Plot des investissements"""
-        ax.plot(df['Annee'], df['Investissement_Etranger'], label='Investissement étranger (M€)', 
+        ax.plot(self._period_axis(df), df['Investissement_Etranger'], label='Investissement étranger (M€)', 
                linewidth=2, color='#2A9D8F', alpha=0.8)
-        ax.plot(df['Annee'], df['Investissement_Locatif'], label='Investissement locatif (M€)', 
+        self._plot_band(ax, df, bands, 'Investissement_Etranger', '#2A9D8F')
+        ax.plot(self._period_axis(df), df['Investissement_Locatif'], label='Investissement locatif (M€)', 
                linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax, df, bands, 'Investissement_Locatif', '#E76F51')
         
         ax.set_title('Investissements Immobiliers', fontsize=12, fontweight='bold')
         ax.set_ylabel('Montant (M€)')
         ax.legend()
         ax.grid(True, alpha=0.3)
     
-    def _plot_economic_indicators(self, df, ax):
+    def _plot_economic_indicators(self, df, ax, bands=None):
         """Plot des indicateurs économiques"""
         # Taux de chômage
-        ax.plot(df['Annee'], df['Chomage'], label='Taux de chômage (%)', 
+        ax.plot(self._period_axis(df), df['Chomage'], label='Taux de chômage (%)', 
                linewidth=2, color='#2A9D8F', alpha=0.8)
+        self._plot_band(ax, df, bands, 'Chomage', '#2A9D8F')
         
         ax.set_title('Indicateurs Économiques', fontsize=12, fontweight='bold')
         ax.set_ylabel('Taux de chômage (%)', color='#2A9D8F')
@@ -863,8 +1385,9 @@ class DromcomImmobilierAnalyzer:
         
         # Revenu médian en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Revenu_Median'], label='Revenu médian (€)', 
+        ax2.plot(self._period_axis(df), df['Revenu_Median'], label='Revenu médian (€)', 
                 linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax2, df, bands, 'Revenu_Median', '#E76F51')
         ax2.set_ylabel('Revenu médian (€)', color='#E76F51')
         ax2.tick_params(axis='y', labelcolor='#E76F51')
         
@@ -873,11 +1396,12 @@ class DromcomImmobilierAnalyzer:
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
     
-    def _plot_market_indicators(self, df, ax):
+    def _plot_market_indicators(self, df, ax, bands=None):
         """Plot des indicateurs de marché"""
         # Taux de vacance
-        ax.plot(df['Annee'], df['Taux_Vacance_Locatif'], label='Taux de vacance locative (%)', 
+        ax.plot(self._period_axis(df), df['Taux_Vacance_Locatif'], label='Taux de vacance locative (%)', 
                linewidth=2, color='#2A9D8F', alpha=0.8)
+        self._plot_band(ax, df, bands, 'Taux_Vacance_Locatif', '#2A9D8F')
         
         ax.set_title('Indicateurs de Marché', fontsize=12, fontweight='bold')
         ax.set_ylabel('Taux de vacance (%)', color='#2A9D8F')
@@ -886,8 +1410,9 @@ class DromcomImmobilierAnalyzer:
         
         # Ratio loyer/revenu en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Ratio_Loyer_Revenu'], label='Ratio loyer/revenu (%)', 
+        ax2.plot(self._period_axis(df), df['Ratio_Loyer_Revenu'], label='Ratio loyer/revenu (%)', 
                 linewidth=2, color='#E76F51', alpha=0.8)
+        self._plot_band(ax2, df, bands, 'Ratio_Loyer_Revenu', '#E76F51')
         ax2.set_ylabel('Ratio loyer/revenu (%)', color='#E76F51')
         ax2.tick_params(axis='y', labelcolor='#E76F51')
         
@@ -896,7 +1421,7 @@ class DromcomImmobilierAnalyzer:
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
     
-    def _plot_price_rent_comparison(self, df, ax):
+    def _plot_price_rent_comparison(self, df, ax, bands=None):
         """Plot de la comparaison prix/loyers"""
         # Calcul du ratio prix/loyer (rendement brut)
         price_rent_ratio_house = []
@@ -911,9 +1436,9 @@ class DromcomImmobilierAnalyzer:
             rendement_appartement = (row['Loyer_m2_Appartement'] * 12 * 100) / row['Prix_m2_Appartement']
             price_rent_ratio_apartment.append(rendement_appartement)
         
-        ax.plot(df['Annee'], price_rent_ratio_house, label='Rendement brut maison (%)', 
+        ax.plot(self._period_axis(df), price_rent_ratio_house, label='Rendement brut maison (%)', 
                linewidth=2, color='#2A9D8F', alpha=0.8)
-        ax.plot(df['Annee'], price_rent_ratio_apartment, label='Rendement brut appartement (%)', 
+        ax.plot(self._period_axis(df), price_rent_ratio_apartment, label='Rendement brut appartement (%)', 
                linewidth=2, color='#E76F51', alpha=0.8)
         
         ax.set_title('Rendements Bruts Immobiliers', fontsize=12, fontweight='bold')
@@ -921,116 +1446,2056 @@ class DromcomImmobilierAnalyzer:
         ax.legend()
         ax.grid(True, alpha=0.3)
     
+    def real_estate_insights(self, df):
+        """Métriques des insights du territoire (une ligne indexée par Territoire, voir compute_insights)"""
+        return compute_insights(df.assign(Territoire=self.territoire))
+    
+    def _real_estate_insights_text(self, df):
+        """Texte des insights du territoire (voir format_insights)"""
+        insights = self.real_estate_insights(df).iloc[0]
+        return format_insights(insights, self.territoire, self.config, self.start_year, self.end_year)
+    
     def _generate_real_estate_insights(self, df):
         """Génère des insights analytiques adaptés au territoire"""
-        print(f"🏠 INSIGHTS IMMOBILIERS - {self.territoire} (DROM-COM)")
-        print("=" * 60)
+        print(self._real_estate_insights_text(df))
+
+# Métriques des insights: nom -> (colonne source, agrégation par groupe)
+INSIGHT_METRICS = {
+    'Prix_Moyen_Maison': ('Prix_m2_Maison', 'mean'),
+    'Prix_Moyen_Appartement': ('Prix_m2_Appartement', 'mean'),
+    'Loyer_Moyen_Maison': ('Loyer_m2_Maison', 'mean'),
+    'Loyer_Moyen_Appartement': ('Loyer_m2_Appartement', 'mean'),
+    'Prix_Initial_Maison': ('Prix_m2_Maison', 'first'),
+    'Prix_Final_Maison': ('Prix_m2_Maison', 'last'),
+    'Prix_Initial_Appartement': ('Prix_m2_Appartement', 'first'),
+    'Prix_Final_Appartement': ('Prix_m2_Appartement', 'last'),
+    'Annees_Salaire_Maison': ('Annee_Salaire_Maison', 'mean'),
+    'Annees_Salaire_Appartement': ('Annee_Salaire_Appartement', 'mean'),
+    'Part_Loyer_Revenu': ('Ratio_Loyer_Revenu', 'mean'),
+    'Transactions_Moyennes': ('Transactions_Total', 'mean'),
+    'Vacance_Moyenne': ('Taux_Vacance_Locatif', 'mean'),
+    'Investissement_Etranger_Moyen': ('Investissement_Etranger', 'mean'),
+    'Annee_Debut': ('Annee', 'first'),
+    'Annee_Fin': ('Annee', 'last'),
+}
+
+# Seuils des recommandations: marché très inaccessible (années de salaire), forte vacance (%)
+SEUIL_INACCESSIBLE = 10
+SEUIL_VACANCE = 7
+
+def compute_insights(frame, by=None):
+    """Calcule les métriques des insights de tous les groupes d'un DataFrame long en une agrégation
+    
+    ``by`` vaut par défaut les colonnes Territoire et Membre présentes; chaque groupe doit
+    être en ordre chronologique (ordre produit par le générateur). Retourne un DataFrame
+    indexé par groupe: moyennes, croissance des prix (%) et indicateurs des recommandations.
+    """
+    by = [c for c in ('Territoire', 'Membre') if c in frame] if by is None else list(by)
+    if not by:
+        raise ValueError("compute_insights attend au moins une colonne de regroupement (Territoire, Membre)")
+    insights = frame.groupby(by, sort=False).agg(**{name: pd.NamedAgg(column, how)
+                                                    for name, (column, how) in INSIGHT_METRICS.items()})
+    return _complete_insights(insights)
+
+def _complete_insights(insights):
+    """Ajoute la croissance des prix (%) et les indicateurs des recommandations aux métriques agrégées"""
+    insights['Croissance_Prix_Maison'] = (insights['Prix_Final_Maison'] / insights['Prix_Initial_Maison'] - 1) * 100
+    insights['Croissance_Prix_Appartement'] = (insights['Prix_Final_Appartement']
+                                               / insights['Prix_Initial_Appartement'] - 1) * 100
+    insights['Marche_Inaccessible'] = insights['Annees_Salaire_Maison'] > SEUIL_INACCESSIBLE
+    insights['Forte_Vacance'] = insights['Vacance_Moyenne'] > SEUIL_VACANCE
+    return insights
+
+class RunningInsights:
+    """Métriques des insights d'un territoire tenues à jour ligne à ligne (sans relire l'historique)
+    
+    Les moyennes sont des sommes et effectifs courants, 'first' et 'last' les premières
+    et dernières valeurs non vides: ``result()`` équivaut à compute_insights sur toutes
+    les lignes ajoutées. L'état ``state`` est sérialisable en JSON.
+    """
+    
+    def __init__(self, state=None):
+        self.state = state or {name: {} for name in INSIGHT_METRICS}
+    
+    def update(self, df):
+        """Ajoute des lignes (en ordre chronologique) aux métriques courantes"""
+        for name, (column, how) in INSIGHT_METRICS.items():
+            values = df[column].dropna().to_numpy()
+            if not len(values):
+                continue
+            metric = self.state[name]
+            if how == 'mean':
+                metric['somme'] = metric.get('somme', 0.0) + float(values.sum())
+                metric['effectif'] = metric.get('effectif', 0) + len(values)
+            elif how == 'first':
+                metric.setdefault('valeur', values[0].item())
+            else:
+                metric['valeur'] = values[-1].item()
+        return self
+    
+    def result(self):
+        """Métriques au format d'une ligne de compute_insights"""
+        insights = pd.Series({
+            name: (metric['somme'] / metric['effectif'] if INSIGHT_METRICS[name][1] == 'mean' else metric['valeur'])
+            if metric else np.nan
+            for name, metric in self.state.items()
+        }, dtype=object)
+        return _complete_insights(insights)
+
+def format_insights(insights, territoire, config, start_year, end_year):
+    """Met en forme les insights d'un territoire (une ligne de compute_insights) pour l'affichage"""
+    lines = [
+        f"🏠 INSIGHTS IMMOBILIERS - {territoire} (DROM-COM)",
+        "=" * 60,
         
         # 1. Statistiques de base
-        print("\n1. 📈 STATISTIQUES GÉNÉRALES:")
-        avg_house_price = df['Prix_m2_Maison'].mean()
-        avg_apartment_price = df['Prix_m2_Appartement'].mean()
-        avg_house_rent = df['Loyer_m2_Maison'].mean()
-        avg_apartment_rent = df['Loyer_m2_Appartement'].mean()
-        
-        print(f"Prix moyen au m² maison: {avg_house_price:.0f} €")
-        print(f"Prix moyen au m² appartement: {avg_apartment_price:.0f} €")
-        print(f"Loyer moyen au m² maison: {avg_house_rent:.1f} €/mois")
-        print(f"Loyer moyen au m² appartement: {avg_apartment_rent:.1f} €/mois")
+        "\n1. 📈 STATISTIQUES GÉNÉRALES:",
+        f"Prix moyen au m² maison: {insights['Prix_Moyen_Maison']:.0f} €",
+        f"Prix moyen au m² appartement: {insights['Prix_Moyen_Appartement']:.0f} €",
+        f"Loyer moyen au m² maison: {insights['Loyer_Moyen_Maison']:.1f} €/mois",
+        f"Loyer moyen au m² appartement: {insights['Loyer_Moyen_Appartement']:.1f} €/mois",
         
         # 2. Évolution des prix
-        print("\n2. 📊 ÉVOLUTION DES PRIX:")
-        house_price_growth = ((df['Prix_m2_Maison'].iloc[-1] / 
-                              df['Prix_m2_Maison'].iloc[0]) - 1) * 100
-        apartment_price_growth = ((df['Prix_m2_Appartement'].iloc[-1] / 
-                                  df['Prix_m2_Appartement'].iloc[0]) - 1) * 100
-        
-        print(f"Croissance des prix maison ({self.start_year}-{self.end_year}): {house_price_growth:.1f}%")
-        print(f"Croissance des prix appartement ({self.start_year}-{self.end_year}): {apartment_price_growth:.1f}%")
+        "\n2. 📊 ÉVOLUTION DES PRIX:",
+        f"Croissance des prix maison ({start_year}-{end_year}): {insights['Croissance_Prix_Maison']:.1f}%",
+        f"Croissance des prix appartement ({start_year}-{end_year}): {insights['Croissance_Prix_Appartement']:.1f}%",
         
         # 3. Accessibilité
-        print("\n3. 🏠 ACCESSIBILITÉ:")
-        avg_years_house = df['Annee_Salaire_Maison'].mean()
-        avg_years_apartment = df['Annee_Salaire_Appartement'].mean()
-        avg_rent_ratio = df['Ratio_Loyer_Revenu'].mean()
-        
-        print(f"Années de salaire nécessaires pour une maison: {avg_years_house:.1f} ans")
-        print(f"Années de salaire nécessaires pour un appartement: {avg_years_apartment:.1f} ans")
-        print(f"Part du revenu consacrée au loyer: {avg_rent_ratio:.1f}%")
+        "\n3. 🏠 ACCESSIBILITÉ:",
+        f"Années de salaire nécessaires pour une maison: {insights['Annees_Salaire_Maison']:.1f} ans",
+        f"Années de salaire nécessaires pour un appartement: {insights['Annees_Salaire_Appartement']:.1f} ans",
+        f"Part du revenu consacrée au loyer: {insights['Part_Loyer_Revenu']:.1f}%",
         
         # 4. Marché et investissements
-        print("\n4. 📋 INDICATEURS DE MARCHÉ:")
-        avg_transactions = df['Transactions_Total'].mean()
-        avg_vacancy = df['Taux_Vacance_Locatif'].mean()
-        avg_foreign_investment = df['Investissement_Etranger'].mean()
-        
-        print(f"Transactions annuelles moyennes: {avg_transactions:.0f}")
-        print(f"Taux de vacance locative moyen: {avg_vacancy:.1f}%")
-        print(f"Investissement étranger moyen: {avg_foreign_investment:.1f} M€/an")
+        "\n4. 📋 INDICATEURS DE MARCHÉ:",
+        f"Transactions annuelles moyennes: {insights['Transactions_Moyennes']:.0f}",
+        f"Taux de vacance locative moyen: {insights['Vacance_Moyenne']:.1f}%",
+        f"Investissement étranger moyen: {insights['Investissement_Etranger_Moyen']:.1f} M€/an",
         
         # 5. Spécificités du territoire
-        print(f"\n5. 🌟 SPÉCIFICITÉS DE {self.territoire.upper()}:")
-        print(f"Spécialités: {', '.join(self.config['specialites'])}")
-        print(f"Zones clés: {', '.join(self.config['zones_cles'])}")
+        f"\n5. 🌟 SPÉCIFICITÉS DE {territoire.upper()}:",
+        f"Spécialités: {', '.join(config['specialites'])}",
+        f"Zones clés: {', '.join(config['zones_cles'])}",
         
         # 6. Événements marquants
-        print("\n6. 📅 ÉVÉNEMENTS MARQUANTS:")
-        print("• 2008-2009: Crise financière mondiale (baisse des prix)")
-        print("• 2011: Départementalisation de Mayotte (hausse des investissements)")
-        print("• 2017: Mouvements sociaux en Guyane (ralentissement du marché)")
-        print("• 2018-2021: Référendums en Nouvelle-Calédonie (incertitudes)")
-        print("• 2020-2021: Pandémie de COVID-19 (baisse des transactions)")
+        "\n6. 📅 ÉVÉNEMENTS MARQUANTS:",
+        "• 2008-2009: Crise financière mondiale (baisse des prix)",
+        "• 2011: Départementalisation de Mayotte (hausse des investissements)",
+        "• 2017: Mouvements sociaux en Guyane (ralentissement du marché)",
+        "• 2018-2021: Référendums en Nouvelle-Calédonie (incertitudes)",
+        "• 2020-2021: Pandémie de COVID-19 (baisse des transactions)",
         
         # 7. Recommandations
-        print("\n7. 💡 RECOMMANDATIONS STRATÉGIQUES:")
-        
-        if avg_years_house > 10:  # Marché très inaccessible
-            print("• Développer des programmes d'accession à la propriété")
-            print("• Soutenir les dispositifs de prêts à taux zéro")
-            print("• Encourager la construction de logements sociaux")
-        
-        if avg_vacancy > 7:  # Forte vacance locative
-            print("• Diversifier l'offre locative (colocation, meublé, etc.)")
-            print("• Améliorer la qualité du parc immobilier existant")
-            print("• Développer le tourisme locatif")
-        
-        if "tourisme" in self.config["specialites"]:
-            print("• Développer l'immobilier de tourisme et la location saisonnière")
-            print("• Améliorer les infrastructures d'accueil touristique")
-            print("• Former les professionnels de l'immobilier touristique")
-        
-        if "luxe" in self.config["specialites"]:
-            print("• Positionner le territoire sur le marché international du luxe")
-            print("• Développer des services haut de gamme pour résidents")
-            print("• Promouvoir les atouts du territoire à l'international")
-        
-        if "croissance" in self.config["specialites"]:
-            print("• Anticiper les besoins en logements de la population croissante")
-            print("• Développer les infrastructures en parallèle de l'urbanisation")
-            print("• Préserver les espaces naturels malgré la pression foncière")
-
-def main():
-    """Fonction principale pour les DROM-COM"""
-    # Liste des DROM-COM
-    territoires = [
-        "Guadeloupe", "Martinique", "Guyane", "La Réunion", "Mayotte",
-        "Saint-Martin", "Saint-Barthélemy", "Saint-Pierre-et-Miquelon",
-        "Wallis-et-Futuna", "Polynésie française", "Nouvelle-Calédonie"
+        "\n7. 💡 RECOMMANDATIONS STRATÉGIQUES:",
     ]
     
+    if insights['Marche_Inaccessible']:  # Marché très inaccessible
+        lines += ["• Développer des programmes d'accession à la propriété",
+                  "• Soutenir les dispositifs de prêts à taux zéro",
+                  "• Encourager la construction de logements sociaux"]
+    
+    if insights['Forte_Vacance']:  # Forte vacance locative
+        lines += ["• Diversifier l'offre locative (colocation, meublé, etc.)",
+                  "• Améliorer la qualité du parc immobilier existant",
+                  "• Développer le tourisme locatif"]
+    
+    if "tourisme" in config["specialites"]:
+        lines += ["• Développer l'immobilier de tourisme et la location saisonnière",
+                  "• Améliorer les infrastructures d'accueil touristique",
+                  "• Former les professionnels de l'immobilier touristique"]
+    
+    if "luxe" in config["specialites"]:
+        lines += ["• Positionner le territoire sur le marché international du luxe",
+                  "• Développer des services haut de gamme pour résidents",
+                  "• Promouvoir les atouts du territoire à l'international"]
+    
+    if "croissance" in config["specialites"]:
+        lines += ["• Anticiper les besoins en logements de la population croissante",
+                  "• Développer les infrastructures en parallèle de l'urbanisation",
+                  "• Préserver les espaces naturels malgré la pression foncière"]
+    
+    return "\n".join(lines)
+
+class DromcomDataCube:
+    """Cube étiqueté (territoire × année × indicateur) des données immobilières"""
+    
+    def __init__(self, values, territoires, annees, indicateurs, dates=None):
+        self.values = values
+        self.territoires = list(territoires)
+        self.annees = np.asarray(annees)
+        self.indicateurs = list(indicateurs)
+        # Dates des périodes en résolution infra-annuelle (None en annuel)
+        self.dates = dates
+    
+    @property
+    def shape(self):
+        return self.values.shape
+    
+    def sel(self, territoire=None, annee=None, indicateur=None):
+        """Sélectionne une vue du cube par étiquettes (toutes les périodes de l'année en infra-annuel)"""
+        t = slice(None) if territoire is None else self.territoires.index(territoire)
+        y = slice(None)
+        if annee is not None:
+            periods = np.flatnonzero(self.annees == annee)
+            y = int(periods[0]) if self.dates is None else slice(periods[0], periods[-1] + 1)
+        k = slice(None) if indicateur is None else self.indicateurs.index(indicateur)
+        return self.values[t, y, k]
+    
+    def to_frame(self, territoire):
+        """Retourne un territoire au format de generate_real_estate_data"""
+        df = pd.DataFrame(self.sel(territoire=territoire), columns=self.indicateurs)
+        df.insert(0, 'Annee', self.annees)
+        if self.dates is not None:
+            df.insert(0, 'Date', self.dates)
+        return df
+    
+    def insights(self):
+        """Métriques des insights de tous les territoires du cube (voir compute_insights)"""
+        return compute_insights(self.to_long_frame())
+    
+    def to_long_frame(self):
+        """Retourne le cube au format long (une ligne par territoire et par période)"""
+        n_territoires, n_annees, _ = self.values.shape
+        df = pd.DataFrame(self.values.reshape(n_territoires * n_annees, -1), columns=self.indicateurs)
+        df.insert(0, 'Annee', np.tile(self.annees, n_territoires))
+        if self.dates is not None:
+            df.insert(0, 'Date', np.tile(np.asarray(self.dates), n_territoires))
+        df.insert(0, 'Territoire', np.repeat(self.territoires, n_annees))
+        return df
+
+class SimulationStore:
+    """Stockage sur disque (np.memmap) des simulations: territoires × membres × périodes × indicateurs
+    
+    Les valeurs sont dans ``<path>.npy`` (format NumPy, ouvrable en mémoire mappée) et les
+    étiquettes dans le fichier annexe ``<path>.json``. Les lectures sont des vues sans copie:
+    seules les tranches effectivement utilisées sont chargées depuis le disque.
+    """
+    
+    def __init__(self, path, values, metadata):
+        self.path = path
+        self.values = values
+        self.metadata = metadata
+        self.territoires = metadata['territoires']
+        self.annees = np.asarray(metadata['annees'])
+        self.indicateurs = metadata['indicateurs']
+        self.freq = metadata.get('freq', 'Y')
+    
+    @classmethod
+    def create(cls, path, territoires=None, start_year=2002, end_year=2025, n_members=1, dtype='float32',
+               freq='Y'):
+        """Crée un stockage vide sur disque (``annees`` donne l'année de chaque période)"""
+        territoires = list(territory_names() if territoires is None else territoires)
+        freq = _normalize_freq(freq)
+        metadata = {
+            'territoires': territoires,
+            'annees': period_dates(start_year, end_year, freq).year.tolist(),
+            'freq': freq,
+            'indicateurs': list(INDICATEURS),
+            'n_members': n_members,
+            'dtype': np.dtype(dtype).name,
+        }
+        shape = (len(territoires), n_members, len(metadata['annees']), len(INDICATEURS))
+        values = np.lib.format.open_memmap(path + '.npy', mode='w+', dtype=dtype, shape=shape)
+        with open(path + '.json', 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        return cls(path, values, metadata)
+    
+    @classmethod
+    def open(cls, path, mode='r'):
+        """Ouvre un stockage existant en mémoire mappée (lecture seule par défaut)"""
+        with open(path + '.json', encoding='utf-8') as f:
+            metadata = json.load(f)
+        values = np.load(path + '.npy', mmap_mode=mode)
+        return cls(path, values, metadata)
+    
+    @property
+    def shape(self):
+        return self.values.shape
+    
+    def flush(self):
+        """Écrit sur disque les pages modifiées"""
+        if isinstance(self.values, np.memmap):
+            self.values.flush()
+    
+    def sel(self, territoire=None, member=None, annees=None):
+        """Vue (sans copie) sur un territoire, un membre et/ou une plage d'années (début, fin)"""
+        t = slice(None) if territoire is None else self.territoires.index(territoire)
+        m = slice(None) if member is None else member
+        y = slice(None)
+        if annees is not None:
+            start, end = annees
+            y = slice(int(np.searchsorted(self.annees, start)), int(np.searchsorted(self.annees, end, side='right')))
+        return self.values[t, m, y]
+    
+    def frame(self, territoire, member=0, annees=None):
+        """DataFrame d'un membre au format de generate_real_estate_data (insights, graphiques, exports)"""
+        df = pd.DataFrame(np.asarray(self.sel(territoire, member, annees), dtype=np.float64),
+                          columns=self.indicateurs)
+        mask = np.ones(len(self.annees), dtype=bool)
+        if annees is not None:
+            mask = (self.annees >= annees[0]) & (self.annees <= annees[1])
+        df.insert(0, 'Annee', self.annees[mask])
+        if self.freq != 'Y':
+            dates = period_dates(int(self.annees[0]), int(self.annees[-1]), self.freq)
+            df.insert(0, 'Date', dates[mask])
+        return df
+    
+    def bands(self, territoire, percentiles=(5, 50, 95)):
+        """Bandes de percentiles de l'ensemble d'un territoire (voir ensemble_bands)"""
+        analyzer = DromcomImmobilierAnalyzer(territoire, freq=self.freq, start_year=int(self.annees[0]),
+                                             end_year=int(self.annees[-1]))
+        return analyzer.ensemble_bands(self.sel(territoire), percentiles)
+
+def _parameter_arrays(analyzers):
+    """Paramètres des territoires des analyseurs (une lecture de la table): (base, taux) de chaque
+    indicateur de base (territoires × indicateurs × 2), intensité et mois de pointe saisonniers (territoires × 1)
+    """
+    rows = _territory_matrix([a.territoire for a in analyzers])
+    parameters = rows[:, :-2].reshape(len(analyzers), len(CYCLES), 2)
+    return parameters, rows[:, -2:-1], rows[:, -1:]
+
+def _simulate_base(analyzers, dates, noise, freq='Y', first_period=0, columns=None, rates=None, cycles=None):
+    """Simule les indicateurs de base (avant tendances): {colonne: tableau (... × territoires × périodes)}
+    
+    ``noise`` est le bruit multiplicatif (... × territoires × indicateurs de base × périodes) et
+    ``first_period`` le rang de la première date dans la grille de l'horizon. ``columns``
+    restreint les indicateurs simulés; ``rates`` et ``cycles`` (colonne -> valeur diffusable)
+    remplacent les taux de croissance (NaN: taux du territoire) et les multiplicateurs de CYCLES.
+    """
+    years = pd.DatetimeIndex(dates).year.to_numpy()
+    t, months = _period_grid(len(years), freq, first_period)
+    parameters, intensity, peak = _parameter_arrays(analyzers)
+    
+    simulated = {}
+    for row, column in enumerate(CYCLES):
+        if columns is not None and column not in columns:
+            continue
+        # Paramètres des territoires diffusés en colonnes (territoires × 1)
+        base, rate = parameters[:, row, :1], parameters[:, row, 1:]
+        if rates is not None and column in rates:
+            rate = np.where(np.isnan(rates[column]), rate, rates[column])
+        season = _seasonal_multiplier(column, months, intensity, peak, freq)
+        simulated[column] = _simulate_series(column, t, years, base, rate, noise[..., row, :], season,
+                                             None if cycles is None else cycles[column])
+    return simulated
+
+def _simulate_territories(analyzers, dates, n_members=None, events=None, freq='Y', first_member=0,
+                          first_period=0, noise=None):
+    """Simule tous les indicateurs: tableau ([membres ×] territoires × périodes × indicateurs)
+    
+    Les membres sont numérotés à partir de ``first_member``; sans ``n_members``, seul
+    ce membre est simulé. ``first_period`` est le rang de la première date dans la grille
+    de l'horizon et ``noise`` remplace les tirages normaux des membres ([membres ×]
+    territoires × indicateurs de base × périodes), par exemple ceux d'un flux repris.
+    """
+    years = pd.DatetimeIndex(dates).year.to_numpy()
+    shape = (len(analyzers), len(years))
+    if n_members is not None:
+        shape = (n_members,) + shape
+    
+    # Bruit des membres de chaque territoire, tiré par blocs (voir ensemble_noise)
+    if noise is None:
+        with profile_stage('bruit', membres=1 if n_members is None else n_members, territoires=len(analyzers)):
+            noise = np.empty((1 if n_members is None else n_members, len(analyzers), len(CYCLES), len(years)))
+            for a, analyzer in enumerate(analyzers):
+                noise[:, a] = ensemble_noise(analyzer.seed_sequence, analyzer.territoire, first_member,
+                                             noise.shape[0], len(years))
+        if n_members is None:
+            noise = noise[0]
+    noise = 1 + NOISE_STDS * noise
+    
+    values = np.zeros(shape + (len(INDICATEURS),))
+    with profile_stage('simulation'):
+        simulated = _simulate_base(analyzers, dates, noise, freq, first_period)
+        for column, series in simulated.items():
+            values[..., INDICATEURS.index(column)] = series
+    
+    # Tendances spécifiques à chaque territoire
+    with profile_stage('tendances'):
+        values *= event_multipliers([a.territoire for a in analyzers], years, events)
+    
+    # Indicateurs d'accessibilité, dérivés des colonnes déjà ajustées
+    with profile_stage('indicateurs_derives'):
+        compute_derived_indicators(_IndicatorView(values))
+    
+    return values
+
+def generate_territories_cube(territoires=None, start_year=2002, end_year=2025, events=None, freq='Y',
+                              seed=None, verbose=True):
+    """Génère tous les indicateurs de plusieurs territoires en une seule passe vectorisée
+    
+    Avec une même graine, chaque territoire est identique à generate_real_estate_data.
+    ``verbose=False`` n'affiche pas la progression.
+    """
+    territoires = list(territory_names() if territoires is None else territoires)
+    if verbose:
+        print(f"🏠 Génération des données immobilières pour {len(territoires)} territoires...")
+    
+    seed_sequence = _root_seed_sequence(seed)
+    analyzers = [DromcomImmobilierAnalyzer(t, events, freq, start_year, end_year, seed_sequence)
+                 for t in territoires]
+    freq = analyzers[0].freq
+    dates = period_dates(start_year, end_year, freq)
+    values = _simulate_territories(analyzers, dates, events=analyzers[0].events, freq=freq)
+    
+    return DromcomDataCube(values, territoires, dates.year.to_numpy(dtype=np.int64), INDICATEURS,
+                           None if freq == 'Y' else dates)
+
+def iter_real_estate_chunks(territoires=None, n_members=1, start_year=2002, end_year=2025, freq='Y',
+                            events=None, chunk_rows=100000, seed=None):
+    """Génère les données au format long par morceaux d'au plus ``chunk_rows`` lignes
+    
+    Les lignes suivent l'ordre territoire, membre, période (colonnes de ensemble_to_frame).
+    Les membres sont simulés par lots alignés sur les blocs d'ensemble_noise (au plus
+    max(chunk_rows, ENSEMBLE_BLOCK trajectoires) lignes en mémoire): le nombre de membres
+    ne change pas l'empreinte mémoire, ``chunk_rows`` ne change ni les valeurs ni le
+    nombre de tirages de bruit.
+    """
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows doit être positif (reçu: {chunk_rows})")
+    
+    seed_sequence = _root_seed_sequence(seed)
+    for territoire in (territory_names() if territoires is None else territoires):
+        analyzer = DromcomImmobilierAnalyzer(territoire, events, freq, start_year, end_year, seed_sequence)
+        dates = period_dates(start_year, end_year, analyzer.freq)
+        
+        # Autant de trajectoires complètes par lot qu'un morceau en contient, arrondi à un
+        # multiple de ENSEMBLE_BLOCK; le premier lot porte en plus le membre 0 pour que les
+        # lots suivants commencent sur un bloc (membres 1 + k·ENSEMBLE_BLOCK)
+        batch = -(-max(1, chunk_rows // len(dates)) // ENSEMBLE_BLOCK) * ENSEMBLE_BLOCK
+        for first in [0, *range(1 + batch, n_members, batch)][:n_members]:
+            size = min(batch + (first == 0), n_members - first)
+            ensemble = _simulate_territories([analyzer], dates, size, analyzer.events, analyzer.freq, first)[:, 0]
+            df = analyzer.ensemble_to_frame(ensemble, first_member=first)
+            
+            # Une trajectoire plus longue que chunk_rows est découpée par périodes
+            for start in range(0, len(df), chunk_rows):
+                yield df.iloc[start:start + chunk_rows]
+
+# Indicateurs dont le taux de croissance est remplacé par défaut par la grille de sweep_scenarios
+SWEEP_COLUMNS = ('Prix_m2_Maison', 'Prix_m2_Appartement')
+
+def _insight_columns():
+    """Indicateurs de base nécessaires aux métriques des insights (dépendances des dérivés comprises)"""
+    columns = {column for column, _ in INSIGHT_METRICS.values() if column in INDICATEURS}
+    for column in reversed(_derived_order()):
+        if column in columns:
+            columns.update(DERIVED_INDICATORS[column][0])
+    return [c for c in CYCLES if c in columns]
+
+def sweep_scenarios(territoires=None, croissance=None, crise=(1.0,), boom=(1.0,), colonnes=SWEEP_COLUMNS,
+                    start_year=2002, end_year=2025, events=None, freq='Y', seed=None, member=0,
+                    batch_size=16):
+    """Métriques des insights de toutes les combinaisons croissance × crise × boom × territoire
+    
+    ``croissance`` remplace le taux de croissance annuel des ``colonnes`` (None ou NaN: taux
+    du territoire). ``crise`` et ``boom`` mettent à l'échelle l'écart à 1 des multiplicateurs
+    de CYCLES (0: cycle neutralisé, 1: valeurs de référence, 2: effet doublé). Tous les
+    scénarios reprennent le bruit du membre ``member``: leurs écarts ne viennent que des
+    paramètres. Les combinaisons sont évaluées en tableaux diffusés, par lots de
+    ``batch_size`` taux de croissance, et seuls les indicateurs des insights sont simulés.
+    Retourne un DataFrame au format de compute_insights indexé par (Croissance, Crise,
+    Boom, Territoire).
+    """
+    territoires = list(territory_names() if territoires is None else territoires)
+    unknown = [c for c in colonnes if c not in CYCLES or c == 'Taux_Interet_Hypothecaire']
+    if unknown:
+        raise ValueError(f"Indicateurs sans taux de croissance: {', '.join(unknown)}")
+    croissance = np.atleast_1d(np.asarray([np.nan] if croissance is None else croissance, dtype=float))
+    crise = np.atleast_1d(np.asarray(crise, dtype=float))
+    boom = np.atleast_1d(np.asarray(boom, dtype=float))
+    
+    seed_sequence = _root_seed_sequence(seed)
+    analyzers = [DromcomImmobilierAnalyzer(t, events, freq, start_year, end_year, seed_sequence)
+                 for t in territoires]
+    freq = analyzers[0].freq
+    dates = period_dates(start_year, end_year, freq)
+    years = dates.year.to_numpy()
+    
+    # Bruit (territoires × indicateurs de base × périodes) et tendances communs à tous les scénarios
+    with profile_stage('scenarios/bruit', territoires=len(territoires)):
+        noise = 1 + NOISE_STDS * np.stack([ensemble_noise(seed_sequence, territoire, member, 1, len(years))[0]
+                                           for territoire in territoires])
+        trends = event_multipliers(territoires, years, analyzers[0].events)
+    
+    # Axes des scénarios (croissance × crise × boom × territoire × période)
+    c = crise[:, None, None, None]
+    b = boom[None, :, None, None]
+    columns = _insight_columns()
+    
+    cycles = {column: (1 + c * (crisis - 1), 1 + b * (boom_multiplier - 1))
+              for column, (crisis, boom_multiplier, _) in CYCLES.items()}
+    
+    def simulate(growth):
+        g = growth[:, None, None, None, None]
+        view = _simulate_base(analyzers, dates, noise, freq, columns=columns,
+                              rates={column: g for column in colonnes}, cycles=cycles)
+        for column in view:
+            view[column] = view[column] * trends[..., INDICATEURS.index(column)]
+        compute_derived_indicators(view)
+        
+        shape = (len(growth), len(crise), len(boom), len(territoires))
+        metrics = {}
+        for name, (column, how) in INSIGHT_METRICS.items():
+            values = years if column == 'Annee' else view[column]
+            metric = values.mean(axis=-1) if how == 'mean' else values[..., 0 if how == 'first' else -1]
+            metrics[name] = np.broadcast_to(metric, shape).ravel()
+        return pd.DataFrame(metrics)
+    
+    with profile_stage('scenarios/simulation', scenarios=len(croissance) * len(crise) * len(boom)):
+        insights = pd.concat([simulate(croissance[start:start + batch_size])
+                              for start in range(0, len(croissance), batch_size)], ignore_index=True)
+    insights.index = pd.MultiIndex.from_product([croissance, crise, boom, territoires],
+                                                names=['Croissance', 'Crise', 'Boom', 'Territoire'])
+    return _complete_insights(insights)
+
+# Flux aléatoire annexe des zones (voir member_rng)
+ZONE_STREAM = 1
+
+# Dispersion des zones autour de leur territoire: écart-type relatif du bruit propre à chaque
+# zone et période (le taux hypothécaire est commun à toutes les zones d'un territoire)
+ZONE_DISPERSION = {
+    'Prix_m2_Maison': 0.04,
+    'Prix_m2_Appartement': 0.05,
+    'Loyer_m2_Maison': 0.03,
+    'Loyer_m2_Appartement': 0.03,
+    'Transactions_Total': 0.10,
+    'Duree_Vente_Moyenne': 0.05,
+    'Taux_Vacance_Locatif': 0.06,
+    'Revenu_Median': 0.02,
+    'Taux_Interet_Hypothecaire': 0.0,
+    'Chomage': 0.05,
+    'Permis_Construire': 0.12,
+    'Investissement_Etranger': 0.15,
+    'Investissement_Locatif': 0.10,
+}
+
+# Flux répartis entre les zones (sommés à l'agrégation); les autres indicateurs de base
+# sont des niveaux (moyenne pondérée par le poids des zones)
+ZONE_FLUX = ('Transactions_Total', 'Permis_Construire', 'Investissement_Etranger', 'Investissement_Locatif')
+
+# Primes des zones: colonne de la table des zones -> indicateurs concernés
+ZONE_PRIMES = {
+    'Prime_Prix': ('Prix_m2_Maison', 'Prix_m2_Appartement'),
+    'Prime_Loyer': ('Loyer_m2_Maison', 'Loyer_m2_Appartement'),
+}
+
+def zone_table(territoires=None):
+    """Table des zones par défaut, tirée des ``zones_cles`` de chaque territoire
+    
+    Les zones sont listées de la plus recherchée à la moins recherchée: le poids décroît
+    avec le rang (1, 1/2, 1/3...), la prime de prix va de +20 % à -20 % et celle des
+    loyers de +10 % à -10 %.
+    """
+    rows = []
+    for territoire in (territory_names() if territoires is None else territoires):
+        zones = DromcomImmobilierAnalyzer(territoire).config['zones_cles']
+        position = np.linspace(1, -1, len(zones)) if len(zones) > 1 else np.zeros(1)
+        for rank, zone in enumerate(zones):
+            rows.append({'Territoire': territoire, 'Zone': zone, 'Poids': 1 / (rank + 1),
+                         'Prime_Prix': 1 + 0.20 * position[rank], 'Prime_Loyer': 1 + 0.10 * position[rank]})
+    return pd.DataFrame(rows)
+
+def _validate_zones(zones):
+    """Normalise une table des zones: colonnes par défaut, valeurs positives, zones groupées par territoire"""
+    zones = pd.DataFrame(zones)
+    missing = [c for c in ('Territoire', 'Zone') if c not in zones]
+    if missing:
+        raise ValueError(f"Colonnes manquantes dans la table des zones: {', '.join(missing)}")
+    zones = zones.copy()
+    for column in ('Poids', *ZONE_PRIMES):
+        if column not in zones:
+            zones[column] = 1.0
+        zones[column] = zones[column].astype(float)
+        if not (zones[column] > 0).all():
+            raise ValueError(f"La colonne {column} de la table des zones doit être strictement positive")
+    if zones.duplicated(['Territoire', 'Zone']).any():
+        raise ValueError("Zones en double dans la table des zones")
+    
+    # Zones contiguës par territoire (ordre de première apparition), pour les réductions par segment
+    order = pd.factorize(zones['Territoire'])[0]
+    return zones.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+
+def load_zone_table(path):
+    """Charge une table des zones depuis un fichier CSV ou JSON
+    
+    Colonnes attendues: Territoire, Zone et, en option, Poids (parc ou population),
+    Prime_Prix et Prime_Loyer (1 = niveau du territoire), ainsi que toute colonne de
+    regroupement intermédiaire utilisable par rollup_zones.
+    """
+    if str(path).lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return _validate_zones(json.load(f))
+    return _validate_zones(pd.read_csv(path))
+
+def rollup_zones(values, zones, level='Territoire'):
+    """Agrège des zones (zones × périodes × indicateurs) au niveau ``level`` de la table des zones
+    
+    Les niveaux sont des moyennes pondérées par le poids des zones, les flux (ZONE_FLUX) des
+    sommes, et les indicateurs dérivés sont recalculés sur les colonnes agrégées. Retourne
+    (étiquettes du niveau, tableau groupes × périodes × indicateurs).
+    """
+    codes, labels = pd.factorize(zones[level])
+    groups = np.zeros((len(labels), len(zones)))
+    groups[codes, np.arange(len(zones))] = 1
+    weighted = groups * zones['Poids'].to_numpy()
+    
+    flat = values.reshape(len(zones), -1)
+    means = (weighted @ flat) / weighted.sum(axis=1, keepdims=True)
+    sums = groups @ flat
+    is_flux = np.isin(INDICATEURS, ZONE_FLUX)
+    result = np.where(is_flux, sums.reshape(len(labels), *values.shape[1:]),
+                      means.reshape(len(labels), *values.shape[1:]))
+    compute_derived_indicators(_IndicatorView(result))
+    return list(labels), result
+
+class DromcomZoneCube:
+    """Cube étiqueté (zone × période × indicateur) des données immobilières à l'échelle des zones"""
+    
+    def __init__(self, values, zones, annees, indicateurs, dates=None):
+        self.values = values
+        self.zones = zones
+        self.annees = np.asarray(annees)
+        self.indicateurs = list(indicateurs)
+        self.dates = dates
+    
+    @property
+    def shape(self):
+        return self.values.shape
+    
+    def sel(self, territoire=None, zone=None, indicateur=None):
+        """Sélectionne les zones d'un territoire et/ou les zones d'un nom donné (zones × périodes [× indicateurs])"""
+        mask = np.ones(len(self.zones), dtype=bool)
+        if territoire is not None:
+            mask &= (self.zones['Territoire'] == territoire).to_numpy()
+        if zone is not None:
+            mask &= (self.zones['Zone'] == zone).to_numpy()
+        k = slice(None) if indicateur is None else self.indicateurs.index(indicateur)
+        return self.values[mask][..., k]
+    
+    def rollup(self, level='Territoire'):
+        """Agrégation hiérarchique (voir rollup_zones); au niveau territoire, retourne un DromcomDataCube"""
+        labels, values = rollup_zones(self.values, self.zones, level)
+        return DromcomDataCube(values, labels, self.annees, self.indicateurs, self.dates)
+    
+    def to_long_frame(self):
+        """Retourne les zones au format long (une ligne par zone et par période)"""
+        n_zones, n_annees, _ = self.values.shape
+        df = pd.DataFrame(self.values.reshape(n_zones * n_annees, -1), columns=self.indicateurs)
+        df.insert(0, 'Annee', np.tile(self.annees, n_zones))
+        if self.dates is not None:
+            df.insert(0, 'Date', np.tile(np.asarray(self.dates), n_zones))
+        df.insert(0, 'Zone', np.repeat(self.zones['Zone'].to_numpy(), n_annees))
+        df.insert(0, 'Territoire', np.repeat(self.zones['Territoire'].to_numpy(), n_annees))
+        return df
+
+def generate_zones_cube(zones=None, start_year=2002, end_year=2025, events=None, freq='Y', seed=None,
+                        member=0, verbose=True):
+    """Génère les indicateurs de toutes les zones (communes) en une passe vectorisée
+    
+    Les territoires sont simulés comme dans generate_territories_cube, puis répartis entre
+    leurs zones: primes de la table des zones et bruit propre à chaque zone (flux annexe
+    ZONE_STREAM de chaque territoire), normalisés par territoire et par période pour que
+    l'agrégation des zones (rollup) redonne exactement la série du territoire.
+    ``verbose=False`` n'affiche pas la progression.
+    """
+    zones = zone_table() if zones is None else zones
+    zones = _validate_zones(zones)
+    territoires = list(pd.unique(zones['Territoire']))
+    if verbose:
+        print(f"🏘️  Génération des données immobilières pour {len(zones)} zones de {len(territoires)} territoires...")
+    
+    seed_sequence = _root_seed_sequence(seed)
+    analyzers = [DromcomImmobilierAnalyzer(t, events, freq, start_year, end_year, seed_sequence)
+                 for t in territoires]
+    freq = analyzers[0].freq
+    dates = period_dates(start_year, end_year, freq)
+    territory_values = _simulate_territories(analyzers, dates, events=analyzers[0].events, freq=freq,
+                                             first_member=member)
+    
+    # Facteurs des zones (zones × périodes × indicateurs): primes et bruit propre. Les colonnes
+    # dérivées, tirées elles aussi pour garder un tableau contigu, sont recalculées à la fin.
+    counts = zones.groupby('Territoire', sort=False).size().to_numpy()
+    with profile_stage('zones/bruit', zones=len(zones)):
+        values = np.concatenate([
+            member_rng(seed_sequence, t, member, ZONE_STREAM).standard_normal((n, len(dates), len(INDICATEURS)))
+            for t, n in zip(territoires, counts)])
+        values *= [ZONE_DISPERSION.get(c, 0.0) for c in INDICATEURS]
+        values += 1
+    for prime, columns in ZONE_PRIMES.items():
+        for column in columns:
+            values[..., INDICATEURS.index(column)] *= zones[prime].to_numpy()[:, None]
+    
+    # Normalisation par territoire: moyenne pondérée des niveaux et somme des flux inchangées
+    weights = zones['Poids'].to_numpy()
+    is_flux = np.isin(INDICATEURS, ZONE_FLUX)
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    with profile_stage('zones/repartition'):
+        for t, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            block, w = values[start:stop], weights[start:stop]
+            totals = np.tensordot(w, block, axes=1)
+            totals[:, ~is_flux] /= w.sum()
+            block[..., is_flux] *= w[:, None, None]
+            
+            # Série du territoire rapportée au total des facteurs
+            block *= territory_values[t] / totals
+    with profile_stage('indicateurs_derives'):
+        compute_derived_indicators(_IndicatorView(values))
+    
+    return DromcomZoneCube(values, zones, dates.year.to_numpy(dtype=np.int64), INDICATEURS,
+                           None if freq == 'Y' else dates)
+
+# Transactions de type DVF (demandes de valeurs foncières, format géolocalisé): colonnes lues
+# avec des types explicites, pour une lecture par morceaux sans inférence de types
+DVF_DTYPES = {
+    'id_mutation': 'object',
+    'date_mutation': 'object',
+    'nature_mutation': 'category',
+    'valeur_fonciere': 'float64',
+    'code_departement': 'category',
+    'territoire': 'category',  # Optionnel: remplace code_departement (territoires hors DVF)
+    'nom_commune': 'category',
+    'type_local': 'category',
+    'surface_reelle_bati': 'float64',
+}
+
+# Départements DVF des territoires (les collectivités d'outre-mer ne sont pas couvertes par DVF)
+DVF_DEPARTEMENTS = {'971': 'Guadeloupe', '972': 'Martinique', '973': 'Guyane', '974': 'La Réunion',
+                    '976': 'Mayotte'}
+
+# Natures de mutation retenues et bornes de plausibilité du prix au m² (€/m²)
+DVF_VENTES = ('Vente', "Vente en l'état futur d'achèvement")
+PRIX_M2_BORNES = (100, 50000)
+
+# Indicateurs calculés à partir des transactions
+TRANSACTION_INDICATORS = ['Prix_m2_Maison', 'Prix_m2_Appartement', 'Transactions_Total']
+
+def read_transactions(path, chunksize=1000000, columns=None):
+    """Lit un fichier de transactions (CSV ou Parquet) par morceaux d'au plus ``chunksize`` lignes
+    
+    Seules les colonnes de DVF_DTYPES sont lues, avec leurs types. ``columns`` renomme
+    les colonnes d'un autre schéma (colonne du fichier -> colonne DVF). Le Parquet
+    nécessite pyarrow et est lu par lots, sans charger le fichier entier.
+    """
+    rename = dict(columns or {})
+    dtypes = {c: dtype for c, dtype in DVF_DTYPES.items() if c not in rename.values()}
+    dtypes.update({source: DVF_DTYPES[target] for source, target in rename.items()})
+    
+    if str(path).lower().endswith('.parquet'):
+        _require_pyarrow('parquet')
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(path)
+        names = [c for c in parquet.schema_arrow.names if c in dtypes]
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=names):
+            chunk = batch.to_pandas()
+            yield chunk.astype({c: dtypes[c] for c in names}).rename(columns=rename)
+        return
+    
+    with pd.read_csv(path, usecols=lambda c: c in dtypes, dtype=dtypes, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk.rename(columns=rename)
+
+def _period_index(dates, freq):
+    """Rang (0 à FREQUENCES[freq] - 1) de la période de chaque date dans son année (grille period_dates)"""
+    dates = pd.DatetimeIndex(dates)
+    if freq == 'W':
+        return np.minimum((dates.dayofyear.to_numpy() - 1) // 7, 51)
+    return (dates.month.to_numpy() - 1) // (12 // FREQUENCES[freq])
+
+def _dvf_sales(chunk, freq):
+    """Ventes de maisons et d'appartements d'un morceau: une ligne par mutation, prix au m² plausible"""
+    mask = chunk['type_local'].isin(('Maison', 'Appartement')) & (chunk['surface_reelle_bati'] > 0)
+    if 'nature_mutation' in chunk:
+        mask &= chunk['nature_mutation'].isin(DVF_VENTES)
+    rows = chunk[mask]
+    # Les colonnes texte restent catégorielles jusqu'aux totaux du morceau (voir TransactionAggregator)
+    if 'territoire' in rows:
+        territoire = rows['territoire'].astype('category')
+    else:
+        territoire = rows['code_departement'].astype('category').map(DVF_DEPARTEMENTS)
+    sales = pd.DataFrame({
+        'Territoire': territoire,
+        'Zone': rows['nom_commune'].astype('category') if 'nom_commune' in rows else territoire,
+        'Mutation': rows['id_mutation'] if 'id_mutation' in rows else np.arange(len(rows)),
+        'Date': pd.to_datetime(rows['date_mutation'], format='%Y-%m-%d', errors='coerce'),
+        'Type': rows['type_local'],
+        'Valeur': rows['valeur_fonciere'],
+        'Surface': rows['surface_reelle_bati'],
+    }).dropna(subset=['Territoire', 'Date', 'Valeur'])
+    
+    # La valeur foncière est répétée sur chaque local d'une mutation: elle est rapportée à la
+    # surface totale, et les mutations mêlant maisons et appartements sont écartées
+    multiple = sales['Mutation'].duplicated(keep=False).to_numpy()
+    if multiple.any():
+        grouped = sales[multiple].groupby('Mutation', sort=False)
+        merged = grouped.first()
+        merged['Surface'] = grouped['Surface'].sum()
+        merged = merged[grouped['Type'].nunique() == 1].reset_index()
+        sales = pd.concat([sales[~multiple], merged[sales.columns]], ignore_index=True)
+    
+    prix = sales['Valeur'].to_numpy() / sales['Surface'].to_numpy()
+    plausible = (prix >= PRIX_M2_BORNES[0]) & (prix <= PRIX_M2_BORNES[1])
+    sales, prix = sales[plausible], prix[plausible]
+    maison = (sales['Type'] == 'Maison').to_numpy()
+    return pd.DataFrame({
+        'Territoire': sales['Territoire'].array,
+        'Zone': sales['Zone'].array,
+        'Annee': sales['Date'].dt.year.to_numpy(),
+        'Periode': _period_index(sales['Date'], freq),
+        'Ventes_Maison': maison.astype(np.int64),
+        'Somme_Prix_m2_Maison': np.where(maison, prix, 0.0),
+        'Ventes_Appartement': (~maison).astype(np.int64),
+        'Somme_Prix_m2_Appartement': np.where(maison, 0.0, prix),
+    })
+
+class TransactionAggregator:
+    """Agrégation incrémentale de transactions par territoire, zone (commune) et période
+    
+    Chaque morceau est réduit à des sommes par groupe, ajoutées aux totaux courants: la
+    mémoire dépend du nombre de groupes, pas du nombre de lignes lues. Les lignes d'une
+    mutation étant consécutives, la dernière mutation d'un morceau est reportée au suivant
+    au cas où elle serait coupée (``flush`` la traite en fin de fichier).
+    """
+    KEYS = ['Territoire', 'Zone', 'Annee', 'Periode']
+    SUMS = ['Ventes_Maison', 'Somme_Prix_m2_Maison', 'Ventes_Appartement', 'Somme_Prix_m2_Appartement']
+    
+    def __init__(self, freq='Y'):
+        self.freq = _normalize_freq(freq)
+        self.totals = None
+        self.rows = 0
+        self._pending = None
+    
+    def update(self, chunk):
+        """Ajoute un morceau de transactions (colonnes DVF, voir read_transactions)"""
+        self.rows += len(chunk)
+        if self._pending is not None:
+            chunk = pd.concat([self._pending, chunk], ignore_index=True)
+            self._pending = None
+        if 'id_mutation' in chunk and len(chunk):
+            ids = chunk['id_mutation'].to_numpy()
+            last = ids == ids[-1]
+            self._pending, chunk = chunk[last], chunk[~last]
+        self._add(chunk)
+        return self
+    
+    def flush(self):
+        """Agrège la mutation reportée (fin de fichier)"""
+        if self._pending is not None:
+            self._add(self._pending)
+            self._pending = None
+        return self
+    
+    def _add(self, chunk):
+        with profile_stage('transactions/agregation', lignes=len(chunk)):
+            sales = _dvf_sales(chunk, self.freq)
+            if not len(sales):
+                return
+            part = sales.groupby(self.KEYS, observed=True)[self.SUMS].sum().reset_index()
+            part[['Territoire', 'Zone']] = part[['Territoire', 'Zone']].astype(str)
+            part = part.set_index(self.KEYS)
+            if self.totals is not None:
+                # L'alignement des groupes passe les comptes en flottants: ils redeviennent entiers
+                part = self.totals.add(part, fill_value=0).astype(part.dtypes)
+            self.totals = part
+    
+    @property
+    def territoires(self):
+        """Territoires présents dans les transactions agrégées"""
+        return [] if self.totals is None else list(self.totals.index.unique('Territoire'))
+    
+    @property
+    def years(self):
+        """Première et dernière années des transactions agrégées"""
+        annees = self.totals.index.get_level_values('Annee')
+        return int(annees.min()), int(annees.max())
+    
+    def indicators(self, level='Territoire'):
+        """Indicateurs observés par groupe (Territoire ou Zone) et période, en ordre chronologique
+        
+        Prix moyens au m² des ventes de la période et transactions en rythme annuel (comme
+        generate_real_estate_data); colonne Date en plus d'Annee en infra-annuel.
+        """
+        if self.totals is None:
+            raise ValueError("Aucune transaction agrégée")
+        by = ['Territoire', 'Zone', 'Annee', 'Periode'] if level == 'Zone' else ['Territoire', 'Annee', 'Periode']
+        totals = self.totals.groupby(level=by).sum()
+        df = pd.DataFrame({
+            'Prix_m2_Maison': totals['Somme_Prix_m2_Maison'] / totals['Ventes_Maison'].where(totals['Ventes_Maison'] > 0),
+            'Prix_m2_Appartement': (totals['Somme_Prix_m2_Appartement']
+                                    / totals['Ventes_Appartement'].where(totals['Ventes_Appartement'] > 0)),
+            'Transactions_Total': (totals['Ventes_Maison'] + totals['Ventes_Appartement']) * FREQUENCES[self.freq],
+        }).reset_index()
+        if self.freq != 'Y':
+            start, end = self.years
+            dates = period_dates(start, end, self.freq)
+            periods = (df['Annee'] - start) * FREQUENCES[self.freq] + df['Periode']
+            df.insert(len(by) - 2, 'Date', dates[periods.to_numpy()])
+        return df.drop(columns='Periode')
+
+def ingest_transactions(paths, freq='Y', chunksize=1000000, columns=None):
+    """Agrège un ou plusieurs fichiers de transactions par morceaux (voir TransactionAggregator)"""
+    aggregator = TransactionAggregator(freq)
+    for path in ([paths] if isinstance(paths, (str, os.PathLike)) else paths):
+        for chunk in read_transactions(path, chunksize, columns):
+            aggregator.update(chunk)
+        # Une mutation ne s'étend pas sur deux fichiers
+        aggregator.flush()
+    return aggregator
+
+# Formats d'export: format -> extension du fichier
+EXPORT_FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather', 'npz': '.npz'}
+
+def compact_dtypes(df, float32=False):
+    """Réduit les types: Annee en int16 et, en option, indicateurs en float32"""
+    df = df.copy()
+    if 'Annee' in df:
+        df['Annee'] = df['Annee'].astype(np.int16)
+    if 'Membre' in df:
+        df['Membre'] = df['Membre'].astype(np.int32)
+    if float32:
+        columns = df.select_dtypes(include='float64').columns
+        df[columns] = df[columns].astype(np.float32)
+    return df
+
+def _require_pyarrow(fmt):
+    """Vérifie la présence de la dépendance optionnelle pyarrow"""
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError(f"L'export {fmt} nécessite pyarrow (pip install pyarrow)")
+
+def export_dataframe(df, path, fmt='csv', float32=False, partition_cols=None):
+    """Écrit un DataFrame au format demandé (csv, parquet, feather, npz) et retourne le chemin
+    
+    ``path`` est donné sans extension. ``partition_cols`` (parquet uniquement) écrit un
+    dataset partitionné dans un répertoire au lieu d'un fichier unique.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu: {fmt} (formats: {', '.join(EXPORT_FORMATS)})")
+    with profile_stage(f'export/{fmt}', lignes=len(df)):
+        return _write_dataframe(compact_dtypes(df, float32), path, fmt, partition_cols)
+
+def _write_dataframe(df, path, fmt, partition_cols):
+    """Écriture effective d'un DataFrame déjà compacté (voir export_dataframe)"""
+    
+    if fmt == 'parquet' and partition_cols:
+        _require_pyarrow(fmt)
+        # Les partitions réécrites remplacent celles d'un export précédent
+        df.to_parquet(path, index=False, partition_cols=partition_cols,
+                      existing_data_behavior='delete_matching')
+        return path
+    
+    output_file = path + EXPORT_FORMATS[fmt]
+    if fmt == 'csv':
+        df.to_csv(output_file, index=False)
+    elif fmt == 'parquet':
+        _require_pyarrow(fmt)
+        df.to_parquet(output_file, index=False)
+    elif fmt == 'feather':
+        _require_pyarrow(fmt)
+        df.reset_index(drop=True).to_feather(output_file)
+    else:
+        # Une entrée par colonne, les colonnes texte en unicode (lisible sans pickle)
+        np.savez(output_file, **{c: df[c].to_numpy(dtype=str if df[c].dtype == object else None)
+                                 for c in df.columns})
+    return output_file
+
+def export_dataset(frames, path, fmt='csv', float32=False):
+    """Écrit plusieurs territoires (ou membres d'ensemble) en un seul dataset
+    
+    ``frames`` est un DataFrame long ou une liste de DataFrames longs (colonne Territoire).
+    En parquet, le dataset est partitionné par territoire; les autres formats
+    produisent un fichier unique.
+    """
+    df = frames if isinstance(frames, pd.DataFrame) else pd.concat(frames, ignore_index=True)
+    partition_cols = ['Territoire'] if fmt == 'parquet' else None
+    return export_dataframe(df, path, fmt, float32, partition_cols)
+
+def export_chunks(chunks, path, fmt='csv', float32=False):
+    """Écrit un flux de DataFrames (iter_real_estate_chunks) morceau par morceau et retourne le chemin
+    
+    La mémoire reste bornée par la taille d'un morceau: en csv chaque morceau est ajouté
+    au fichier, en parquet il devient un groupe de lignes du même fichier (ParquetWriter).
+    """
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f"L'export par morceaux gère csv et parquet (demandé: {fmt})")
+    output_file = path + EXPORT_FORMATS[fmt]
+    
+    if fmt == 'csv':
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            for k, chunk in enumerate(chunks):
+                compact_dtypes(chunk, float32).to_csv(f, header=k == 0, index=False)
+        return output_file
+    
+    _require_pyarrow(fmt)
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(compact_dtypes(chunk, float32), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output_file, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return output_file
+
+class ResultCache:
+    """Cache disque adressé par contenu des données (pickle) et graphiques générés
+    
+    Chaque entrée est un fichier ``<clé>.<suffixe>`` du répertoire ``directory``. Une
+    lecture rafraîchit la date de modification de l'entrée; au-delà de ``max_bytes``,
+    les entrées les moins récemment utilisées sont supprimées. Les écritures passent par
+    un fichier temporaire renommé: plusieurs processus peuvent partager le répertoire.
+    """
+    
+    def __init__(self, directory, max_bytes=512 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+    
+    @staticmethod
+    def key(*parts):
+        """Empreinte SHA-256 d'éléments sérialisables en JSON"""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def frame_digest(df):
+        """Empreinte du contenu d'un DataFrame (colonnes et valeurs)"""
+        digest = hashlib.sha256(json.dumps(list(map(str, df.columns))).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+    
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, f'{key}.{suffix}')
+    
+    def _lookup(self, paths):
+        """Compte un succès si tous les fichiers existent et les marque comme récemment utilisés"""
+        try:
+            for path in paths:
+                os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+    
+    def _store(self, path, write):
+        """Écrit une entrée de façon atomique puis applique la limite de taille"""
+        tmp = f'{path}.{os.getpid()}.tmp'
+        write(tmp)
+        os.replace(tmp, path)
+        self._evict()
+    
+    def get_frame(self, key):
+        """DataFrame en cache, ou None"""
+        path = self._path(key, 'pkl')
+        if not self._lookup([path]):
+            return None
+        return pd.read_pickle(path)
+    
+    def put_frame(self, key, df):
+        self._store(self._path(key, 'pkl'), df.to_pickle)
+    
+    def get_files(self, key, outputs):
+        """Recopie les fichiers en cache ({suffixe: destination}); False s'il en manque un"""
+        paths = {suffix: self._path(key, suffix) for suffix in outputs}
+        if not self._lookup(paths.values()):
+            return False
+        for suffix, dest in outputs.items():
+            shutil.copyfile(paths[suffix], dest)
+        return True
+    
+    def put_files(self, key, outputs):
+        """Ajoute au cache des fichiers déjà écrits ({suffixe: chemin})"""
+        for suffix, src in outputs.items():
+            self._store(self._path(key, suffix), lambda tmp: shutil.copyfile(src, tmp))
+    
+    def _entries(self):
+        return [e for e in os.scandir(self.directory) if e.is_file() and not e.name.endswith('.tmp')]
+    
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+                self.evictions += 1
+            total -= size
+    
+    def stats(self):
+        """Statistiques du cache: succès, échecs, évictions, entrées et taille occupée"""
+        sizes = []
+        for entry in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                sizes.append(entry.stat().st_size)
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(sizes), 'bytes': sum(sizes)}
+
+def use_headless_backend():
+    """Force un backend matplotlib non interactif (nœuds de rendu sans affichage)"""
+    plt = _pyplot()
+    if plt.get_backend().lower() != 'agg':
+        plt.switch_backend('Agg')
+
+# Paramètres de mise en page des sous-graphiques (rcParams figure.subplot.*)
+SUBPLOT_MARGINS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+class RealEstateFigureTemplate:
+    """Figure (8 panneaux) construite une fois et réutilisée d'un territoire à l'autre
+    
+    La figure n'est construite (et matplotlib chargé) qu'au premier rendu: un gabarit dont
+    les graphiques sont tous servis par le cache ne coûte rien. Le gabarit garde ensuite
+    l'empreinte des données de chaque panneau et l'image Agg du dernier rendu: d'un rendu
+    à l'autre, seuls les panneaux modifiés sont vidés, retracés et redessinés dans l'image.
+    """
+    
+    def __init__(self):
+        self.fig = None
+        self.axes = None
+        
+        # Rendu incrémental: empreinte des données tracées par chaque panneau au dernier rendu,
+        # titre, panneaux retracés depuis le dernier dessin de l'image (None: image à refaire),
+        # état de cette image (résolution, boîtes et positions des panneaux) et fichiers écrits
+        self.digests = [None] * len(DromcomImmobilierAnalyzer.PANELS)
+        self.title = None
+        self.pending = None
+        self.raster = None
+        self.written = set()
+    
+    def _build(self):
+        """Construit la figure headless et ses panneaux"""
+        use_headless_backend()
+        plt = _pyplot()
+        plt.style.use('seaborn-v0_8')
+        self.fig = plt.figure(figsize=(20, 24))
+        self.axes = [self.fig.add_subplot(4, 2, k) for k in range(1, 9)]
+    
+    def reset(self, panels=None):
+        """Vide les panneaux (tous, ou les indices ``panels``) et supprime leurs axes secondaires"""
+        if self.fig is None:
+            self._build()
+        panels = range(len(self.axes)) if panels is None else panels
+        targets = [self.axes[k] for k in panels]
+        twins = [ax for ax in self.fig.axes if ax not in self.axes
+                 and any(t in ax.get_shared_x_axes().get_siblings(ax) for t in targets)]
+        for ax in targets:
+            ax.cla()
+        for ax in twins:
+            ax.remove()
+        if self.pending is not None:
+            self.pending.update(panels)
+        return self.fig, self.axes
+    
+    def save(self, outputs, dpi):
+        """Met en page et écrit la figure dans ``outputs`` ({format: chemin})
+        
+        Le PNG est l'image Agg du gabarit, recadrée (« tight », arrondi au pixel) et écrite par
+        matplotlib.image.imsave comme le fait savefig; les autres formats passent par savefig
+        avec le même recadrage. Rien n'est réécrit quand aucun panneau n'a été retracé, que
+        le titre et la résolution sont inchangés et que les fichiers existent déjà.
+        """
+        raster = self.raster
+        if (self.pending == set() and raster['dpi'] == dpi and raster['titre'] == self.title
+                and all(path in self.written and os.path.exists(path) for path in outputs.values())):
+            return
+        
+        # Mise en page recalculée à chaque rendu (à la résolution de sortie): graduations et
+        # étendues changent d'un territoire à l'autre. Elle repart des marges par défaut, comme
+        # une figure neuve: tight_layout dépend des positions courantes des axes.
+        plt = _pyplot()
+        self.fig.set_dpi(dpi)
+        with profile_stage('graphiques/mise_en_page'):
+            self.fig.subplots_adjust(**{k: plt.rcParams[f'figure.subplot.{k}'] for k in SUBPLOT_MARGINS})
+            self.fig.tight_layout()
+        image, (top, bottom, left, right) = self._draw(dpi)
+        
+        from matplotlib.image import imsave
+        from matplotlib.transforms import Bbox
+        height = image.shape[0]
+        bbox_inches = Bbox.from_extents(left / dpi, (height - bottom) / dpi, right / dpi, (height - top) / dpi)
+        for fmt, path in outputs.items():
+            with profile_stage('savefig', format=fmt, dpi=dpi):
+                if fmt == 'png':
+                    imsave(path, np.ascontiguousarray(image[top:bottom, left:right]), format='png', dpi=dpi)
+                else:
+                    self.fig.savefig(path, dpi=dpi, bbox_inches=bbox_inches)
+            self.written.add(path)
+    
+    def _draw(self, dpi):
+        """Dessine l'image Agg (en entier, ou seulement les panneaux retracés): (image, recadrage)
+        
+        Le redessin est local si la position des autres panneaux n'a pas changé et si les régions
+        des panneaux retracés (avant et après) ne touchent ni les autres panneaux ni le titre.
+        """
+        fig = self.fig
+        renderer = fig.canvas.get_renderer()
+        height, width = int(renderer.height), int(renderer.width)
+        positions = [tuple(ax.get_position().bounds) for ax in self.axes]
+        raster = self.raster
+        
+        dirty = None
+        if (self.pending is not None and raster['dpi'] == dpi and raster['titre'] == self.title
+                and raster['renderer'] is renderer
+                and all(positions[k] == raster['positions'][k] for k in range(len(self.axes)) if k not in self.pending)):
+            bboxes = dict(raster['bboxes'])
+            bboxes.update({k: self._bbox(self._panel_axes(k), renderer) for k in self.pending})
+            dirty = {k: self._union(self._region(raster['bboxes'][k], height, width),
+                                    self._region(bboxes[k], height, width)) for k in self.pending}
+            others = [self._region(bbox, height, width) for k, bbox in bboxes.items() if k not in dirty]
+            if any(self._overlaps(region, other) for region in dirty.values() for other in others):
+                dirty = None
+        
+        with profile_stage('savefig/dessin', panneaux=len(self.axes) if dirty is None else len(dirty)):
+            if dirty is None:
+                fig.canvas.draw()
+                bboxes = {k: self._bbox(self._panel_axes(k), renderer) for k in range(len(self.axes))}
+                if fig.texts:
+                    bboxes['textes'] = self._bbox(fig.texts, renderer)
+            image = np.asarray(renderer.buffer_rgba())
+            if dirty is not None:
+                background = np.round(np.array(fig.patch.get_facecolor()) * 255).astype(np.uint8)
+                for k, (top, bottom, left, right) in dirty.items():
+                    image[top:bottom, left:right] = background
+                    for ax in self._panel_axes(k):
+                        ax.draw(renderer)
+        
+        self.raster = {'dpi': dpi, 'titre': self.title, 'renderer': renderer, 'bboxes': bboxes,
+                       'positions': positions}
+        self.pending = set()
+        self.written = set()
+        
+        # Recadrage « tight » (marge de 0,1 pouce) de l'union des boîtes, arrondi au pixel
+        from matplotlib.transforms import Bbox
+        bbox = Bbox.union(list(bboxes.values())).padded(0.1 * dpi)
+        crop = (max(0, int(np.floor(height - bbox.y1))), min(height, int(np.ceil(height - bbox.y0))),
+                max(0, int(np.floor(bbox.x0))), min(width, int(np.ceil(bbox.x1))))
+        return image, crop
+    
+    def _panel_axes(self, k):
+        """Axes d'un panneau et ses axes secondaires, dans l'ordre de tracé de la figure"""
+        ax = self.axes[k]
+        return [a for a in self.fig.axes if a is ax or (a not in self.axes and ax in a.get_shared_x_axes().get_siblings(a))]
+    
+    def _bbox(self, artists, renderer):
+        """Boîte englobante (pixels, origine en bas à gauche) d'artistes et de leurs décorations"""
+        from matplotlib.transforms import Bbox
+        return Bbox.union([a.get_tightbbox(renderer) for a in artists])
+    
+    @staticmethod
+    def _region(bbox, height, width):
+        """Région (ligne début, ligne fin, colonne début, colonne fin) d'une boîte, en pixels entiers"""
+        return (max(0, int(np.floor(height - bbox.y1)) - 2), min(height, int(np.ceil(height - bbox.y0)) + 2),
+                max(0, int(np.floor(bbox.x0)) - 2), min(width, int(np.ceil(bbox.x1)) + 2))
+    
+    @staticmethod
+    def _union(a, b):
+        return min(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3])
+    
+    @staticmethod
+    def _overlaps(a, b):
+        return a[0] < b[1] and b[0] < a[1] and a[2] < b[3] and b[2] < a[3]
+    
+    def close(self):
+        if self.fig is not None:
+            _pyplot().close(self.fig)
+            self.fig = self.axes = None
+            self.digests = [None] * len(self.digests)
+            self.title = self.pending = self.raster = None
+            self.written = set()
+
+# Gabarit de figure propre à chaque processus du mode batch
+_worker_template = None
+
+def comparison_frame(cube):
+    """DataFrame long partagé par le rapport comparatif, avec les normalisations calculées une fois
+    
+    Ajoute les rendements bruts (%), l'écart entre rendement brut d'un appartement et taux
+    hypothécaire (points) et les prix en base 100 de la première période de chaque territoire.
+    """
+    df = cube.to_long_frame()
+    df['Rendement_Brut_Maison'] = df['Loyer_m2_Maison'] * 12 * 100 / df['Prix_m2_Maison']
+    df['Rendement_Brut_Appartement'] = df['Loyer_m2_Appartement'] * 12 * 100 / df['Prix_m2_Appartement']
+    df['Ecart_Rendement'] = df['Rendement_Brut_Appartement'] - df['Taux_Interet_Hypothecaire']
+    
+    first = df.groupby('Territoire', sort=False)[['Prix_m2_Maison', 'Prix_m2_Appartement']].transform('first')
+    df['Indice_Prix_Maison'] = df['Prix_m2_Maison'] / first['Prix_m2_Maison'] * 100
+    df['Indice_Prix_Appartement'] = df['Prix_m2_Appartement'] / first['Prix_m2_Appartement'] * 100
+    return df
+
+def _territory_colors(territoires):
+    """Couleur stable de chaque territoire (palette tab20)"""
+    palette = _pyplot().get_cmap('tab20').colors
+    return {t: palette[TERRITOIRES.index(t) % len(palette) if t in TERRITOIRES else k % len(palette)]
+            for k, t in enumerate(territoires)}
+
+def _plot_comparison_prices(fig, frame, insights, colors):
+    """Prix au m² de tous les territoires (échelle logarithmique) et prix en base 100"""
+    x = 'Date' if 'Date' in frame else 'Annee'
+    axes = fig.subplots(2, 1, sharex=True)
+    for territoire, group in frame.groupby('Territoire', sort=False):
+        axes[0].plot(group[x], group['Prix_m2_Maison'], label=territoire, linewidth=2, color=colors[territoire])
+        axes[1].plot(group[x], group['Indice_Prix_Maison'], label=territoire, linewidth=2, color=colors[territoire])
+    
+    axes[0].set_yscale('log')
+    axes[0].set_title('Prix au m² des Maisons par Territoire (€/m², échelle log)', fontsize=12, fontweight='bold')
+    axes[0].set_ylabel('Prix (€/m²)')
+    axes[1].axhline(100, color='grey', linewidth=1, linestyle='--')
+    axes[1].set_title('Prix des Maisons en Base 100 (première période)', fontsize=12, fontweight='bold')
+    axes[1].set_ylabel('Indice (base 100)')
+    axes[0].legend(loc='upper left', bbox_to_anchor=(1.01, 1), fontsize=9)
+    for ax in axes:
+        ax.grid(True, alpha=0.3)
+
+def _plot_comparison_affordability(fig, frame, insights, colors):
+    """Classements d'accessibilité: années de salaire et part du revenu consacrée au loyer"""
+    axes = fig.subplots(1, 2)
+    for ax, column, title, unit in [
+        (axes[0], 'Annees_Salaire_Maison', 'Années de Salaire pour une Maison (100 m²)', 'ans'),
+        (axes[1], 'Part_Loyer_Revenu', 'Part du Revenu Consacrée au Loyer', '%'),
+    ]:
+        ranking = insights[column].sort_values()
+        ax.barh(ranking.index, ranking.to_numpy(), color=[colors[t] for t in ranking.index], alpha=0.8)
+        for k, value in enumerate(ranking.to_numpy()):
+            ax.text(value, k, f' {value:.1f} {unit}', va='center', fontsize=9)
+        ax.set_title(title, fontsize=12, fontweight='bold')
+        ax.set_xlabel(unit)
+        ax.grid(True, alpha=0.3, axis='x')
+
+def _plot_comparison_yields(fig, frame, insights, colors):
+    """Petits multiples: écart entre rendement brut d'un appartement et taux hypothécaire"""
+    x = 'Date' if 'Date' in frame else 'Annee'
+    groups = list(frame.groupby('Territoire', sort=False))
+    ncols = 4
+    nrows = -(-len(groups) // ncols)
+    axes = fig.subplots(nrows, ncols, sharex=True, sharey=True, squeeze=False).ravel()
+    for ax, (territoire, group) in zip(axes, groups):
+        spread = group['Ecart_Rendement'].to_numpy()
+        ax.plot(group[x], spread, linewidth=2, color=colors[territoire])
+        ax.fill_between(group[x], 0, spread, color=colors[territoire], alpha=0.2)
+        ax.axhline(0, color='grey', linewidth=1)
+        ax.set_title(territoire, fontsize=11, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+    for ax in axes[len(groups):]:
+        ax.set_visible(False)
+    for ax in axes[::ncols]:
+        ax.set_ylabel('Écart (points)')
+    fig.text(0.5, 0, 'Rendement brut d\'un appartement moins taux hypothécaire', ha='center', fontsize=11)
+
+# Figures du rapport comparatif: nom -> (fonction de tracé, taille en pouces)
+COMPARISON_FIGURES = {
+    'prix': (_plot_comparison_prices, (16, 12)),
+    'accessibilite': (_plot_comparison_affordability, (18, 7)),
+    'rendements': (_plot_comparison_yields, (18, 10)),
+}
+
+def _render_comparison_figure(name, frame, insights, output_dir, dpi, formats, title):
+    """Rend une figure du rapport comparatif (headless) et retourne les chemins écrits"""
+    use_headless_backend()
+    plt = _pyplot()
+    plt.style.use('seaborn-v0_8')
+    plot, figsize = COMPARISON_FIGURES[name]
+    fig = plt.figure(figsize=figsize)
+    with profile_stage(f'comparaison/{name}'):
+        plot(fig, frame, insights, _territory_colors(list(insights.index)))
+        fig.suptitle(title, fontsize=16, fontweight='bold')
+        fig.tight_layout()
+    
+    paths = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f'comparaison_{name}.{fmt}')
+        with profile_stage('savefig', format=fmt, dpi=dpi):
+            fig.savefig(path, dpi=dpi, bbox_inches='tight')
+        paths.append(path)
+    plt.close(fig)
+    return paths
+
+def create_comparison_report(cube=None, territoires=None, output_dir='.', dpi=150, formats=('png',),
+                             workers=None, seed=None, events=None, freq='Y', start_year=2002, end_year=2025,
+                             verbose=True):
+    """Rapport comparatif des territoires rendu depuis un seul jeu de données partagé
+    
+    Sans ``cube``, tous les territoires sont générés en une passe. Les normalisations
+    (comparison_frame) et les classements (compute_insights) sont calculés une fois,
+    puis chaque figure de COMPARISON_FIGURES est rendue dans son propre processus
+    (``workers=1``: dans le processus courant). Retourne les chemins des images;
+    ``verbose=False`` ne les affiche pas.
+    """
+    if cube is None:
+        cube = generate_territories_cube(territoires, start_year, end_year, events, freq=freq, seed=seed,
+                                         verbose=False)
+    frame = comparison_frame(cube)
+    insights = compute_insights(frame)
+    start, end = int(cube.annees[0]), int(cube.annees[-1])
+    title = f'Comparaison des Marchés Immobiliers des DROM-COM ({start}-{end})'
+    os.makedirs(output_dir, exist_ok=True)
+    if verbose:
+        print(f"📊 Rapport comparatif de {len(cube.territoires)} territoires ({len(COMPARISON_FIGURES)} figures)...")
+    
+    args = (frame, insights, output_dir, dpi, formats, title)
+    if workers == 1:
+        paths = [_render_comparison_figure(name, *args) for name in COMPARISON_FIGURES]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count(), len(COMPARISON_FIGURES))) as executor:
+            paths = list(executor.map(_render_comparison_figure, COMPARISON_FIGURES, *zip(*[args] * len(COMPARISON_FIGURES))))
+    
+    paths = [path for figure_paths in paths for path in figure_paths]
+    if verbose:
+        for path in paths:
+            print(f"📈 {path}")
+    return paths
+
+def _data_file_stem(prefix, start_year, end_year, freq='Y'):
+    """Nom des fichiers de données: <prefix>_real_estate_data_<début>_<fin>[_<fréquence>]"""
+    stem = f'{prefix}real_estate_data_{start_year}_{end_year}'
+    return stem if freq == 'Y' else f'{stem}_{freq}'
+
+def _run_territory(territoire, output_dir='.', plot=True, seed=None, events=None,
+                   dpi=300, formats=('png',), data_format='csv', float32=False, freq='Y',
+                   cache_dir=None, cache_size=512 * 2**20, profile=None):
+    """Traite un territoire en mode batch et retourne les durées de chaque étape
+    
+    ``profile`` (None, 'stages', 'memory' ou 'cprofile') écrit la trace des étapes du
+    territoire en JSON et au format Chrome, avec tracemalloc ou cProfile en option.
+    """
+    if profile is None:
+        return _run_territory_stages(territoire, output_dir, plot, seed, events, dpi, formats,
+                                     data_format, float32, freq, cache_dir, cache_size)
+    with StageProfiler(memory=profile == 'memory', cprofile=profile == 'cprofile') as profiler:
+        with profile_stage('territoire', territoire=territoire):
+            timings = _run_territory_stages(territoire, output_dir, plot, seed, events, dpi, formats,
+                                            data_format, float32, freq, cache_dir, cache_size)
+    prefix = os.path.join(output_dir, f'{territoire}_profile')
+    profiler.to_json(prefix + '.json')
+    profiler.to_chrome_trace(prefix + '_trace.json')
+    if profiler.profile is not None:
+        profiler.dump_cprofile(prefix + '.prof')
+    return timings
+
+def _run_territory_stages(territoire, output_dir, plot, seed, events, dpi, formats, data_format, float32,
+                          freq, cache_dir, cache_size):
+    """Étapes du traitement d'un territoire (voir _run_territory)"""
+    cache = None if cache_dir is None else ResultCache(cache_dir, cache_size)
+    # Gabarit paresseux: matplotlib n'est chargé qu'au premier graphique absent du cache
+    global _worker_template
+    if plot and _worker_template is None:
+        _worker_template = RealEstateFigureTemplate()
+    
+    timings = {'territoire': territoire}
+    # Flux aléatoire propre au territoire: indépendant de l'ordre d'exécution des workers
+    analyzer = DromcomImmobilierAnalyzer(territoire, events, freq, seed=seed)
+    
+    start = time.perf_counter()
+    df = analyzer.generate_real_estate_data(cache=cache, verbose=False)
+    timings['generation'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    output_file = _data_file_stem(f'{territoire}_', analyzer.start_year, analyzer.end_year, analyzer.freq)
+    export_dataframe(df, os.path.join(output_dir, output_file), data_format, float32)
+    timings['export'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    if plot:
+        analyzer.create_real_estate_analysis(df, output_dir=output_dir, insights=False,
+                                             dpi=dpi, formats=formats, template=_worker_template, cache=cache)
+    timings['graphiques'] = time.perf_counter() - start
+    
+    # Les insights sont écrits dans un fichier pour ne pas entremêler les sorties des workers
+    start = time.perf_counter()
+    with profile_stage('insights'):
+        text = analyzer._real_estate_insights_text(df)
+    with open(os.path.join(output_dir, f'{territoire}_real_estate_insights.txt'), 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
+    timings['insights'] = time.perf_counter() - start
+    
+    timings['total'] = sum(v for k, v in timings.items() if k != 'territoire')
+    if cache is not None:
+        timings['cache'] = cache.stats()
+    return timings
+
+def export_real_estate_data(territoire, output_dir='.', seed=None, events=None,
+                            data_format='csv', float32=False, freq='Y', start_year=2002, end_year=2025):
+    """Chemin rapide données seules: génère et écrit les données d'un territoire sans charger matplotlib"""
+    analyzer = DromcomImmobilierAnalyzer(territoire, events, freq, start_year, end_year, seed)
+    df = analyzer.generate_real_estate_data(verbose=False)
+    
+    output_file = _data_file_stem(f'{territoire}_', analyzer.start_year, analyzer.end_year, analyzer.freq)
+    return export_dataframe(df, os.path.join(output_dir, output_file), data_format, float32)
+
+def _append_state_path(output_dir, territoire):
+    return os.path.join(output_dir, f'{territoire}_real_estate_state.json')
+
+def append_real_estate_data(territoire, output_dir='.', seed=None, events=None, freq='Y',
+                            start_year=2002, end_year=2025, until=None):
+    """Mode incrémental: prolonge le CSV d'un territoire sans régénérer l'historique
+    
+    Sans état enregistré, l'horizon est généré en entier puis écrit avec l'état du flux
+    aléatoire et des insights courants (``<territoire>_real_estate_state.json``). Les
+    appels suivants ne simulent que les périodes postérieures, jusqu'à la période qui
+    contient ``until`` ('2026', '2026-03' ou date, défaut: ``end_year``), les ajoutent au
+    CSV, renommé selon sa nouvelle dernière année, et mettent à jour les insights.
+    Retourne le chemin du CSV.
+    """
+    until = _until_end(end_year if until is None else until)
+    state_path = _append_state_path(output_dir, territoire)
+    if not os.path.exists(state_path):
+        analyzer = DromcomImmobilierAnalyzer(territoire, events, freq, start_year, until.year, seed)
+        df = analyzer.generate_real_estate_data(verbose=False)
+        df = df[_period_starts(period_dates(start_year, until.year, analyzer.freq), analyzer.freq) <= until]
+        last_year = int(df['Annee'].iloc[-1]) if len(df) else until.year
+        path = os.path.join(output_dir, _data_file_stem(f'{territoire}_', start_year, last_year, analyzer.freq))
+        path = export_dataframe(df, path, 'csv')
+        state = {
+            'territoire': territoire,
+            'freq': analyzer.freq,
+            'start_year': start_year,
+            'graine': _seed_fingerprint(analyzer.seed_sequence),
+            'periodes': len(df),
+            'fichier': os.path.basename(path),
+            'rng': analyzer.noise_generator(len(df)).bit_generator.state,
+            'insights': RunningInsights().update(df).state,
+        }
+    else:
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+        analyzer = DromcomImmobilierAnalyzer(territoire, events, state['freq'], state['start_year'], until.year,
+                                             seed)
+        if analyzer.freq != _normalize_freq(freq):
+            raise ValueError(f"Fréquence {freq} différente de celle des données existantes ({state['freq']})")
+        if seed is not None and _seed_fingerprint(analyzer.seed_sequence) != state['graine']:
+            raise ValueError(f"Graine différente de celle des données existantes de {territoire}")
+        
+        rng = np.random.Generator(np.random.PCG64())
+        rng.bit_generator.state = state['rng']
+        df = analyzer.extend_real_estate_data(state['periodes'], until, rng)
+        path = os.path.join(output_dir, state['fichier'])
+        if len(df):
+            compact_dtypes(df).to_csv(path, mode='a', header=False, index=False)
+            last_year = int(df['Annee'].iloc[-1])
+            renamed = os.path.join(output_dir, _data_file_stem(f'{territoire}_', state['start_year'], last_year,
+                                                               analyzer.freq) + '.csv')
+            os.replace(path, renamed)
+            path = renamed
+            state.update(periodes=state['periodes'] + len(df), fichier=os.path.basename(path),
+                         rng=rng.bit_generator.state,
+                         insights=RunningInsights(state['insights']).update(df).state)
+    
+    # Insights mis à jour depuis les métriques courantes, sans relire le CSV
+    insights = RunningInsights(state['insights']).result()
+    with open(os.path.join(output_dir, f'{territoire}_real_estate_insights.txt'), 'w', encoding='utf-8') as f:
+        f.write(format_insights(insights, territoire, analyzer.config, state['start_year'],
+                                int(insights['Annee_Fin'])) + '\n')
+    temporary = state_path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(temporary, state_path)
+    return path
+
+def export_territories_dataset(territoires, output_dir='.', seed=None, events=None,
+                               data_format='csv', float32=False, start_year=2002, end_year=2025, freq='Y'):
+    """Génère plusieurs territoires en une passe et les écrit en un seul dataset"""
+    cube = generate_territories_cube(territoires, start_year, end_year, events, freq, seed, verbose=False)
+    
+    path = os.path.join(output_dir, _data_file_stem('', start_year, end_year, _normalize_freq(freq)))
+    return export_dataset(cube.to_long_frame(), path, data_format, float32)
+
+def export_zones_dataset(zones=None, output_dir='.', seed=None, events=None, data_format='csv',
+                         float32=False, start_year=2002, end_year=2025, freq='Y'):
+    """Génère toutes les zones en une passe et les écrit en un seul dataset (partitionné par territoire)"""
+    cube = generate_zones_cube(zones, start_year, end_year, events, freq, seed, verbose=False)
+    
+    path = os.path.join(output_dir, _data_file_stem('zones_', start_year, end_year, _normalize_freq(freq)))
+    return export_dataset(cube.to_long_frame(), path, data_format, float32)
+
+def export_scenarios(territoires=None, output_dir='.', seed=None, events=None, data_format='csv',
+                     float32=False, start_year=2002, end_year=2025, freq='Y', croissance=None,
+                     crise=(1.0,), boom=(1.0,)):
+    """Évalue une grille de scénarios (sweep_scenarios) et écrit une ligne par scénario et territoire"""
+    insights = sweep_scenarios(territoires, croissance, crise, boom, start_year=start_year, end_year=end_year,
+                               events=events, freq=freq, seed=seed)
+    print(f"🧮 {len(insights)} combinaisons scénario × territoire évaluées")
+    path = os.path.join(output_dir, _data_file_stem('scenarios_', start_year, end_year, _normalize_freq(freq)))
+    return export_dataframe(insights.reset_index(), path, data_format, float32)
+
+def analyze_transactions(paths, territoires=None, output_dir='.', plot=True, seed=None, events=None,
+                         dpi=300, formats=('png',), data_format='csv', float32=False, freq='Y',
+                         chunksize=1000000):
+    """Ingère des fichiers de transactions et produit données, graphiques et insights par territoire
+    
+    Les indicateurs non observés sont simulés (voir observed_real_estate_data). Les
+    indicateurs par zone sont écrits dans un dataset ``zones_transactions_...``.
+    Retourne les chemins des fichiers de données écrits.
+    """
+    aggregator = ingest_transactions(paths, freq, chunksize)
+    start_year, end_year = aggregator.years
+    print(f"🧾 {aggregator.rows} lignes de transactions agrégées ({start_year}-{end_year})")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    stem = _data_file_stem('zones_transactions_', start_year, end_year, aggregator.freq)
+    outputs = [export_dataset(aggregator.indicators('Zone'), os.path.join(output_dir, stem), data_format, float32)]
+    for territoire in aggregator.territoires:
+        if territoires is not None and territoire not in territoires:
+            continue
+        analyzer = DromcomImmobilierAnalyzer(territoire, events, aggregator.freq, start_year, end_year, seed)
+        df = analyzer.observed_real_estate_data(aggregator, verbose=False)
+        stem = _data_file_stem(f'{territoire}_transactions_', start_year, end_year, aggregator.freq)
+        outputs.append(export_dataframe(df, os.path.join(output_dir, stem), data_format, float32))
+        if plot:
+            analyzer.create_real_estate_analysis(df, output_dir=output_dir, show=False, dpi=dpi, formats=formats)
+        else:
+            analyzer._generate_real_estate_insights(df)
+    return outputs
+
+def export_territories_stream(territoires, output_dir='.', seed=None, events=None, data_format='csv',
+                              float32=False, freq='Y', start_year=2002, end_year=2025, n_members=1,
+                              chunk_rows=100000):
+    """Écrit un ensemble de toutes tailles (territoires × membres × périodes) en flux, à mémoire constante"""
+    chunks = iter_real_estate_chunks(territoires, n_members, start_year, end_year, freq, events, chunk_rows, seed)
+    stem = _data_file_stem('', start_year, end_year, _normalize_freq(freq))
+    return export_chunks(chunks, os.path.join(output_dir, f'{stem}_{n_members}_membres'), data_format, float32)
+
+def run_batch(territoires, workers=None, output_dir='.', plot=True, seed=None, events=None,
+              dpi=300, formats=('png',), data_format='csv', float32=False, freq='Y',
+              cache_dir=None, cache_size=512 * 2**20, profile=None):
+    """Traite plusieurs territoires en parallèle sur un pool de processus"""
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"🏠 Traitement de {len(territoires)} territoires ({workers or os.cpu_count()} workers)...")
+    
+    start = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=use_territory_table,
+                             initargs=(territory_table(),)) as executor:
+        futures = [executor.submit(_run_territory, t, output_dir, plot, seed, events,
+                                   dpi, formats, data_format, float32, freq, cache_dir, cache_size, profile)
+                   for t in territoires]
+        for future in as_completed(futures):
+            timings = future.result()
+            results[timings['territoire']] = timings
+            print(f"✅ {timings['territoire']} terminé ({timings['total']:.2f} s)")
+    elapsed = time.perf_counter() - start
+    
+    # Récapitulatif des durées par territoire
+    print("\n⏱️  DURÉES PAR TERRITOIRE (s):")
+    print(f"{'Territoire':<28}{'Génération':>12}{'Export':>8}{'Graphiques':>12}{'Insights':>10}{'Total':>8}")
+    for territoire in territoires:
+        t = results[territoire]
+        print(f"{territoire:<28}{t['generation']:>12.3f}{t['export']:>8.3f}{t['graphiques']:>12.3f}"
+              f"{t['insights']:>10.3f}{t['total']:>8.3f}")
+    print(f"Durée totale: {elapsed:.2f} s")
+    if cache_dir is not None:
+        hits = sum(results[t]['cache']['hits'] for t in territoires)
+        misses = sum(results[t]['cache']['misses'] for t in territoires)
+        print(f"♻️  Cache {cache_dir}: {hits} succès, {misses} échecs")
+    print(f"📁 Résultats dans: {os.path.abspath(output_dir)}")
+    
+    return [results[t] for t in territoires]
+
+# Types de contenu des réponses du service HTTP
+CONTENT_TYPES = {'json': 'application/json; charset=utf-8', 'png': 'image/png', 'svg': 'image/svg+xml'}
+
+def _service_compute(kind, territoire, events, freq, start_year, end_year, seed, fmt=None, dpi=None):
+    """Calcul d'une réponse du service dans un processus du pool: (type de contenu, corps)"""
+    analyzer = DromcomImmobilierAnalyzer(territoire, events, freq, start_year, end_year, seed)
+    df = analyzer.generate_real_estate_data(verbose=False)
+    if kind == 'indicateurs':
+        return CONTENT_TYPES['json'], df.to_json(orient='records', date_format='iso').encode('utf-8')
+    if kind == 'insights':
+        insights = analyzer.real_estate_insights(df).iloc[0]
+        return CONTENT_TYPES['json'], insights.to_json().encode('utf-8')
+    
+    # Graphique rendu avec le gabarit du processus, relu depuis un répertoire temporaire
+    global _worker_template
+    if _worker_template is None:
+        _worker_template = RealEstateFigureTemplate()
+    with tempfile.TemporaryDirectory() as output_dir:
+        analyzer.create_real_estate_analysis(df, output_dir=output_dir, insights=False, dpi=dpi,
+                                             formats=(fmt,), template=_worker_template)
+        with open(os.path.join(output_dir, f'{territoire}_real_estate_analysis.{fmt}'), 'rb') as f:
+            return CONTENT_TYPES[fmt], f.read()
+
+class RealEstateService:
+    """Service HTTP asynchrone (asyncio, sans dépendance): indicateurs, insights et graphiques
+    
+    Routes (GET): ``/territoires``, ``/scenarios``, ``/stats``, ``/indicateurs``, ``/insights``
+    et ``/graphique``, avec les paramètres ``territoire``, ``scenario``, ``seed`` (défaut 0:
+    réponses reproductibles), ``freq``, ``start_year``, ``end_year`` et, pour les graphiques,
+    ``format`` (png, svg) et ``dpi``. La génération et le rendu s'exécutent dans un pool de
+    processus; les réponses sont gardées dans un cache LRU en mémoire, et les requêtes
+    identiques simultanées partagent un seul calcul.
+    """
+    
+    # Statuts des réponses du service
+    REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 414: 'URI Too Long', 500: 'Internal Server Error'}
+    
+    def __init__(self, workers=None, cache_entries=256, scenarios=None):
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=use_territory_table,
+                                            initargs=(territory_table(),))
+        self.cache_entries = cache_entries
+        self.scenarios = {'base': list(EVENEMENTS), 'sans_evenements': []} if scenarios is None else scenarios
+        self.cache = OrderedDict()
+        self.inflight = {}
+        self.counters = {'requetes': 0, 'hits': 0, 'calculs': 0, 'regroupees': 0}
+    
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+    
+    def _params(self, query):
+        """Paramètres validés d'une requête: ValueError (réponse 400) si invalides"""
+        get = lambda name, default=None: query.get(name, [default])[0]
+        territoire = get('territoire')
+        if territoire not in territory_names():
+            raise ValueError(f"Territoire inconnu: {territoire}")
+        scenario = get('scenario', 'base')
+        if scenario not in self.scenarios:
+            raise ValueError(f"Scénario inconnu: {scenario} (scénarios: {', '.join(self.scenarios)})")
+        start_year, end_year = int(get('start_year', 2002)), int(get('end_year', 2025))
+        if not 0 <= end_year - start_year < 200:
+            raise ValueError(f"Horizon invalide: {start_year}-{end_year}")
+        return territoire, scenario, _normalize_freq(get('freq', 'Y')), start_year, end_year, int(get('seed', 0))
+    
+    async def compute(self, key, *args):
+        """Réponse d'une requête: cache, calcul en cours partagé, ou nouveau calcul dans le pool"""
+        import asyncio
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.counters['hits'] += 1
+            return self.cache[key]
+        future = self.inflight.get(key)
+        if future is None:
+            self.counters['calculs'] += 1
+            future = asyncio.get_running_loop().run_in_executor(self.executor, _service_compute, *args)
+            self.inflight[key] = future
+            future.add_done_callback(lambda f: self._store(key, f))
+        else:
+            self.counters['regroupees'] += 1
+        # shield: un client déconnecté n'annule pas le calcul partagé
+        return await asyncio.shield(future)
+    
+    def _store(self, key, future):
+        del self.inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.cache[key] = future.result()
+        while len(self.cache) > self.cache_entries:
+            self.cache.popitem(last=False)
+    
+    async def respond(self, path, query):
+        """Route une requête GET: (statut, type de contenu, corps)"""
+        self.counters['requetes'] += 1
+        if path == '/territoires':
+            return 200, CONTENT_TYPES['json'], json.dumps(territory_names(), ensure_ascii=False).encode('utf-8')
+        if path == '/scenarios':
+            return 200, CONTENT_TYPES['json'], json.dumps(list(self.scenarios), ensure_ascii=False).encode('utf-8')
+        if path == '/stats':
+            stats = dict(self.counters, cache=len(self.cache), en_cours=len(self.inflight))
+            return 200, CONTENT_TYPES['json'], json.dumps(stats).encode('utf-8')
+        if path not in ('/indicateurs', '/insights', '/graphique'):
+            return 404, CONTENT_TYPES['json'], json.dumps({'erreur': f"Route inconnue: {path}"}).encode('utf-8')
+        
+        territoire, scenario, freq, start_year, end_year, seed = self._params(query)
+        kind = path[1:]
+        fmt = dpi = None
+        if kind == 'graphique':
+            fmt = query.get('format', ['png'])[0]
+            if fmt not in ('png', 'svg'):
+                raise ValueError(f"Format non supporté: {fmt}")
+            dpi = min(max(int(query.get('dpi', [100])[0]), 20), 300)
+        key = (kind, territoire, scenario, freq, start_year, end_year, seed, fmt, dpi)
+        content_type, body = await self.compute(key, kind, territoire, self.scenarios[scenario], freq,
+                                                start_year, end_year, seed, fmt, dpi)
+        return 200, content_type, body
+    
+    async def handle(self, reader, writer):
+        """Connexion HTTP/1.1 (keep-alive): une réponse par requête GET, jusqu'à fermeture
+        
+        Une ligne de requête (414) ou un en-tête (400) plus long que la limite du flux
+        (64 Kio) reçoit une réponse d'erreur, puis la connexion est fermée: le reste de la
+        requête n'est pas lu.
+        """
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except ValueError:
+                    await self._send(writer, 414, *self._error("Ligne de requête trop longue"), close=True)
+                    break
+                if not request_line:
+                    break
+                headers = {}
+                try:
+                    while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                except ValueError:
+                    await self._send(writer, 400, *self._error("En-tête trop long"), close=True)
+                    break
+                
+                try:
+                    parts = request_line.decode('latin-1').split(' ', 2)
+                    if len(parts) != 3:
+                        raise ValueError(f"Ligne de requête invalide: {request_line.decode('latin-1').strip()!r}")
+                    method, target, _ = parts
+                    url = urlsplit(target)
+                    if method != 'GET':
+                        raise ValueError(f"Méthode non supportée: {method}")
+                    status, content_type, body = await self.respond(url.path, parse_qs(url.query))
+                except ValueError as e:
+                    status, (content_type, body) = 400, self._error(str(e))
+                except Exception as e:
+                    status, (content_type, body) = 500, self._error(repr(e))
+                
+                close = headers.get('connection', '').lower() == 'close'
+                await self._send(writer, status, content_type, body, close)
+                if close:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    @staticmethod
+    def _error(message):
+        """Type de contenu et corps JSON d'une réponse d'erreur"""
+        return CONTENT_TYPES['json'], json.dumps({'erreur': message}, ensure_ascii=False).encode('utf-8')
+    
+    async def _send(self, writer, status, content_type, body, close):
+        """Écrit une réponse HTTP/1.1 complète"""
+        writer.write(f"HTTP/1.1 {status} {self.REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: {'close' if close else 'keep-alive'}"
+                     f"\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+
+async def _serve(service, host, port):
+    import asyncio
+    import signal
+    
+    # SIGTERM arrête le service proprement, pool de processus compris
+    loop = asyncio.get_running_loop()
+    stop = loop.create_future()
+    with contextlib.suppress(NotImplementedError):
+        loop.add_signal_handler(signal.SIGTERM, stop.set_result, None)
+    
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"🌐 Service immobilier DROM-COM sur http://{host}:{port} (Ctrl+C pour arrêter)", flush=True)
+    async with server:
+        await stop
+
+def serve(host='127.0.0.1', port=8080, workers=None, cache_entries=256, scenarios=None):
+    """Lance le service HTTP en local (hors ligne) jusqu'à interruption"""
+    # asyncio est importé à la demande: les autres modes n'en paient pas le coût au démarrage
+    import asyncio
+    # Pas de matplotlib dans le processus principal: le backend headless est choisi par les workers de rendu
+    service = RealEstateService(workers, cache_entries, scenarios)
+    try:
+        asyncio.run(_serve(service, host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+def _parse_grid(value):
+    """Grille de valeurs: liste séparée par des virgules ou début:fin:nombre (bornes incluses)"""
+    try:
+        if ':' in value:
+            start, stop, num = value.split(':')
+            return np.linspace(float(start), float(stop), int(num))
+        return np.array([float(v) for v in value.split(',') if v.strip()])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Grille invalide: {value} (attendu: 0.03,0.04 ou 0.028:0.048:50)")
+
+def _parse_args(argv=None):
+    """Analyse les arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Analyse du marché immobilier des DROM-COM")
+    parser.add_argument('--territories', help="'all' ou liste de territoires séparés par des virgules")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus (défaut: nombre de CPU)")
+    parser.add_argument('--output-dir', default='.', help="Répertoire des fichiers générés")
+    parser.add_argument('--data-only', action='store_true',
+                        help="Écrire uniquement les données, dans ce processus et sans charger matplotlib")
+    parser.add_argument('--data-format', choices=sorted(EXPORT_FORMATS), default='csv',
+                        help="Format des données exportées (parquet et feather nécessitent pyarrow)")
+    parser.add_argument('--float32', action='store_true', help="Exporter les indicateurs en float32")
+    parser.add_argument('--dataset', action='store_true',
+                        help="Avec --data-only: un seul dataset pour tous les territoires (partitionné en parquet)")
+    parser.add_argument('--store', help="Avec --data-only: écrire un ensemble dans un stockage np.memmap (<store>.npy/.json)")
+    parser.add_argument('--members', type=int, default=1, help="Nombre de membres de l'ensemble écrit avec --store ou --stream")
+    parser.add_argument('--stream', action='store_true',
+                        help="Avec --data-only: écrire l'ensemble en flux, par morceaux (csv ou parquet)")
+    parser.add_argument('--chunk-rows', type=int, default=100000,
+                        help="Nombre maximal de lignes par morceau avec --stream ou --transactions")
+    parser.add_argument('--transactions', action='append', default=[],
+                        help="Fichier de transactions de type DVF (CSV/Parquet) lu par morceaux; répétable")
+    parser.add_argument('--zones', nargs='?', const='default',
+                        help="Avec --data-only: données par zone (communes); table CSV/JSON optionnelle "
+                             "(Territoire, Zone, Poids, Prime_Prix, Prime_Loyer), sinon les zones clés des territoires")
+    parser.add_argument('--append', action='store_true',
+                        help="Avec --data-only: prolonger les CSV existants sans régénérer l'historique "
+                             "(état dans <territoire>_real_estate_state.json)")
+    parser.add_argument('--until', help="Avec --append: dernière période simulée (ex. 2026 ou 2026-03), défaut: --end-year")
+    parser.add_argument('--start-year', type=int, default=2002, help="Première année simulée (modes --data-only)")
+    parser.add_argument('--end-year', type=int, default=2025, help="Dernière année simulée (modes --data-only)")
+    parser.add_argument('--freq', type=_normalize_freq, default='Y',
+                        help="Résolution temporelle: Y (annuelle), Q, M ou W (alias pandas acceptés)")
+    parser.add_argument('--cache-dir', help="Répertoire du cache des données et graphiques (avec --seed)")
+    parser.add_argument('--cache-size', type=int, default=512, help="Taille maximale du cache (Mo)")
+    parser.add_argument('--profile', nargs='?', const='stages', choices=('stages', 'memory', 'cprofile'),
+                        help="Trace des étapes par territoire (<territoire>_profile.json et _trace.json au "
+                             "format Chrome); 'memory' ajoute tracemalloc, 'cprofile' un profil .prof")
+    parser.add_argument('--compare', action='store_true',
+                        help="Rapport comparatif des territoires (une passe de génération, figures rendues en parallèle)")
+    parser.add_argument('--sweep', action='store_true',
+                        help="Avec --data-only: insights de toutes les combinaisons de scénarios "
+                             "(scenarios_real_estate_data_*), voir --growth-rates, --crisis-severities, --boom-intensities")
+    parser.add_argument('--growth-rates', type=_parse_grid, default=None,
+                        help="Taux de croissance des prix balayés (ex. 0.028:0.048:50), défaut: taux des territoires")
+    parser.add_argument('--crisis-severities', type=_parse_grid, default=(1.0,),
+                        help="Sévérités des crises (échelle de l'écart à 1 des multiplicateurs, 1 = référence)")
+    parser.add_argument('--boom-intensities', type=_parse_grid, default=(1.0,),
+                        help="Intensités des périodes fastes (échelle de l'écart à 1, 1 = référence)")
+    parser.add_argument('--serve', nargs='?', type=int, const=8080,
+                        help="Lancer le service HTTP local sur ce port (défaut: 8080)")
+    parser.add_argument('--host', default='127.0.0.1', help="Adresse d'écoute du service HTTP")
+    parser.add_argument('--cache-entries', type=int, default=256, help="Réponses gardées en mémoire par le service HTTP")
+    parser.add_argument('--no-plot', action='store_true', help="Ne pas générer les graphiques")
+    parser.add_argument('--dpi', type=int, default=300, help="Résolution des images PNG")
+    parser.add_argument('--formats', default='png', help="Formats des graphiques (png, svg, pdf) séparés par des virgules")
+    parser.add_argument('--seed', type=int, default=None, help="Graine aléatoire pour des résultats reproductibles")
+    parser.add_argument('--events', action='append', default=[], help="Table d'événements supplémentaire (CSV/JSON)")
+    parser.add_argument('--territory-table',
+                        help="Paramètres de territoires (CSV/JSON/YAML) qui recalibrent ou ajoutent des territoires")
+    args = parser.parse_args(argv)
+    
+    args.formats = tuple(f.strip().lower() for f in args.formats.split(',') if f.strip())
+    unsupported = [f for f in args.formats if f not in ('png', 'svg', 'pdf')]
+    if unsupported:
+        parser.error(f"Formats non supportés: {', '.join(unsupported)}")
+    if args.stream and args.data_format not in ('csv', 'parquet'):
+        parser.error("--stream écrit uniquement en csv ou parquet")
+    if args.append and args.data_format != 'csv':
+        parser.error("--append prolonge uniquement des fichiers csv")
+    if args.until is not None:
+        try:
+            _until_end(args.until)
+        except ValueError:
+            parser.error(f"--until invalide: {args.until} (attendu: année, mois ou date, ex. 2026-03)")
+    
+    if args.territory_table:
+        try:
+            use_territory_table(args.territory_table)
+        except (OSError, ValueError, ImportError) as e:
+            parser.error(f"Table des territoires {args.territory_table}: {e}")
+    
+    if (args.compare or args.transactions or args.sweep) and args.territories is None:
+        args.territories = 'all'
+    if args.territories is not None:
+        if args.territories == 'all':
+            args.territories = territory_names()
+        else:
+            args.territories = [t.strip() for t in args.territories.split(',') if t.strip()]
+            unknown = [t for t in args.territories if t not in territory_names()]
+            if unknown:
+                parser.error(f"Territoires inconnus: {', '.join(unknown)}")
+    return parser, args
+
+def main(argv=None):
+    """Fonction principale pour les DROM-COM"""
+    parser, args = _parse_args(argv)
+    
+    # Service HTTP local: un scénario par table d'événements supplémentaire
+    if args.serve is not None:
+        scenarios = {'base': list(EVENEMENTS), 'sans_evenements': []}
+        for path in args.events:
+            scenarios[os.path.splitext(os.path.basename(path))[0]] = list(EVENEMENTS) + load_event_table(path)
+        serve(args.host, args.serve, args.workers, args.cache_entries, scenarios)
+        return
+    
+    # Mode batch non interactif
+    if args.territories is not None:
+        events = list(EVENEMENTS)
+        for path in args.events:
+            events += load_event_table(path)
+        if args.transactions:
+            for path in analyze_transactions(args.transactions, args.territories, args.output_dir, not args.no_plot,
+                                             args.seed, events, args.dpi, args.formats, args.data_format,
+                                             args.float32, args.freq, args.chunk_rows):
+                print(f"💾 {path}")
+            return
+        if args.data_only:
+            os.makedirs(args.output_dir, exist_ok=True)
+            if args.store:
+                store = SimulationStore.create(args.store, args.territories, args.start_year, args.end_year,
+                                               n_members=args.members, freq=args.freq)
+                for territoire in args.territories:
+                    DromcomImmobilierAnalyzer(territoire, events, args.freq, args.start_year,
+                                              args.end_year, args.seed).generate_to_store(store)
+                print(f"💾 {args.store}.npy ({' × '.join(map(str, store.shape))})")
+                return
+            years = {'start_year': args.start_year, 'end_year': args.end_year}
+            if args.append:
+                for territoire in args.territories:
+                    try:
+                        path = append_real_estate_data(territoire, args.output_dir, args.seed, events, args.freq,
+                                                       until=args.until, **years)
+                    except ValueError as e:
+                        # Fréquence ou graine incompatibles avec les données existantes
+                        parser.error(str(e))
+                    print(f"💾 {path}")
+                return
+            if args.stream:
+                print(f"💾 {export_territories_stream(args.territories, args.output_dir, args.seed, events, args.data_format, args.float32, args.freq, n_members=args.members, chunk_rows=args.chunk_rows, **years)}")
+                return
+            if args.sweep:
+                print(f"💾 {export_scenarios(args.territories, args.output_dir, args.seed, events, args.data_format, args.float32, freq=args.freq, croissance=args.growth_rates, crise=args.crisis_severities, boom=args.boom_intensities, **years)}")
+                return
+            if args.zones:
+                zones = zone_table(args.territories) if args.zones == 'default' else load_zone_table(args.zones)
+                zones = zones[zones['Territoire'].isin(args.territories)]
+                print(f"💾 {export_zones_dataset(zones, args.output_dir, args.seed, events, args.data_format, args.float32, freq=args.freq, **years)}")
+                return
+            if args.dataset:
+                print(f"💾 {export_territories_dataset(args.territories, args.output_dir, args.seed, events, args.data_format, args.float32, freq=args.freq, **years)}")
+                return
+            for territoire in args.territories:
+                print(f"💾 {export_real_estate_data(territoire, args.output_dir, args.seed, events, args.data_format, args.float32, args.freq, **years)}")
+            return
+        if args.compare:
+            create_comparison_report(territoires=args.territories, output_dir=args.output_dir, dpi=args.dpi,
+                                     formats=args.formats, workers=args.workers, seed=args.seed,
+                                     events=events, freq=args.freq, start_year=args.start_year,
+                                     end_year=args.end_year)
+            return
+        run_batch(args.territories, workers=args.workers, output_dir=args.output_dir,
+                  plot=not args.no_plot, seed=args.seed, events=events,
+                  dpi=args.dpi, formats=args.formats, data_format=args.data_format, float32=args.float32,
+                  freq=args.freq, cache_dir=args.cache_dir, cache_size=args.cache_size * 2**20,
+                  profile=args.profile)
+        return
+    
     print("🏠 ANALYSE DU MARCHÉ IMMOBILIER DES DROM-COM (2002-2025)")
     print("=" * 60)
     
     # Demander à l'utilisateur de choisir un territoire
     print("Liste des territoires disponibles:")
-    for i, territoire in enumerate(territoires, 1):
+    for i, territoire in enumerate(TERRITOIRES, 1):
         print(f"{i}. {territoire}")
     
     try:
         choix = int(input("\nChoisissez le numéro du territoire à analyser: "))
-        if choix < 1 or choix > len(territoires):
+        if choix < 1 or choix > len(TERRITOIRES):
             raise ValueError
-        territoire_selectionne = territoires[choix-1]
+        territoire_selectionne = TERRITOIRES[choix-1]
     except (ValueError, IndexError):
         print("Choix invalide. Sélection de La Réunion par défaut.")
         territoire_selectionne = "La Réunion"
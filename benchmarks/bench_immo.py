@@ -0,0 +1,250 @@
+"""Suite de benchmarks du générateur: génération, tendances, rendu, insights et exports
+
+Mesure dans le processus courant:
+- generate_real_estate_data et chacune des méthodes _simulate_*,
+- _add_territory_trends, create_real_estate_analysis (headless, complet, incrémental et inchangé)
+  et _generate_real_estate_insights,
+- les axes de montée en charge: territoires (1 à 11), horizon (24 à 1200 périodes),
+  taille d'ensemble, et la matrice des formats d'export.
+
+Les résultats sont écrits en JSON; avec --baseline, chaque médiane est comparée à celle
+d'un fichier de référence et le code de sortie vaut 1 au-delà du seuil de régression.
+
+Exemples:
+    python3 benchmarks/bench_immo.py --json bench.json
+    python3 benchmarks/bench_immo.py --quick --baseline bench.json --threshold 0.25
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import Immo  # noqa: E402
+
+GROUPS = ('generation', 'simulate', 'trends', 'rendering', 'insights', 'scaling', 'export')
+
+def _summary(samples):
+    """Statistiques d'une série de mesures (en secondes)"""
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'max': max(samples),
+        'n': len(samples),
+    }
+
+def _time(fn, repeat, warmup=1):
+    """Durées de ``repeat`` appels de ``fn`` (sorties standard ignorées), après échauffement"""
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            fn()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+def _analyzer(territoire, freq='Y', end_year=2025):
+    return Immo.DromcomImmobilierAnalyzer(territoire, freq=freq, end_year=end_year, seed=0)
+
+def bench_generation(results, args):
+    """Génération complète d'un territoire"""
+    analyzer = _analyzer(args.territory)
+    results['generation/generate_real_estate_data'] = _time(analyzer.generate_real_estate_data, args.repeat)
+
+def bench_simulate(results, args):
+    """Chacune des méthodes _simulate_* sur la grille annuelle"""
+    analyzer = _analyzer(args.territory)
+    dates = Immo.period_dates(analyzer.start_year, analyzer.end_year)
+    for name in sorted(dir(analyzer)):
+        if name.startswith('_simulate_') and name != '_simulate_indicator':
+            method = getattr(analyzer, name)
+            results[f'simulate/{name}'] = _time(lambda: method(dates), args.repeat)
+
+def bench_trends(results, args):
+    """Application des tendances et événements à un DataFrame déjà simulé"""
+    analyzer = _analyzer(args.territory)
+    df = analyzer.generate_real_estate_data(verbose=False)
+    results['trends/_add_territory_trends'] = _time(lambda: analyzer._add_territory_trends(df.copy()), args.repeat)
+
+def bench_rendering(results, args):
+    """Rendu headless des graphiques: nouvelle figure et gabarit réutilisé"""
+    Immo.use_headless_backend()
+    analyzer = _analyzer(args.territory)
+    df = analyzer.generate_real_estate_data(verbose=False)
+    repeat = min(args.repeat, args.render_repeat)
+    with tempfile.TemporaryDirectory() as output_dir:
+        results['rendering/create_real_estate_analysis'] = _time(
+            lambda: analyzer.create_real_estate_analysis(df, output_dir=output_dir, show=False, insights=False,
+                                                         dpi=args.dpi), repeat)
+        template = Immo.RealEstateFigureTemplate()
+        
+        def full_render():
+            # Empreintes et image oubliées: tous les panneaux sont retracés et redessinés
+            template.digests, template.pending = [None] * len(template.digests), None
+            analyzer.create_real_estate_analysis(df, output_dir=output_dir, insights=False, dpi=args.dpi,
+                                                 template=template)
+        results['rendering/create_real_estate_analysis_template'] = _time(full_render, repeat)
+        
+        # Rendu incrémental: une seule colonne (un panneau) change d'un rendu à l'autre
+        variants = itertools.cycle([df.assign(Chomage=df['Chomage'] * 1.1), df])
+        results['rendering/create_real_estate_analysis_incremental'] = _time(
+            lambda: analyzer.create_real_estate_analysis(next(variants), output_dir=output_dir, insights=False,
+                                                         dpi=args.dpi, template=template), repeat)
+        
+        # Aucun panneau modifié: les fichiers déjà écrits sont conservés
+        results['rendering/create_real_estate_analysis_unchanged'] = _time(
+            lambda: analyzer.create_real_estate_analysis(df, output_dir=output_dir, insights=False,
+                                                         dpi=args.dpi, template=template), repeat)
+        template.close()
+
+def bench_insights(results, args):
+    """Calcul et affichage des insights"""
+    analyzer = _analyzer(args.territory)
+    df = analyzer.generate_real_estate_data(verbose=False)
+    results['insights/_generate_real_estate_insights'] = _time(
+        lambda: analyzer._generate_real_estate_insights(df), args.repeat)
+
+def bench_scaling(results, args):
+    """Axes de montée en charge: territoires, horizon (périodes) et taille d'ensemble"""
+    for n in args.territories:
+        territoires = Immo.TERRITOIRES[:n]
+        results[f'scaling/territoires/{n}'] = _time(
+            lambda: Immo.generate_territories_cube(territoires, seed=0), args.repeat)
+
+    # Horizon: (fréquence, dernière année) -> nombre de périodes depuis 2002
+    for freq, end_year in args.horizons:
+        analyzer = _analyzer(args.territory, freq, end_year)
+        periods = len(Immo.period_dates(analyzer.start_year, end_year, freq))
+        results[f'scaling/horizon/{periods}'] = _time(analyzer.generate_real_estate_data, args.repeat)
+
+    for n in args.members:
+        analyzer = _analyzer(args.territory)
+        results[f'scaling/membres/{n}'] = _time(lambda: analyzer.generate_ensemble(n), max(1, args.repeat // 2))
+
+def bench_export(results, args):
+    """Matrice des formats d'export (pyarrow optionnel: parquet et feather ignorés sans lui)"""
+    analyzer = _analyzer(args.territory)
+    df = analyzer.ensemble_to_frame(analyzer.generate_ensemble(args.export_members, dtype=np.float64, verbose=False))
+    with tempfile.TemporaryDirectory() as output_dir:
+        for fmt in sorted(Immo.EXPORT_FORMATS):
+            for float32 in (False, True):
+                name = f"export/{fmt}/{'float32' if float32 else 'float64'}"
+                path = os.path.join(output_dir, 'bench')
+                try:
+                    results[name] = _time(lambda: Immo.export_dataframe(df, path, fmt, float32), args.repeat)
+                except ImportError as e:
+                    print(f"⏭️  {name}: {e}")
+
+BENCHMARKS = {
+    'generation': bench_generation,
+    'simulate': bench_simulate,
+    'trends': bench_trends,
+    'rendering': bench_rendering,
+    'insights': bench_insights,
+    'scaling': bench_scaling,
+    'export': bench_export,
+}
+
+def compare(benchmarks, baseline, threshold):
+    """Compare les médianes à une référence: liste des (nom, référence, actuel, écart relatif) en régression"""
+    regressions = []
+    for name, summary in benchmarks.items():
+        reference = baseline.get('benchmarks', {}).get(name)
+        if reference is None:
+            continue
+        ratio = summary['median'] / reference['median'] - 1
+        if ratio > threshold:
+            regressions.append((name, reference['median'], summary['median'], ratio))
+    return regressions
+
+def _parse_horizon(value):
+    freq, end_year = value.split(':')
+    return Immo._normalize_freq(freq), int(end_year)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du générateur immobilier DROM-COM")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre de mesures par benchmark")
+    parser.add_argument('--render-repeat', type=int, default=3, help="Nombre maximal de mesures du rendu")
+    parser.add_argument('--dpi', type=int, default=100, help="Résolution des images rendues")
+    parser.add_argument('--territory', default='La Réunion', help="Territoire des benchmarks unitaires")
+    parser.add_argument('--only', default=','.join(GROUPS), help="Groupes à exécuter, séparés par des virgules")
+    parser.add_argument('--territories', default='1,3,6,11', help="Axe territoires (nombres de territoires)")
+    parser.add_argument('--horizons', default='Y:2025,M:2025,M:2101',
+                        help="Axe horizon: fréquence:dernière année (24, 288 et 1200 périodes par défaut)")
+    parser.add_argument('--members', default='100,1000,10000', help="Axe taille d'ensemble")
+    parser.add_argument('--export-members', type=int, default=200, help="Membres de l'ensemble exporté")
+    parser.add_argument('--quick', action='store_true', help="Axes réduits et 2 mesures (contrôle rapide)")
+    parser.add_argument('--json', help="Fichier JSON de résultats (sinon sortie standard)")
+    parser.add_argument('--baseline', help="Fichier JSON de référence à comparer")
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help="Seuil de régression sur la médiane (0.20 = 20%% plus lent)")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.repeat, args.render_repeat = 2, 1
+        args.territories, args.horizons, args.members = '1,11', 'Y:2025,M:2101', '100,1000'
+    groups = [g.strip() for g in args.only.split(',') if g.strip()]
+    unknown = [g for g in groups if g not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Groupes inconnus: {', '.join(unknown)}")
+    args.territories = [int(n) for n in args.territories.split(',')]
+    args.horizons = [_parse_horizon(h) for h in args.horizons.split(',')]
+    args.members = [int(n) for n in args.members.split(',')]
+
+    samples = {}
+    for group in groups:
+        start = time.perf_counter()
+        BENCHMARKS[group](samples, args)
+        print(f"⏱️  {group}: {time.perf_counter() - start:.1f} s")
+
+    result = {
+        'benchmark': 'immo',
+        'version': Immo.__version__,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': Immo.pd.__version__,
+        'machine': platform.machine(),
+        'repeat': args.repeat,
+        'benchmarks': {name: _summary(s) for name, s in samples.items()},
+    }
+
+    print(f"\n{'Benchmark':<58}{'Médiane (ms)':>14}")
+    for name, summary in result['benchmarks'].items():
+        print(f"{name:<58}{summary['median'] * 1000:>14.2f}")
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(result['benchmarks'], baseline, args.threshold)
+        result['baseline'] = {'path': args.baseline, 'threshold': args.threshold,
+                              'regressions': [name for name, *_ in regressions]}
+        for name, reference, current, ratio in regressions:
+            print(f"⚠️  Régression {name}: {reference * 1000:.2f} ms -> {current * 1000:.2f} ms (+{ratio:.0%})")
+        if regressions:
+            status = 1
+        else:
+            print(f"✅ Aucune régression au-delà de {args.threshold:.0%}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Benchmark de démarrage: temps jusqu'au premier CSV (time-to-first-CSV)
+
+Lance le générateur en sous-processus court, comme en production, et mesure:
+- le temps d'import du module Immo,
+- le temps total jusqu'à l'écriture du premier CSV (mode --data-only),
+- l'absence de matplotlib dans les modules chargés.
+
+Exemple:
+    python3 benchmarks/bench_startup.py --repeat 20 --json startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'Immo.py')
+
+IMPORT_PROBE = (
+    "import sys, time; sys.path.insert(0, {root!r}); t = time.perf_counter(); import Immo; "
+    "print(time.perf_counter() - t); print('matplotlib' in sys.modules)"
+)
+
+def _summary(samples):
+    """Statistiques d'une série de mesures (en secondes)"""
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'max': max(samples),
+    }
+
+def measure_import(repeat):
+    """Temps d'import du module dans un interpréteur neuf"""
+    samples, matplotlib_loaded = [], False
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(root=ROOT)],
+                             capture_output=True, text=True, check=True).stdout.split()
+        samples.append(float(out[0]))
+        matplotlib_loaded |= out[1] == 'True'
+    return samples, matplotlib_loaded
+
+def measure_first_csv(repeat, territoire):
+    """Temps mur d'un sous-processus --data-only jusqu'à l'écriture du CSV"""
+    samples = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        command = [sys.executable, SCRIPT, '--territories', territoire, '--data-only',
+                   '--output-dir', output_dir, '--seed', '0']
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(command, capture_output=True, check=True)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de démarrage (time-to-first-CSV)")
+    parser.add_argument('--repeat', type=int, default=10, help="Nombre de lancements mesurés")
+    parser.add_argument('--territory', default='La Réunion', help="Territoire généré")
+    parser.add_argument('--json', help="Fichier JSON de résultats (sinon sortie standard)")
+    args = parser.parse_args(argv)
+
+    import_samples, matplotlib_loaded = measure_import(args.repeat)
+    csv_samples = measure_first_csv(args.repeat, args.territory)
+
+    result = {
+        'benchmark': 'startup',
+        'python': platform.python_version(),
+        'repeat': args.repeat,
+        'territoire': args.territory,
+        'import_s': _summary(import_samples),
+        'time_to_first_csv_s': _summary(csv_samples),
+        'matplotlib_loaded_on_import': matplotlib_loaded,
+    }
+
+    print(f"⏱️  Import Immo: {result['import_s']['median'] * 1000:.0f} ms (médiane)")
+    print(f"⏱️  Premier CSV: {result['time_to_first_csv_s']['median'] * 1000:.0f} ms (médiane)")
+    if matplotlib_loaded:
+        print("⚠️  matplotlib est chargé à l'import")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    return result
+
+if __name__ == "__main__":
+    main()
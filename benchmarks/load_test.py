@@ -0,0 +1,183 @@
+"""Test de charge du service HTTP (Immo.py --serve): latences p50/p99 et requêtes par seconde
+
+Envoie des requêtes GET sur des connexions keep-alive concurrentes (asyncio, sans
+dépendance), sur un mélange de routes, de territoires et de graines. Le nombre de
+graines distinctes règle la part de réponses servies par le cache du service.
+Avec --spawn, le service est lancé en sous-processus le temps du test.
+
+Exemples:
+    python3 benchmarks/load_test.py --spawn --requests 500 --concurrency 32
+    python3 benchmarks/load_test.py --url http://127.0.0.1:8080 --seeds 50 --json charge.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import quote, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'Immo.py')
+
+sys.path.insert(0, ROOT)
+from Immo import TERRITOIRES  # noqa: E402
+
+def _percentile(samples, p):
+    """Percentile ``p`` (0-100) par la méthode du rang le plus proche"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+def _summary(samples):
+    """Statistiques d'une série de latences (en secondes)"""
+    return {
+        'p50': _percentile(samples, 50),
+        'p90': _percentile(samples, 90),
+        'p99': _percentile(samples, 99),
+        'mean': statistics.mean(samples),
+        'max': max(samples),
+        'n': len(samples),
+    }
+
+def request_paths(args):
+    """Suite (aléatoire, reproductible) des chemins demandés"""
+    rng = random.Random(args.shuffle_seed)
+    paths = []
+    for _ in range(args.requests):
+        route = rng.choice(args.routes)
+        path = (f"/{route}?territoire={quote(rng.choice(args.territories))}"
+                f"&seed={rng.randrange(args.seeds)}&freq={args.freq}")
+        if route == 'graphique':
+            path += f"&format={args.format}&dpi={args.dpi}"
+        paths.append((route, path))
+    return paths
+
+async def _get(reader, writer, host, path):
+    """Requête GET keep-alive: (statut, taille du corps)"""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status, length
+
+async def _client(host, port, queue, results):
+    """Connexion cliente: traite les chemins de la file jusqu'à épuisement"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for route, path in queue:
+            start = time.perf_counter()
+            status, size = await _get(reader, writer, host, path)
+            results.append((route, status, size, time.perf_counter() - start))
+    finally:
+        writer.close()
+
+async def run_load(host, port, paths, concurrency):
+    """Exécute les requêtes avec ``concurrency`` connexions; retourne (résultats, durée)"""
+    queue = iter(paths)
+    results = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, queue, results) for _ in range(concurrency)))
+    return results, time.perf_counter() - start
+
+async def _fetch_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode('latin-1'))
+        await writer.drain()
+        return json.loads((await reader.read()).split(b'\r\n\r\n', 1)[1])
+    finally:
+        writer.close()
+
+def wait_for_server(host, port, timeout=60):
+    """Attend que le service réponde sur /territoires"""
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return asyncio.run(_fetch_json(host, port, '/territoires'))
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            time.sleep(0.2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge du service HTTP immobilier DROM-COM")
+    parser.add_argument('--url', default='http://127.0.0.1:8080', help="Adresse du service")
+    parser.add_argument('--spawn', action='store_true', help="Lancer le service en sous-processus pendant le test")
+    parser.add_argument('--workers', type=int, default=None, help="Processus du service lancé avec --spawn")
+    parser.add_argument('--requests', type=int, default=300, help="Nombre total de requêtes")
+    parser.add_argument('--concurrency', type=int, default=16, help="Connexions simultanées")
+    parser.add_argument('--routes', default='indicateurs,insights,graphique', help="Routes demandées")
+    parser.add_argument('--territories', default='all', help="'all' ou territoires séparés par des virgules")
+    parser.add_argument('--seeds', type=int, default=3, help="Graines distinctes (moins = plus de hits du cache)")
+    parser.add_argument('--freq', default='Y', help="Résolution demandée")
+    parser.add_argument('--format', default='png', help="Format des graphiques (png, svg)")
+    parser.add_argument('--dpi', type=int, default=60, help="Résolution des graphiques")
+    parser.add_argument('--shuffle-seed', type=int, default=0, help="Graine du tirage des requêtes")
+    parser.add_argument('--json', help="Fichier JSON de résultats (sinon sortie standard)")
+    args = parser.parse_args(argv)
+
+    args.routes = [r.strip() for r in args.routes.split(',') if r.strip()]
+    args.territories = (list(TERRITOIRES) if args.territories == 'all'
+                        else [t.strip() for t in args.territories.split(',') if t.strip()])
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+
+    server = None
+    if args.spawn:
+        command = [sys.executable, SCRIPT, '--serve', str(port), '--host', host]
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_server(host, port)
+        results, elapsed = asyncio.run(run_load(host, port, request_paths(args), args.concurrency))
+        stats = asyncio.run(_fetch_json(host, port, '/stats'))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies = [latency for *_, latency in results]
+    result = {
+        'benchmark': 'load',
+        'python': platform.python_version(),
+        'url': args.url,
+        'requests': len(results),
+        'concurrency': args.concurrency,
+        'seeds': args.seeds,
+        'duration_s': elapsed,
+        'requests_per_s': len(results) / elapsed,
+        'errors': sum(status != 200 for _, status, *_ in results),
+        'latency_s': _summary(latencies),
+        'routes': {route: _summary([latency for r, _, _, latency in results if r == route])
+                   for route in args.routes if any(r == route for r, *_ in results)},
+        'server': stats,
+    }
+
+    print(f"⏱️  {result['requests']} requêtes en {elapsed:.1f} s: {result['requests_per_s']:.1f} req/s")
+    print(f"⏱️  Latence p50 {result['latency_s']['p50'] * 1000:.1f} ms, "
+          f"p99 {result['latency_s']['p99'] * 1000:.1f} ms")
+    for route, summary in result['routes'].items():
+        print(f"   {route:<12} p50 {summary['p50'] * 1000:>8.1f} ms   p99 {summary['p99'] * 1000:>8.1f} ms")
+    print(f"♻️  Service: {stats['calculs']} calculs, {stats['hits']} hits, {stats['regroupees']} requêtes regroupées")
+    if result['errors']:
+        print(f"⚠️  {result['errors']} réponses en erreur")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    return result
+
+if __name__ == "__main__":
+    main()
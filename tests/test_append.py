@@ -0,0 +1,51 @@
+import os
+
+import pandas as pd
+import pytest
+
+import Immo
+
+
+def _append(tmp_path, until, freq='M', seed=5):
+    return Immo.append_real_estate_data('Mayotte', str(tmp_path), seed, freq=freq, start_year=2020,
+                                        end_year=2024, until=until)
+
+
+def test_append_matches_full_generation(tmp_path):
+    for until in (None, '2025-03', '2025-03-15', '2026'):
+        path = _append(tmp_path, until)
+    assert os.path.basename(path) == 'Mayotte_real_estate_data_2020_2026_M.csv'
+    
+    (tmp_path / 'complet').mkdir()
+    full = Immo.export_real_estate_data('Mayotte', str(tmp_path / 'complet'), 5, freq='M',
+                                        start_year=2020, end_year=2026)
+    with open(path, 'rb') as appended, open(full, 'rb') as generated:
+        assert appended.read() == generated.read()
+
+
+@pytest.mark.parametrize('freq, until, last', [('M', '2026-03', '2026-03-31'), ('Q', '2026-02', '2026-03-31'),
+                                               ('Y', '2026', '2026-12-31'), ('W', '2026-01-03', '2026-01-07')])
+def test_append_includes_period_containing_until(tmp_path, freq, until, last):
+    _append(tmp_path, None, freq)
+    df = pd.read_csv(_append(tmp_path, until, freq))
+    if freq == 'Y':
+        assert df['Annee'].iloc[-1] == pd.Timestamp(last).year
+    else:
+        assert df['Date'].iloc[-1] == last
+
+
+def test_first_run_is_named_after_its_last_period(tmp_path):
+    path = Immo.append_real_estate_data('Mayotte', str(tmp_path), 5, start_year=2020, until='2025-06')
+    assert os.path.basename(path) == 'Mayotte_real_estate_data_2020_2025.csv'
+    assert pd.read_csv(path)['Annee'].iloc[-1] == 2025
+
+
+def test_append_rejects_other_frequency_or_seed(tmp_path):
+    _append(tmp_path, None)
+    with pytest.raises(ValueError):
+        _append(tmp_path, '2025', freq='Q')
+    with pytest.raises(ValueError):
+        _append(tmp_path, '2025', seed=6)
+    with pytest.raises(SystemExit):
+        Immo.main(['--territories', 'Mayotte', '--data-only', '--append', '--freq', 'Q', '--seed', '5',
+                   '--output-dir', str(tmp_path)])
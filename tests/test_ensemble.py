@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+import Immo
+
+
+def _block_draws(monkeypatch):
+    """Compte les générateurs de blocs d'ensemble créés"""
+    calls = []
+    member_rng = Immo.member_rng
+    
+    def counting(seed_sequence, territoire, member, stream=None):
+        if stream == Immo.ENSEMBLE_STREAM:
+            calls.append((territoire, member))
+        return member_rng(seed_sequence, territoire, member, stream)
+    monkeypatch.setattr(Immo, 'member_rng', counting)
+    return calls
+
+
+def test_ensemble_does_not_depend_on_batch_size():
+    analyzer = Immo.DromcomImmobilierAnalyzer('Mayotte', seed=3)
+    reference = analyzer.generate_ensemble(300, batch_size=300)
+    np.testing.assert_array_equal(analyzer.generate_ensemble(300, batch_size=7), reference)
+    np.testing.assert_array_equal(analyzer.generate_ensemble(250, first_member=50, batch_size=13), reference[50:])
+    
+    # Le membre 0 est la trajectoire de generate_real_estate_data
+    df = analyzer.generate_real_estate_data()
+    np.testing.assert_array_equal(reference[0], df[Immo.INDICATEURS].to_numpy(np.float32))
+
+
+def test_small_batches_draw_each_block_once(monkeypatch):
+    calls = _block_draws(monkeypatch)
+    analyzer = Immo.DromcomImmobilierAnalyzer('Mayotte', seed=3)
+    analyzer.generate_ensemble(600, batch_size=10)
+    # Membres 1 à 599: blocs 0, 1 et 2
+    assert calls == [('Mayotte', 0), ('Mayotte', 1), ('Mayotte', 2)]
+
+
+def test_ensemble_noise_prefix_and_slices():
+    seed_sequence = Immo._root_seed_sequence(3)
+    full = Immo.ensemble_noise(seed_sequence, 'Mayotte', 0, 600, 24)
+    for first, n in [(1, 1), (255, 3), (256, 2), (257, 300), (599, 1)]:
+        np.testing.assert_array_equal(Immo.ensemble_noise(seed_sequence, 'Mayotte', first, n, 24),
+                                      full[first:first + n])
+    # Un horizon prolongé commence par les mêmes tirages
+    np.testing.assert_array_equal(Immo.ensemble_noise(seed_sequence, 'Mayotte', 0, 600, 30)[..., :24], full)
+
+
+def _stream(chunk_rows):
+    return list(Immo.iter_real_estate_chunks(['Mayotte'], 600, 2002, 2011, 'M', chunk_rows=chunk_rows, seed=3))
+
+
+def test_stream_chunks_follow_blocks(monkeypatch):
+    calls = _block_draws(monkeypatch)
+    small = _stream(50)
+    assert calls == [('Mayotte', 0), ('Mayotte', 1), ('Mayotte', 2)]
+    assert max(map(len, small)) == 50
+    
+    calls.clear()
+    large = _stream(10 ** 6)
+    assert calls == [('Mayotte', 0), ('Mayotte', 1), ('Mayotte', 2)]
+    pd.testing.assert_frame_equal(pd.concat(small, ignore_index=True), pd.concat(large, ignore_index=True))
+
+
+def test_stream_runtime_does_not_depend_on_chunk_rows():
+    timings = []
+    for chunk_rows in (120, 10 ** 6):
+        start = time.perf_counter()
+        _stream(chunk_rows)
+        timings.append(time.perf_counter() - start)
+    # Même nombre de lots simulés: seul le découpage en morceaux diffère
+    assert timings[0] < 5 * timings[1] + 0.5
+
+
+def test_seed_argument_does_not_change_the_analyzer(tmp_path):
+    analyzer = Immo.DromcomImmobilierAnalyzer('Mayotte', seed=3)
+    cache = Immo.ResultCache(str(tmp_path))
+    reference = analyzer.generate_real_estate_data(cache=cache)
+    other = analyzer.generate_real_estate_data(cache=cache, seed=4)
+    assert analyzer.seed == 3 and cache.hits == 0
+    pd.testing.assert_frame_equal(analyzer.generate_real_estate_data(), reference)
+    pd.testing.assert_frame_equal(other, Immo.DromcomImmobilierAnalyzer('Mayotte', seed=4).generate_real_estate_data())
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pytest
+
+import Immo
+
+pytest.importorskip('matplotlib')
+Image = pytest.importorskip('PIL.Image')
+
+DPI = 40
+PNG = 'La Réunion_real_estate_analysis.png'
+
+
+@pytest.fixture(scope='module')
+def frames():
+    analyzer = Immo.DromcomImmobilierAnalyzer('La Réunion', seed=1)
+    df = analyzer.generate_real_estate_data()
+    return analyzer, df, df.assign(Chomage=df['Chomage'] * 1.1)
+
+
+def _pixels(path):
+    return np.asarray(Image.open(path))
+
+
+def _render(analyzer, df, output_dir, template, formats=('png',)):
+    os.makedirs(output_dir, exist_ok=True)
+    analyzer.create_real_estate_analysis(df, output_dir=str(output_dir), insights=False, dpi=DPI,
+                                         formats=formats, template=template)
+    return os.path.join(str(output_dir), PNG)
+
+
+def test_incremental_render_matches_full_render(frames, tmp_path):
+    analyzer, df, changed = frames
+    template = Immo.RealEstateFigureTemplate()
+    _render(analyzer, df, tmp_path / 'a', template)
+    redraws = []
+    draw = template.fig.canvas.draw
+    template.fig.canvas.draw = lambda: (redraws.append(1), draw())
+    incremental = _render(analyzer, changed, tmp_path / 'a', template)
+    assert not redraws  # seul le panneau du chômage a été redessiné
+    
+    fresh = Immo.RealEstateFigureTemplate()
+    full = _render(analyzer, changed, tmp_path / 'b', fresh)
+    np.testing.assert_array_equal(_pixels(incremental), _pixels(full))
+    template.close()
+    fresh.close()
+
+
+def test_template_png_matches_savefig(frames, tmp_path):
+    from matplotlib.transforms import Bbox
+    analyzer, df, changed = frames
+    template = Immo.RealEstateFigureTemplate()
+    _render(analyzer, df, tmp_path, template)
+    png = _render(analyzer, changed, tmp_path, template)
+    
+    image, (top, bottom, left, right) = template._draw(DPI)
+    height = image.shape[0]
+    reference = os.path.join(str(tmp_path), 'savefig.png')
+    template.fig.savefig(reference, dpi=DPI, bbox_inches=Bbox.from_extents(
+        left / DPI, (height - bottom) / DPI, right / DPI, (height - top) / DPI))
+    np.testing.assert_array_equal(_pixels(png), _pixels(reference))
+    template.close()
+
+
+def test_unchanged_render_keeps_files(frames, tmp_path):
+    analyzer, df, _ = frames
+    template = Immo.RealEstateFigureTemplate()
+    path = _render(analyzer, df, tmp_path, template)
+    os.utime(path, (0, 0))
+    _render(analyzer, df, tmp_path, template)
+    assert os.stat(path).st_mtime == 0
+    
+    # Un fichier supprimé est réécrit
+    os.remove(path)
+    _render(analyzer, df, tmp_path, template)
+    assert os.path.exists(path)
+    template.close()
+
+
+def test_render_without_show_is_headless(frames, tmp_path):
+    import matplotlib.pyplot as plt
+    analyzer, df, _ = frames
+    backend = plt.get_backend()
+    plt.switch_backend('svg')
+    try:
+        analyzer.create_real_estate_analysis(df, output_dir=str(tmp_path), show=False, insights=False, dpi=DPI)
+        assert plt.get_backend().lower() == 'agg'
+        assert os.path.exists(os.path.join(str(tmp_path), PNG))
+    finally:
+        plt.switch_backend(backend)
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+import Immo
+
+
+class _Writer:
+    """Flux d'écriture en mémoire (write, drain, close)"""
+    
+    def __init__(self):
+        self.data, self.closed = b'', False
+    
+    def write(self, data):
+        self.data += data
+    
+    async def drain(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(scope='module')
+def service():
+    service = Immo.RealEstateService(workers=1)
+    yield service
+    service.close()
+
+
+def _exchange(service, request):
+    async def run():
+        reader, writer = asyncio.StreamReader(), _Writer()
+        reader.feed_data(request)
+        reader.feed_eof()
+        await service.handle(reader, writer)
+        return writer
+    return asyncio.run(run())
+
+
+def test_keep_alive_requests(service):
+    writer = _exchange(service, b'GET /territoires HTTP/1.1\r\n\r\nGET /inconnue HTTP/1.1\r\n\r\n')
+    assert writer.data.count(b'HTTP/1.1 200 OK') == 1 and writer.data.count(b'HTTP/1.1 404 Not Found') == 1
+    assert writer.closed
+
+
+@pytest.mark.parametrize('request_bytes, status', [
+    (b'GET /' + b'a' * 70000 + b' HTTP/1.1\r\n\r\n', b'414 URI Too Long'),
+    (b'GET /territoires HTTP/1.1\r\nX-Long: ' + b'a' * 70000 + b'\r\n\r\n', b'400 Bad Request'),
+], ids=['ligne', 'en-tete'])
+def test_oversized_request_is_answered(service, request_bytes, status):
+    writer = _exchange(service, request_bytes + b'GET /territoires HTTP/1.1\r\n\r\n')
+    assert writer.data.startswith(b'HTTP/1.1 ' + status)
+    assert writer.data.count(b'HTTP/1.1') == 1 and b'Connection: close' in writer.data
+    assert writer.closed
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+import Immo
+
+
+@pytest.fixture
+def added_territory(tmp_path):
+    path = tmp_path / 'territoires.csv'
+    path.write_text('Territoire,prix_m2_base,Chomage_taux\nNouvelle,1500,\nMayotte,,0.01\n', encoding='utf-8')
+    Immo.use_territory_table(str(path))
+    yield 'Nouvelle'
+    Immo.use_territory_table(None)
+
+
+def test_defaults_follow_the_table(added_territory):
+    cube = Immo.generate_territories_cube(end_year=2005, seed=1, verbose=False)
+    assert cube.territoires == Immo.territory_names()
+    assert added_territory in cube.territoires
+    assert added_territory in set(Immo.zone_table()['Territoire'])
+
+
+def test_vectorized_parameters_match_the_table(added_territory):
+    territoires = ['Mayotte', added_territory, 'Inconnu']
+    analyzers = [Immo.DromcomImmobilierAnalyzer(t) for t in territoires]
+    parameters, intensity, peak = Immo._parameter_arrays(analyzers)
+    table = Immo.territory_parameters(territoires, Immo.SIMULATION_COLUMNS).to_numpy(dtype=float)
+    np.testing.assert_array_equal(parameters.reshape(len(territoires), -1), table[:, :-2])
+    np.testing.assert_array_equal(np.hstack([intensity, peak]), table[:, -2:])
+    assert parameters[0, list(Immo.CYCLES).index('Chomage'), 1] == 0.01
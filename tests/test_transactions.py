@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import Immo
+
+
+@pytest.fixture(scope='module')
+def dvf():
+    """Transactions au format DVF: mutations de un à trois locaux (lignes consécutives)"""
+    rng = np.random.default_rng(0)
+    rows = []
+    for mutation in range(400):
+        departement = rng.choice(['971', '974'])
+        commune = f'Commune {departement}-{rng.integers(3)}'
+        date = pd.Timestamp('2020-01-01') + pd.Timedelta(days=int(rng.integers(3 * 365)))
+        nature = 'Echange' if mutation % 37 == 0 else 'Vente'
+        value = float(rng.uniform(50000, 400000))
+        for _ in range(int(rng.integers(1, 4))):
+            rows.append({
+                'id_mutation': f'2020-{mutation}',
+                'date_mutation': date.strftime('%Y-%m-%d'),
+                'nature_mutation': nature,
+                'valeur_fonciere': value,
+                'code_departement': departement,
+                'nom_commune': commune,
+                'type_local': rng.choice(['Maison', 'Appartement', 'Dépendance'], p=[0.5, 0.4, 0.1]),
+                'surface_reelle_bati': float(rng.choice([0, 2, 45, 80, 120])),
+            })
+    return pd.DataFrame(rows)
+
+
+def _indicators(aggregator):
+    return [aggregator.indicators('Territoire'), aggregator.indicators('Zone')]
+
+
+def _assert_same(left, right):
+    for a, b in zip(_indicators(left), _indicators(right)):
+        pd.testing.assert_frame_equal(a, b)
+
+
+def test_chunked_ingestion_matches_one_shot(dvf, tmp_path):
+    path = tmp_path / 'dvf.csv'
+    dvf.to_csv(path, index=False)
+    one_shot = Immo.ingest_transactions(str(path), freq='Q')
+    assert one_shot.rows == len(dvf) and one_shot.territoires == ['Guadeloupe', 'La Réunion']
+    # Morceaux de 7 lignes: des mutations sont coupées entre deux morceaux
+    _assert_same(Immo.ingest_transactions(str(path), freq='Q', chunksize=7), one_shot)
+    
+    # Deux fichiers coupés entre deux mutations
+    cut = dvf.index[dvf['id_mutation'] != dvf['id_mutation'].shift()][200]
+    dvf.iloc[:cut].to_csv(tmp_path / 'a.csv', index=False)
+    dvf.iloc[cut:].to_csv(tmp_path / 'b.csv', index=False)
+    _assert_same(Immo.ingest_transactions([str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv')], freq='Q',
+                                          chunksize=50), one_shot)
+
+
+def test_parquet_matches_csv(dvf, tmp_path):
+    pytest.importorskip('pyarrow')
+    dvf.to_csv(tmp_path / 'dvf.csv', index=False)
+    dvf.to_parquet(tmp_path / 'dvf.parquet', index=False)
+    csv = Immo.ingest_transactions(str(tmp_path / 'dvf.csv'), freq='M')
+    _assert_same(Immo.ingest_transactions(str(tmp_path / 'dvf.parquet'), freq='M', chunksize=13), csv)
+
+
+def test_mutation_prices(tmp_path):
+    rows = pd.DataFrame({
+        'id_mutation': ['1', '1', '2', '3', '3', '4', '5'],
+        'date_mutation': ['2021-02-01', '2021-02-01', '2021-05-10', '2021-08-03', '2021-08-03', '2021-11-20',
+                          '2021-12-01'],
+        'nature_mutation': ['Vente'] * 6 + ['Echange'],
+        'valeur_fonciere': [200000.0, 200000.0, 150000.0, 300000.0, 300000.0, 1000.0, 100000.0],
+        'code_departement': ['976'] * 7,
+        'nom_commune': ['Mamoudzou'] * 7,
+        'type_local': ['Maison', 'Maison', 'Appartement', 'Maison', 'Appartement', 'Maison', 'Maison'],
+        'surface_reelle_bati': [40.0, 60.0, 50.0, 50.0, 50.0, 100.0, 50.0],
+    })
+    rows.to_csv(tmp_path / 'dvf.csv', index=False)
+    df = Immo.ingest_transactions(str(tmp_path / 'dvf.csv')).indicators()
+    # Mutation 1: 200 000 € sur 100 m²; mutation 3 (mixte), 4 (10 €/m²) et 5 (échange) écartées
+    assert df.to_dict('records') == [{'Territoire': 'Mayotte', 'Annee': 2021, 'Prix_m2_Maison': 2000.0,
+                                      'Prix_m2_Appartement': 3000.0, 'Transactions_Total': 2}]